@@ -15,8 +15,13 @@ def main() -> None:
             "enapter==0.24.*",
             "fastmcp==3.*",
             "sentry-sdk==2.*",
+            "opentelemetry-api==1.*",
+            "opentelemetry-sdk==1.*",
             "httpx==0.28.*",
-            "py-key-value-aio[memory,disk]==0.4.*",
+            # The SQLite store implements the store base class, which is typed
+            # with ManagedEntry from a private module. Only the releases it was
+            # checked against are allowed.
+            "py-key-value-aio[memory,disk]>=0.4.5,<0.4.7",
         ],
         python_requires="==3.14.*",
     )
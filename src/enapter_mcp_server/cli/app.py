@@ -1,16 +1,13 @@
 import argparse
 import os
 
-import sentry_sdk
-import sentry_sdk.integrations.mcp
-
-import enapter_mcp_server
-
 from .call_tool_command import CallToolCommand
 from .list_resources_command import ListResourcesCommand
 from .list_tools_command import ListToolsCommand
 from .ping_command import PingCommand
+from .sentry import init_sentry
 from .serve_command import ServeCommand
+from .tracing import init_tracing
 from .version_command import VersionCommand
 
 ENAPTER_MCP_SERVER_ADDRESS = os.environ.get(
@@ -23,6 +20,9 @@ ENAPTER_MCP_SERVER_SENTRY_ENVIRONMENT = os.getenv(
 ENAPTER_MCP_SERVER_SENTRY_TRACES_SAMPLE_RATE = os.getenv(
     "ENAPTER_MCP_SERVER_SENTRY_TRACES_SAMPLE_RATE", "0.0"
 )
+ENAPTER_MCP_SERVER_TRACING_EXPORTER_URL = os.getenv(
+    "ENAPTER_MCP_SERVER_TRACING_EXPORTER_URL"
+)
 
 
 class App:
@@ -57,6 +57,15 @@ class App:
             default=ENAPTER_MCP_SERVER_SENTRY_TRACES_SAMPLE_RATE,
             help="Sentry traces sample rate (0.0 to 1.0)",
         )
+        parser.add_argument(
+            "--tracing-exporter-url",
+            default=ENAPTER_MCP_SERVER_TRACING_EXPORTER_URL,
+            help="Where to export OpenTelemetry spans: console://, file:///path"
+            " (JSON lines) or an OTLP/HTTP endpoint such as"
+            " http://localhost:4318/v1/traces (requires the"
+            " opentelemetry-exporter-otlp-proto-http package). Tracing is"
+            " disabled if unset",
+        )
         subparsers = parser.add_subparsers(dest="command", required=True)
         for command in [
             PingCommand,
@@ -77,14 +86,9 @@ class App:
                 self.parser.error(
                     "--sentry-environment is required when --sentry-dsn is set"
                 )
-            sentry_sdk.init(
-                dsn=args.sentry_dsn,
-                release=enapter_mcp_server.__version__,
-                environment=args.sentry_environment,
-                send_default_pii=True,
-                traces_sample_rate=float(args.sentry_traces_sample_rate),
-                integrations=[sentry_sdk.integrations.mcp.MCPIntegration()],
-            )
+            init_sentry(args)
+        if args.tracing_exporter_url is not None:
+            init_tracing(args)
         match args.command:
             case "ping":
                 await PingCommand.run(args)
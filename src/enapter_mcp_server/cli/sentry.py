@@ -0,0 +1,17 @@
+import argparse
+
+import sentry_sdk
+import sentry_sdk.integrations.mcp
+
+import enapter_mcp_server
+
+
+def init_sentry(args: argparse.Namespace) -> None:
+    sentry_sdk.init(
+        dsn=args.sentry_dsn,
+        release=enapter_mcp_server.__version__,
+        environment=args.sentry_environment,
+        send_default_pii=True,
+        traces_sample_rate=float(args.sentry_traces_sample_rate),
+        integrations=[sentry_sdk.integrations.mcp.MCPIntegration()],
+    )
@@ -1,15 +1,47 @@
 import argparse
 import asyncio
+import contextlib
+import importlib.util
+import multiprocessing
+import multiprocessing.process
 import os
 import pathlib
+import signal
 import urllib.parse
 
-from enapter_mcp_server import core, fake, filesystem, http, mcp
+from enapter_mcp_server import core, fake, filesystem, http, mcp, metrics
 
 from .command import Command
+from .sentry import init_sentry
 from .subparsers import Subparsers
+from .tracing import init_tracing
+
+ENAPTER_MCP_SERVER_WORKERS = os.getenv("ENAPTER_MCP_SERVER_WORKERS", "1")
 
 ENAPTER_HTTP_API_URL = os.getenv("ENAPTER_HTTP_API_URL", "https://api.enapter.com")
+ENAPTER_HTTP_API_MAX_CONNECTIONS = os.getenv("ENAPTER_HTTP_API_MAX_CONNECTIONS", "100")
+ENAPTER_HTTP_API_MAX_KEEPALIVE_CONNECTIONS = os.getenv(
+    "ENAPTER_HTTP_API_MAX_KEEPALIVE_CONNECTIONS", "20"
+)
+ENAPTER_HTTP_API_KEEPALIVE_EXPIRY = os.getenv("ENAPTER_HTTP_API_KEEPALIVE_EXPIRY", "5")
+ENAPTER_HTTP_API_HTTP2 = os.getenv("ENAPTER_HTTP_API_HTTP2", "0")
+ENAPTER_HTTP_API_CONNECT_TIMEOUT = os.getenv("ENAPTER_HTTP_API_CONNECT_TIMEOUT", "5")
+ENAPTER_HTTP_API_READ_TIMEOUT = os.getenv("ENAPTER_HTTP_API_READ_TIMEOUT", "5")
+ENAPTER_HTTP_API_WRITE_TIMEOUT = os.getenv("ENAPTER_HTTP_API_WRITE_TIMEOUT", "5")
+ENAPTER_HTTP_API_POOL_TIMEOUT = os.getenv("ENAPTER_HTTP_API_POOL_TIMEOUT", "5")
+ENAPTER_HTTP_API_PREWARM_CONNECTIONS = os.getenv(
+    "ENAPTER_HTTP_API_PREWARM_CONNECTIONS", "0"
+)
+ENAPTER_HTTP_API_HEDGING_ENABLED = os.getenv("ENAPTER_HTTP_API_HEDGING_ENABLED", "0")
+ENAPTER_HTTP_API_HEDGING_PERCENTILE = os.getenv(
+    "ENAPTER_HTTP_API_HEDGING_PERCENTILE", "0.95"
+)
+ENAPTER_HTTP_API_HEDGING_MAX_RATE = os.getenv(
+    "ENAPTER_HTTP_API_HEDGING_MAX_RATE", "0.05"
+)
+ENAPTER_HTTP_API_USER_RATE_LIMIT = os.getenv("ENAPTER_HTTP_API_USER_RATE_LIMIT", "0")
+ENAPTER_HTTP_API_USER_BURST = os.getenv("ENAPTER_HTTP_API_USER_BURST", "20")
+ENAPTER_HTTP_API_USER_MAX_WAIT = os.getenv("ENAPTER_HTTP_API_USER_MAX_WAIT", "5")
 ENAPTER_LOGO_URL = os.getenv(
     "ENAPTER_LOGO_URL", "https://companieslogo.com/img/orig/H2O.DE-b4a89106.png"
 )
@@ -43,6 +75,16 @@ ENAPTER_CORS_ALLOW_ORIGINS = os.getenv("ENAPTER_CORS_ALLOW_ORIGINS")
 ENAPTER_COMMAND_EXECUTION_ENABLED = os.getenv("ENAPTER_COMMAND_EXECUTION_ENABLED", "0")
 ENAPTER_RULE_EDITING_ENABLED = os.getenv("ENAPTER_RULE_EDITING_ENABLED", "0")
 ENAPTER_SKILL_PLUGINS = os.getenv("ENAPTER_SKILL_PLUGINS")
+ENAPTER_METRICS_ENABLED = os.getenv("ENAPTER_METRICS_ENABLED", "0")
+ENAPTER_TOOL_DEADLINE = os.getenv("ENAPTER_TOOL_DEADLINE", "30")
+ENAPTER_TOOL_DEADLINES = os.getenv("ENAPTER_TOOL_DEADLINES")
+ENAPTER_MAX_TOOL_DEADLINE = os.getenv("ENAPTER_MAX_TOOL_DEADLINE", "120")
+ENAPTER_MAX_CONCURRENT_TOOL_CALLS = os.getenv("ENAPTER_MAX_CONCURRENT_TOOL_CALLS", "64")
+ENAPTER_MAX_CONCURRENT_TOOL_CALLS_PER_USER = os.getenv(
+    "ENAPTER_MAX_CONCURRENT_TOOL_CALLS_PER_USER", "0"
+)
+ENAPTER_TOOL_CALL_QUEUE_SIZE = os.getenv("ENAPTER_TOOL_CALL_QUEUE_SIZE", "32")
+ENAPTER_TOOL_CALL_QUEUE_TIMEOUT = os.getenv("ENAPTER_TOOL_CALL_QUEUE_TIMEOUT", "2")
 
 
 class ServeCommand(Command):
@@ -52,12 +94,113 @@ class ServeCommand(Command):
         parser = parent.add_parser(
             "serve", formatter_class=argparse.ArgumentDefaultsHelpFormatter
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=ENAPTER_MCP_SERVER_WORKERS,
+            help="Number of server processes sharing the server address",
+        )
         parser.add_argument(
             "-u",
             "--enapter-http-api-url",
             default=ENAPTER_HTTP_API_URL,
             help="URL of Enapter HTTP API",
         )
+        parser.add_argument(
+            "--enapter-http-api-max-connections",
+            type=int,
+            default=ENAPTER_HTTP_API_MAX_CONNECTIONS,
+            help="Maximum number of connections to Enapter HTTP API",
+        )
+        parser.add_argument(
+            "--enapter-http-api-max-keepalive-connections",
+            type=int,
+            default=ENAPTER_HTTP_API_MAX_KEEPALIVE_CONNECTIONS,
+            help="Maximum number of idle keep-alive connections to Enapter HTTP API",
+        )
+        parser.add_argument(
+            "--enapter-http-api-keepalive-expiry",
+            type=float,
+            default=ENAPTER_HTTP_API_KEEPALIVE_EXPIRY,
+            help="Seconds after which an idle keep-alive connection is closed",
+        )
+        parser.add_argument(
+            "--enapter-http-api-http2",
+            choices=["0", "1"],
+            default=ENAPTER_HTTP_API_HTTP2,
+            help="Use HTTP/2 for Enapter HTTP API (requires the h2 package)",
+        )
+        parser.add_argument(
+            "--enapter-http-api-connect-timeout",
+            type=float,
+            default=ENAPTER_HTTP_API_CONNECT_TIMEOUT,
+            help="Seconds to wait for a connection to Enapter HTTP API",
+        )
+        parser.add_argument(
+            "--enapter-http-api-read-timeout",
+            type=float,
+            default=ENAPTER_HTTP_API_READ_TIMEOUT,
+            help="Seconds to wait for a chunk of a response from Enapter HTTP API",
+        )
+        parser.add_argument(
+            "--enapter-http-api-write-timeout",
+            type=float,
+            default=ENAPTER_HTTP_API_WRITE_TIMEOUT,
+            help="Seconds to wait for a chunk of a request to Enapter HTTP API",
+        )
+        parser.add_argument(
+            "--enapter-http-api-pool-timeout",
+            type=float,
+            default=ENAPTER_HTTP_API_POOL_TIMEOUT,
+            help="Seconds to wait for a free connection to Enapter HTTP API",
+        )
+        parser.add_argument(
+            "--enapter-http-api-prewarm-connections",
+            type=int,
+            default=ENAPTER_HTTP_API_PREWARM_CONNECTIONS,
+            help="Number of connections to Enapter HTTP API to open at startup",
+        )
+        parser.add_argument(
+            "--enapter-http-api-hedging-enabled",
+            choices=["0", "1"],
+            default=ENAPTER_HTTP_API_HEDGING_ENABLED,
+            help="Send a duplicate of slow single-resource reads (get device, rule"
+            " and rule engine) and use the first response",
+        )
+        parser.add_argument(
+            "--enapter-http-api-hedging-percentile",
+            type=float,
+            default=ENAPTER_HTTP_API_HEDGING_PERCENTILE,
+            help="Latency percentile of recent reads after which a read is hedged",
+        )
+        parser.add_argument(
+            "--enapter-http-api-hedging-max-rate",
+            type=float,
+            default=ENAPTER_HTTP_API_HEDGING_MAX_RATE,
+            help="Maximum share of reads that may be hedged",
+        )
+        parser.add_argument(
+            "--enapter-http-api-user-rate-limit",
+            type=float,
+            default=ENAPTER_HTTP_API_USER_RATE_LIMIT,
+            help="Sustained number of Enapter HTTP API calls per second allowed"
+            " for each user, where a listing counts as one call however many"
+            " pages it reads (0 disables the limit)",
+        )
+        parser.add_argument(
+            "--enapter-http-api-user-burst",
+            type=int,
+            default=ENAPTER_HTTP_API_USER_BURST,
+            help="Number of Enapter HTTP API calls each user may make at once"
+            " above the sustained rate",
+        )
+        parser.add_argument(
+            "--enapter-http-api-user-max-wait",
+            type=float,
+            default=ENAPTER_HTTP_API_USER_MAX_WAIT,
+            help="Maximum number of seconds a rate limited call waits before"
+            " it fails",
+        )
         parser.add_argument(
             "--logo-url",
             default=ENAPTER_LOGO_URL,
@@ -123,7 +266,7 @@ class ServeCommand(Command):
         parser.add_argument(
             "--oauth-proxy-jwt-store-url",
             default=ENAPTER_OAUTH_PROXY_JWT_STORE_URL,
-            help="URL of JWT store for OAuth proxy (e.g. disk:///tmp/fastmcp)",
+            help="URL of JWT store for OAuth proxy (e.g. sqlite:///tmp/fastmcp.db)",
         )
         parser.add_argument(
             "--oauth-proxy-jwt-signing-key",
@@ -151,9 +294,73 @@ class ServeCommand(Command):
             help="Path to the skill plugins directory (each subdirectory is a"
             " namespace containing a skills/ tree)",
         )
+        parser.add_argument(
+            "--metrics-enabled",
+            choices=["0", "1"],
+            default=ENAPTER_METRICS_ENABLED,
+            help="Serve Prometheus metrics at /metrics. The endpoint is not"
+            " protected by the OAuth proxy. Every worker reports its own metrics",
+        )
+        parser.add_argument(
+            "--tool-deadline",
+            type=float,
+            default=ENAPTER_TOOL_DEADLINE,
+            help="Seconds a tool call may take before it is cancelled. Searches"
+            " return the results found so far shortly before the deadline",
+        )
+        parser.add_argument(
+            "--tool-deadlines",
+            default=ENAPTER_TOOL_DEADLINES,
+            help="Comma-separated list of per-tool deadlines overriding"
+            " --tool-deadline (e.g. search_sites=60,get_device=10)",
+        )
+        parser.add_argument(
+            "--max-tool-deadline",
+            type=float,
+            default=ENAPTER_MAX_TOOL_DEADLINE,
+            help="Maximum number of seconds a client may request as a tool call"
+            " deadline through the enapter.com/deadline request metadata",
+        )
+        parser.add_argument(
+            "--max-concurrent-tool-calls",
+            type=int,
+            default=ENAPTER_MAX_CONCURRENT_TOOL_CALLS,
+            help="Maximum number of tool calls running at once (0 disables the"
+            " limit). Every worker applies its own limits",
+        )
+        parser.add_argument(
+            "--max-concurrent-tool-calls-per-user",
+            type=int,
+            default=ENAPTER_MAX_CONCURRENT_TOOL_CALLS_PER_USER,
+            help="Maximum number of tool calls running at once for each user"
+            " (0, the default, disables the limit)",
+        )
+        parser.add_argument(
+            "--tool-call-queue-size",
+            type=int,
+            default=ENAPTER_TOOL_CALL_QUEUE_SIZE,
+            help="Number of tool calls over the limits that may wait for a slot."
+            " Calls beyond it are rejected at once",
+        )
+        parser.add_argument(
+            "--tool-call-queue-timeout",
+            type=float,
+            default=ENAPTER_TOOL_CALL_QUEUE_TIMEOUT,
+            help="Seconds a tool call may wait for a slot before it is"
+            " rejected. Rejected calls are told to retry after as long",
+        )
 
     @staticmethod
     async def run(args: argparse.Namespace) -> None:
+        _check_http2_support(args)
+        if args.workers > 1:
+            _check_shared_jwt_store(args)
+            await _supervise_workers(args)
+        else:
+            await ServeCommand._serve(args, reuse_port=False)
+
+    @staticmethod
+    async def _serve(args: argparse.Namespace, reuse_port: bool) -> None:
         if args.verbose:
             mcp.configure_logging(level="DEBUG")
 
@@ -188,6 +395,14 @@ class ServeCommand(Command):
                 if origin.strip()
             ]
 
+        tool_deadlines: dict[str, float] = {}
+        if args.tool_deadlines is not None:
+            for item in args.tool_deadlines.split(","):
+                if not item.strip():
+                    continue
+                tool, _, seconds = item.partition("=")
+                tool_deadlines[tool.strip()] = float(seconds)
+
         skill_plugins_path = (
             pathlib.Path(args.skill_plugins) if args.skill_plugins else None
         )
@@ -207,21 +422,279 @@ class ServeCommand(Command):
             command_execution_enabled=args.command_execution_enabled == "1",
             rule_editing_enabled=args.rule_editing_enabled == "1",
             skills_enabled=skill_provider is not None,
+            reuse_port=reuse_port,
+            tool_deadline=args.tool_deadline,
+            tool_deadlines=tool_deadlines,
+            max_tool_deadline=args.max_tool_deadline,
+            max_concurrent_tool_calls=args.max_concurrent_tool_calls or None,
+            max_concurrent_tool_calls_per_user=(
+                args.max_concurrent_tool_calls_per_user or None
+            ),
+            tool_call_queue_size=args.tool_call_queue_size,
+            tool_call_queue_timeout=args.tool_call_queue_timeout,
+        )
+
+        transport_config = http.TransportConfig(
+            max_connections=args.enapter_http_api_max_connections,
+            max_keepalive_connections=args.enapter_http_api_max_keepalive_connections,
+            keepalive_expiry=args.enapter_http_api_keepalive_expiry,
+            http2=args.enapter_http_api_http2 == "1",
+            connect_timeout=args.enapter_http_api_connect_timeout,
+            read_timeout=args.enapter_http_api_read_timeout,
+            write_timeout=args.enapter_http_api_write_timeout,
+            pool_timeout=args.enapter_http_api_pool_timeout,
+            prewarm_connections=args.enapter_http_api_prewarm_connections,
         )
 
+        hedger = (
+            http.Hedger(
+                percentile=args.enapter_http_api_hedging_percentile,
+                max_hedge_rate=args.enapter_http_api_hedging_max_rate,
+            )
+            if args.enapter_http_api_hedging_enabled == "1"
+            else None
+        )
+
+        user_rate_limiter = (
+            http.UserRateLimiter(
+                rate=args.enapter_http_api_user_rate_limit,
+                burst=args.enapter_http_api_user_burst,
+                max_wait=args.enapter_http_api_user_max_wait,
+            )
+            if args.enapter_http_api_user_rate_limit > 0
+            else None
+        )
+
+        metrics_registry = metrics.Registry() if args.metrics_enabled == "1" else None
+
         async with asyncio.TaskGroup() as task_group:
-            async with _make_enapter_api(args.enapter_http_api_url) as enapter_api:
+            async with (
+                _make_enapter_api(
+                    args.enapter_http_api_url,
+                    transport_config,
+                    hedger,
+                    user_rate_limiter,
+                ) as enapter_api,
+                contextlib.AsyncExitStack() as stack,
+            ):
+                instrumented_api: core.EnapterAPI = enapter_api
+                if metrics_registry is not None:
+                    instrumented_api = metrics.InstrumentedEnapterAPI(
+                        enapter_api, metrics_registry
+                    )
+                    if isinstance(enapter_api, http.EnapterAPI):
+                        _register_limiter_metrics(metrics_registry, enapter_api.limiter)
+                        if enapter_api.user_rate_limiter is not None:
+                            _register_user_rate_limiter_metrics(
+                                metrics_registry, enapter_api.user_rate_limiter
+                            )
+                    await stack.enter_async_context(
+                        metrics.EventLoopLagMonitor(
+                            metrics_registry, task_group=task_group
+                        )
+                    )
                 app = core.ApplicationServer(
-                    enapter_api=enapter_api, skill_provider=skill_provider
+                    enapter_api=core.CoalescingEnapterAPI(instrumented_api),
+                    skill_provider=skill_provider,
                 )
-                async with mcp.Server(app=app, config=config, task_group=task_group):
+                if metrics_registry is not None:
+                    _register_cache_metrics(metrics_registry, app)
+                async with mcp.Server(
+                    app=app,
+                    config=config,
+                    task_group=task_group,
+                    metrics_registry=metrics_registry,
+                ):
                     await asyncio.Event().wait()
 
 
-def _make_enapter_api(url: str) -> http.EnapterAPI | fake.EnapterAPI:
+def _register_limiter_metrics(
+    registry: metrics.Registry, limiter: http.AdaptiveConcurrencyLimiter
+) -> None:
+    registry.callback_gauge(
+        "enapter_mcp_upstream_concurrency_limit",
+        "Current adaptive limit on concurrent Enapter HTTP API requests",
+        (),
+        lambda: [((), limiter.limit)],
+    )
+    registry.callback_gauge(
+        "enapter_mcp_upstream_requests_in_flight",
+        "Enapter HTTP API requests holding a concurrency slot",
+        (),
+        lambda: [((), limiter.in_flight)],
+    )
+    registry.callback_gauge(
+        "enapter_mcp_upstream_requests_queued",
+        "Enapter HTTP API requests waiting for a concurrency slot",
+        (),
+        lambda: [((), limiter.queue_depth)],
+    )
+
+
+def _register_user_rate_limiter_metrics(
+    registry: metrics.Registry, limiter: http.UserRateLimiter
+) -> None:
+    registry.callback_gauge(
+        "enapter_mcp_upstream_user_calls",
+        "Enapter HTTP API calls by user rate limit outcome, either admitted or"
+        " rejected, counted since the user was last forgotten by the limiter",
+        ("identity", "outcome"),
+        lambda: [
+            ((identity, outcome), count)
+            for identity, stats in limiter.stats.items()
+            for outcome, count in (
+                ("admitted", stats.admitted),
+                ("rejected", stats.rejected),
+            )
+        ],
+    )
+    registry.callback_gauge(
+        "enapter_mcp_upstream_user_wait_seconds",
+        "Time Enapter HTTP API calls waited for the user rate limit, counted"
+        " since the user was last forgotten by the limiter",
+        ("identity",),
+        lambda: [
+            ((identity,), stats.wait_seconds)
+            for identity, stats in limiter.stats.items()
+        ],
+    )
+
+
+def _register_cache_metrics(
+    registry: metrics.Registry, app: core.ApplicationServer
+) -> None:
+    caches = app.caches
+    registry.callback_gauge(
+        "enapter_mcp_cache_lookups",
+        "Cache lookups by cache and result, either hit, stale_hit or miss,"
+        " counted since startup",
+        ("cache", "result"),
+        lambda: [
+            ((name, result), count)
+            for name, cache in caches.items()
+            for result, count in (
+                ("hit", cache.stats.hits),
+                ("stale_hit", cache.stats.stale_hits),
+                ("miss", cache.stats.misses),
+            )
+        ],
+    )
+    registry.callback_gauge(
+        "enapter_mcp_cache_evictions",
+        "Entries evicted by cache to stay within its size, counted since startup",
+        ("cache",),
+        lambda: [((name,), cache.stats.evictions) for name, cache in caches.items()],
+    )
+    registry.callback_gauge(
+        "enapter_mcp_cache_entries",
+        "Entries held by cache",
+        ("cache",),
+        lambda: [((name,), len(cache)) for name, cache in caches.items()],
+    )
+
+
+def _check_http2_support(args: argparse.Namespace) -> None:
+    if args.enapter_http_api_http2 != "1":
+        return
+    if importlib.util.find_spec("h2") is None:
+        raise ValueError(
+            "HTTP/2 needs the h2 package, install it with"
+            " `pip install httpx[http2]` or disable HTTP/2"
+        )
+
+
+def _check_shared_jwt_store(args: argparse.Namespace) -> None:
+    if args.oauth_proxy_enabled != "1":
+        return
+    scheme = urllib.parse.urlparse(args.oauth_proxy_jwt_store_url or "").scheme
+    if scheme in ("", "memory"):
+        raise ValueError(
+            "Multiple workers need a JWT store shared between processes,"
+            " e.g. sqlite:///var/lib/enapter-mcp-server/jwt.db"
+        )
+
+
+async def _supervise_workers(args: argparse.Namespace) -> None:
+    """Run server processes until one of them exits or SIGTERM arrives.
+
+    Workers bind the same address with SO_REUSEPORT and the kernel spreads
+    incoming connections between them. Workers are spawned rather than
+    forked, since forking a process with a running event loop and threads
+    is unsafe. Stopping the supervisor stops all workers.
+    """
+    loop = asyncio.get_running_loop()
+    context = multiprocessing.get_context("spawn")
+    workers: list[multiprocessing.process.BaseProcess] = [
+        context.Process(target=_run_worker, args=(args,), name=f"worker-{i}")
+        for i in range(args.workers)
+    ]
+
+    stop = asyncio.Event()
+    exited: list[multiprocessing.process.BaseProcess] = []
+
+    def on_exit(worker: multiprocessing.process.BaseProcess) -> None:
+        exited.append(worker)
+        stop.set()
+
+    loop.add_signal_handler(signal.SIGTERM, stop.set)
+    try:
+        for worker in workers:
+            worker.start()
+            loop.add_reader(worker.sentinel, on_exit, worker)
+        await stop.wait()
+    finally:
+        loop.remove_signal_handler(signal.SIGTERM)
+        for worker in workers:
+            if worker.pid is not None:
+                loop.remove_reader(worker.sentinel)
+        await _stop_workers(workers)
+
+    if exited:
+        raise RuntimeError(
+            f"Server {exited[0].name} exited with code {exited[0].exitcode}"
+        )
+
+
+async def _stop_workers(
+    workers: list[multiprocessing.process.BaseProcess], timeout: float = 10.0
+) -> None:
+    # Workers shut down gracefully on SIGTERM and are killed if they do not
+    # make it in time.
+    for worker in workers:
+        if worker.is_alive():
+            worker.terminate()
+    for worker in workers:
+        if worker.pid is None:
+            continue
+        await asyncio.to_thread(worker.join, timeout)
+        if worker.is_alive():
+            worker.kill()
+            await asyncio.to_thread(worker.join)
+
+
+def _run_worker(args: argparse.Namespace) -> None:
+    if args.sentry_dsn is not None:
+        init_sentry(args)
+    if args.tracing_exporter_url is not None:
+        init_tracing(args)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(ServeCommand._serve(args, reuse_port=True))
+
+
+def _make_enapter_api(
+    url: str,
+    transport_config: http.TransportConfig | None = None,
+    hedger: http.Hedger | None = None,
+    user_rate_limiter: http.UserRateLimiter | None = None,
+) -> http.EnapterAPI | fake.EnapterAPI:
     parsed = urllib.parse.urlparse(url)
     if parsed.scheme == "fake":
         return fake.EnapterAPI.from_url(url)
     if parsed.scheme in ("http", "https"):
-        return http.EnapterAPI(base_url=url)
+        return http.EnapterAPI(
+            base_url=url,
+            transport_config=transport_config,
+            hedger=hedger,
+            user_rate_limiter=user_rate_limiter,
+        )
     raise ValueError(f"Unsupported URL scheme: {parsed.scheme!r}")
@@ -0,0 +1,62 @@
+import argparse
+import atexit
+import sys
+import urllib.parse
+
+import opentelemetry.sdk.resources
+import opentelemetry.sdk.trace
+import opentelemetry.sdk.trace.export
+
+import enapter_mcp_server
+from enapter_mcp_server import tracing
+
+
+def init_tracing(args: argparse.Namespace) -> None:
+    provider = opentelemetry.sdk.trace.TracerProvider(
+        resource=opentelemetry.sdk.resources.Resource.create(
+            {
+                "service.name": "enapter-mcp-server",
+                "service.version": enapter_mcp_server.__version__,
+            }
+        ),
+        shutdown_on_exit=False,
+    )
+    # Shutting down exports the spans still queued and closes the exporter.
+    atexit.register(provider.shutdown)
+    provider.add_span_processor(
+        opentelemetry.sdk.trace.export.BatchSpanProcessor(
+            _make_span_exporter(args.tracing_exporter_url)
+        )
+    )
+    tracing.configure(provider)
+
+
+def _make_span_exporter(url: str) -> opentelemetry.sdk.trace.export.SpanExporter:
+    parsed = urllib.parse.urlparse(url)
+    match parsed.scheme:
+        case "console":
+            return opentelemetry.sdk.trace.export.ConsoleSpanExporter(out=sys.stderr)
+        case "file":
+            return _FileSpanExporter(parsed.path)
+        case "http" | "https":
+            import opentelemetry.exporter.otlp.proto.http.trace_exporter as otlp
+
+            return otlp.OTLPSpanExporter(endpoint=url)
+        case _:
+            raise ValueError(
+                f"Unsupported tracing exporter URL scheme: {parsed.scheme!r}"
+            )
+
+
+class _FileSpanExporter(opentelemetry.sdk.trace.export.ConsoleSpanExporter):
+    """Appends spans to a file, one per line, so that it reads as JSON lines."""
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "a")
+        super().__init__(
+            out=self._file,
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+
+    def shutdown(self) -> None:
+        self._file.close()
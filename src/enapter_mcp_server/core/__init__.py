@@ -1,41 +1,70 @@
+from .admission_controller import AdmissionController
 from .application_server import ApplicationServer
 from .auth_config import AuthConfig
+from .coalescing_enapter_api import CoalescingEnapterAPI, memoize_reads
 from .command_execution_search_query import CommandExecutionSearchQuery
-from .device_search_query import DeviceSearchQuery
+from .deadline import Cutoff, deadline, deadline_share, until_deadline
+from .device_search_query import DeviceAccessPath, DeviceSearchQuery
 from .enapter_api import EnapterAPI
 from .errors import (
     CommandNotFound,
     ConfirmationRequired,
+    DeadlineExceeded,
     DeviceNotFound,
     GatewayUnavailable,
+    InvalidCursor,
     LatestTelemetryUnavailable,
+    RateLimitExceeded,
     RuleEngineNotFound,
     RuleNotFound,
     RuleSlugConflict,
     SearchQueryTooBroad,
+    ServerOverloaded,
     SiteNotFound,
+    UpstreamUnavailable,
 )
+from .page import Page
 from .rule_search_query import RuleSearchQuery
+from .search_snapshots import Scan, SearchSnapshots
 from .site_search_query import SiteSearchQuery
 from .skill_provider import SkillProvider
+from .ttl_cache import CacheStats, TTLCache
 
 __all__ = [
+    "AdmissionController",
     "ApplicationServer",
     "AuthConfig",
+    "CacheStats",
+    "CoalescingEnapterAPI",
     "CommandExecutionSearchQuery",
     "CommandNotFound",
     "ConfirmationRequired",
+    "Cutoff",
+    "DeadlineExceeded",
+    "DeviceAccessPath",
     "DeviceNotFound",
     "DeviceSearchQuery",
     "EnapterAPI",
     "GatewayUnavailable",
+    "InvalidCursor",
     "LatestTelemetryUnavailable",
+    "Page",
+    "RateLimitExceeded",
     "RuleEngineNotFound",
     "RuleNotFound",
     "RuleSearchQuery",
     "RuleSlugConflict",
+    "Scan",
     "SearchQueryTooBroad",
+    "SearchSnapshots",
+    "ServerOverloaded",
     "SiteNotFound",
     "SiteSearchQuery",
     "SkillProvider",
+    "TTLCache",
+    "UpstreamUnavailable",
+    "deadline",
+    "deadline_share",
+    "memoize_reads",
+    "until_deadline",
 ]
@@ -0,0 +1,122 @@
+import asyncio
+import collections
+import dataclasses
+import time
+from typing import Callable
+
+from .errors import ServerOverloaded
+
+
+@dataclasses.dataclass
+class _Waiter:
+    identity: str
+    future: asyncio.Future[None]
+
+
+class AdmissionController:
+    """Limits the number of tool calls running at once.
+
+    At most `max_in_flight` calls run at once, and at most
+    `max_in_flight_per_identity` of them on behalf of the same identity. A
+    call over either limit waits in a queue of `max_queued` calls and is
+    admitted in arrival order once both limits allow it, skipping calls of
+    identities that are still at their limit. A call that finds the queue
+    full, or waits longer than `max_wait` seconds, fails with
+    `ServerOverloaded` suggesting a retry in `retry_after` seconds.
+
+    A limit of None does not limit anything.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int | None = None,
+        max_in_flight_per_identity: int | None = None,
+        max_queued: int = 0,
+        max_wait: float = 1.0,
+        retry_after: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_in_flight = max_in_flight
+        self._max_in_flight_per_identity = max_in_flight_per_identity
+        self._max_queued = max_queued
+        self._max_wait = max_wait
+        self._retry_after = retry_after
+        self._clock = clock
+        self._in_flight = 0
+        self._in_flight_by_identity: dict[str, int] = {}
+        self._waiters: collections.deque[_Waiter] = collections.deque()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, identity: str) -> float:
+        """Wait until the call may run and return how long it waited."""
+        # Queued calls are admitted as soon as the limits allow it, so a call
+        # that finds room does not overtake any of them.
+        if self._has_room(identity):
+            self._admit(identity)
+            return 0.0
+
+        if len(self._waiters) >= self._max_queued:
+            raise ServerOverloaded("queue_full", self._retry_after)
+
+        started_at = self._clock()
+        waiter = _Waiter(identity, asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        try:
+            async with asyncio.timeout(self._max_wait):
+                await waiter.future
+        except (asyncio.CancelledError, TimeoutError) as e:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # The call was admitted right before it gave up.
+                self.release(identity)
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(e, TimeoutError):
+                raise ServerOverloaded("queue_timeout", self._retry_after) from e
+            raise
+        return self._clock() - started_at
+
+    def release(self, identity: str) -> None:
+        self._in_flight -= 1
+        remaining = self._in_flight_by_identity[identity] - 1
+        if remaining:
+            self._in_flight_by_identity[identity] = remaining
+        else:
+            del self._in_flight_by_identity[identity]
+        self._wake_waiters()
+
+    def _has_room(self, identity: str) -> bool:
+        if self._max_in_flight is not None and self._in_flight >= self._max_in_flight:
+            return False
+        if (
+            self._max_in_flight_per_identity is not None
+            and self._in_flight_by_identity.get(identity, 0)
+            >= self._max_in_flight_per_identity
+        ):
+            return False
+        return True
+
+    def _admit(self, identity: str) -> None:
+        self._in_flight += 1
+        self._in_flight_by_identity[identity] = (
+            self._in_flight_by_identity.get(identity, 0) + 1
+        )
+
+    def _wake_waiters(self) -> None:
+        for waiter in list(self._waiters):
+            if (
+                self._max_in_flight is not None
+                and self._in_flight >= self._max_in_flight
+            ):
+                return
+            if waiter.future.done() or not self._has_room(waiter.identity):
+                continue
+            self._waiters.remove(waiter)
+            self._admit(waiter.identity)
+            waiter.future.set_result(None)
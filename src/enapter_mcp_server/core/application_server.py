@@ -1,24 +1,60 @@
 import asyncio
+import dataclasses
 import datetime
+import enum
+import functools
 import pathlib
 import re
-from typing import Any
+from typing import Any, Awaitable, Callable
 
-from enapter_mcp_server import domain
+from enapter_mcp_server import domain, tracing
 
 from .auth_config import AuthConfig
 from .command_execution_search_query import CommandExecutionSearchQuery
-from .device_search_query import DeviceSearchQuery
+from .deadline import deadline_share, until_deadline
+from .device_search_query import DeviceAccessPath, DeviceSearchQuery
 from .enapter_api import EnapterAPI
 from .errors import (
     CommandNotFound,
     ConfirmationRequired,
+    DeviceNotFound,
     GatewayUnavailable,
     SearchQueryTooBroad,
 )
+from .keyset_cursor import KeysetCursor
+from .page import Page
 from .rule_search_query import RuleSearchQuery
+from .search_snapshots import Scan, SearchSnapshots
 from .site_search_query import SiteSearchQuery
 from .skill_provider import SkillProvider
+from .ttl_cache import TTLCache
+
+# Share of the time left to the deadline that listing sites may take, so that
+# the statuses of the sites found can be computed in the rest.
+_SITE_LISTING_DEADLINE_SHARE = 0.5
+
+
+@dataclasses.dataclass
+class _SiteDevicesTally:
+    gateway_id: str | None = None
+    gateway_online: bool = False
+    devices_total: int = 0
+    devices_online: int = 0
+
+    def add(self, device: domain.Device) -> None:
+        self.devices_total += 1
+        if device.is_online:
+            self.devices_online += 1
+
+        if device.is_gateway:
+            self.gateway_id = device.id
+            self.gateway_online = device.is_online is True
+
+
+class _GatewayLiveness(enum.Enum):
+    ONLINE = "online"
+    OFFLINE = "offline"
+    ABSENT = "absent"
 
 
 class ApplicationServer:
@@ -27,109 +63,279 @@ class ApplicationServer:
         self,
         enapter_api: EnapterAPI,
         skill_provider: SkillProvider | None = None,
+        site_status_bulk_share: float = 0.5,
+        site_status_cache: (
+            TTLCache[tuple[AuthConfig, str], domain.SiteStatus] | None
+        ) = None,
+        manifest_cache: TTLCache[str, domain.DeviceManifest] | None = None,
+        search_snapshots: SearchSnapshots | None = None,
     ) -> None:
         self._enapter_api = enapter_api
         self._skill_provider = skill_provider
+        # Statuses are computed from one fleet-wide device listing once the
+        # sites missing one make up this share of the sites of the user, as
+        # the listing then reads at most a few times the devices that the
+        # listings of the sites would, in far fewer requests.
+        self._site_status_bulk_share = site_status_bulk_share
+        self._site_status_cache: TTLCache[tuple[AuthConfig, str], domain.SiteStatus] = (
+            site_status_cache
+            if site_status_cache is not None
+            else TTLCache(ttl=10.0, stale_ttl=50.0, max_size=10_000)
+        )
+        # Devices sharing a blueprint have identical manifests, so parsed
+        # manifests are shared across devices, users and requests.
+        self._manifest_cache: TTLCache[str, domain.DeviceManifest] = (
+            manifest_cache
+            if manifest_cache is not None
+            else TTLCache(ttl=60.0 * 60.0, max_size=1024)
+        )
+        self._blueprint_summaries: TTLCache[str, domain.BlueprintSummary] = TTLCache(
+            ttl=60.0 * 60.0, max_size=10_000
+        )
+        self._gateway_liveness_cache: TTLCache[
+            tuple[AuthConfig, str], _GatewayLiveness
+        ] = TTLCache(ttl=5.0, max_size=10_000)
+        self._site_gateway_ids: TTLCache[str, str] = TTLCache(
+            ttl=60.0 * 60.0, max_size=10_000
+        )
+        self._site_counts: TTLCache[AuthConfig, int] = TTLCache(
+            ttl=60.0 * 60.0, max_size=10_000
+        )
+        self._search_snapshots = (
+            search_snapshots if search_snapshots is not None else SearchSnapshots()
+        )
         self._rule_policy: domain.RuleManagementPolicy = (
             domain.MCPRuleManagementPolicy()
         )
 
+    @property
+    def caches(self) -> dict[str, TTLCache[Any, Any]]:
+        """Caches shared across requests, by name, for monitoring."""
+        return {
+            "site_status": self._site_status_cache,
+            "manifest": self._manifest_cache,
+            "blueprint_summary": self._blueprint_summaries,
+            "gateway_liveness": self._gateway_liveness_cache,
+        }
+
+    @tracing.traced("ApplicationServer.read_skill")
     async def read_skill(self, name: str, file: pathlib.PurePosixPath) -> str:
         if self._skill_provider is None:
             raise RuntimeError("Skill provider is not configured")
         skill = self._skill_provider.load_skill(name)
         return skill.read(file)
 
+    @tracing.traced("ApplicationServer.search_sites")
     async def search_sites(
         self,
         auth: AuthConfig,
         query: SiteSearchQuery,
         offset: int,
         limit: int,
-    ) -> list[domain.Site]:
-        sites = await self._search_sites(auth, query)
-        sites.sort(key=lambda s: s.id)
-        return sites[offset : offset + limit]
+        cursor: str | None = None,
+    ) -> Page[domain.Site]:
+        page = await self._search_snapshots.page(
+            auth,
+            ("sites", query),
+            functools.partial(self._search_sites, auth, query),
+            offset,
+            limit,
+            cursor,
+        )
+        sites, complete = await self._enrich_sites(auth, page.items)
+        return dataclasses.replace(
+            page, items=sites, truncated=page.truncated or not complete
+        )
 
     async def _search_sites(
         self, auth: AuthConfig, query: SiteSearchQuery
-    ) -> list[domain.Site]:
-        semaphore = asyncio.Semaphore(10)
+    ) -> Scan[domain.Site]:
+        sites: list[domain.Site] = []
+        count = 0
+        with deadline_share(_SITE_LISTING_DEADLINE_SHARE):
+            async with until_deadline() as cutoff:
+                async with self._enapter_api.list_sites(auth) as sites_gen:
+                    async for site in sites_gen:
+                        count += 1
+                        if query.matches(site):
+                            sites.append(site)
+
+        if not cutoff.reached:
+            self._site_counts.put(auth, count)
+        sites.sort(key=lambda s: s.id)
+        return Scan(items=sites, truncated=cutoff.reached)
+
+    async def _enrich_sites(
+        self, auth: AuthConfig, sites: list[domain.Site]
+    ) -> tuple[list[domain.Site], bool]:
+        """Attach statuses to sites and tell whether all of them got one.
+
+        Sites whose status is not computed by the deadline are returned
+        without one, so that the page keeps its place in the search.
+        """
+        # Computing a site status costs a device listing plus possibly a rule
+        # engine lookup, so it is only done for the requested page and only
+        # for sites whose status is not cached.
+        statuses: dict[str, domain.SiteStatus] = {}
+        missing: list[str] = []
+        for site in sites:
+            status = self._site_status_cache.lookup(
+                (auth, site.id),
+                functools.partial(self._compute_site_status, auth, site.id),
+            )
+            if status is not None:
+                statuses[site.id] = status
+            else:
+                missing.append(site.id)
+
+        site_count = self._site_counts.lookup(auth)
+        load: Callable[[str], Awaitable[domain.SiteStatus]] = (
+            self._bulk_site_status_loader(auth, missing)
+            if len(missing) > 1
+            and site_count is not None
+            and len(missing) >= site_count * self._site_status_bulk_share
+            else functools.partial(self._compute_site_status, auth)
+        )
+        async with until_deadline() as cutoff:
+            await self._compute_site_statuses(auth, missing, statuses, load)
 
-        async def enrich(site: domain.Site) -> domain.Site:
-            async with semaphore:
-                status = await self._compute_site_status(auth, site.id)
-                return site.with_status(status)
+        enriched = [
+            site.with_status(statuses[site.id]) if site.id in statuses else site
+            for site in sites
+        ]
+        return enriched, not cutoff.reached
+
+    async def _compute_site_statuses(
+        self,
+        auth: AuthConfig,
+        site_ids: list[str],
+        statuses: dict[str, domain.SiteStatus],
+        load: Callable[[str], Awaitable[domain.SiteStatus]],
+    ) -> None:
+        # Statuses are stored as they complete, so that the ones computed
+        # before the deadline survive the cancellation of the rest.
+        async def compute(site_id: str) -> None:
+            statuses[site_id] = await self._site_status_cache.fill(
+                (auth, site_id), functools.partial(load, site_id)
+            )
 
-        tasks = []
         async with asyncio.TaskGroup() as tg:
-            async with self._enapter_api.list_sites(auth) as sites_gen:
-                async for site in sites_gen:
-                    if not query.matches(site):
-                        continue
+            for site_id in site_ids:
+                tg.create_task(compute(site_id))
+
+    def _bulk_site_status_loader(
+        self, auth: AuthConfig, site_ids: list[str]
+    ) -> Callable[[str], Awaitable[domain.SiteStatus]]:
+        # The cache loads of the sites share one bulk computation, started by
+        # the first of them and cancelled once none of them waits for it.
+        # Sites already being loaded by another caller keep that load.
+        bulk: asyncio.Task[dict[str, domain.SiteStatus]] | None = None
+        waiting: set[str] = set()
+
+        async def load(site_id: str) -> domain.SiteStatus:
+            nonlocal bulk
+            if bulk is None:
+                bulk = asyncio.create_task(
+                    self._compute_site_statuses_bulk(auth, site_ids)
+                )
+            waiting.add(site_id)
+            try:
+                statuses = await asyncio.shield(bulk)
+            finally:
+                waiting.discard(site_id)
+                if not waiting and not bulk.done():
+                    bulk.cancel()
+            return statuses[site_id]
+
+        return load
+
+    async def _compute_site_statuses_bulk(
+        self, auth: AuthConfig, site_ids: list[str]
+    ) -> dict[str, domain.SiteStatus]:
+        # One fleet-wide listing replaces a paginated listing per site.
+        tallies = {site_id: _SiteDevicesTally() for site_id in site_ids}
+        async with self._enapter_api.list_devices(
+            auth, expand_connectivity=True
+        ) as devices_gen:
+            async for device in devices_gen:
+                tally = tallies.get(device.site_id)
+                if tally is not None:
+                    tally.add(device)
 
-                    tasks.append(tg.create_task(enrich(site)))
+        async def complete(site_id: str) -> domain.SiteStatus:
+            return await self._complete_site_status(auth, site_id, tallies[site_id])
 
-        return [task.result() for task in tasks]
+        async with asyncio.TaskGroup() as tg:
+            tasks = {site_id: tg.create_task(complete(site_id)) for site_id in site_ids}
+
+        return {site_id: task.result() for site_id, task in tasks.items()}
 
     async def _compute_site_status(
         self, auth: AuthConfig, site_id: str
     ) -> domain.SiteStatus:
-        gateway_id: str | None = None
-        gateway_online = False
-        devices_online = 0
-        device_ids: list[str] = []
-
+        tally = _SiteDevicesTally()
         async with self._enapter_api.list_devices(
             auth, site_id=site_id, expand_connectivity=True
         ) as devices_gen:
             async for device in devices_gen:
-                device_ids.append(device.id)
-                if device.is_online:
-                    devices_online += 1
+                tally.add(device)
 
-                if device.is_gateway:
-                    gateway_id = device.id
-                    gateway_online = device.is_online is True
+        return await self._complete_site_status(auth, site_id, tally)
+
+    async def _complete_site_status(
+        self, auth: AuthConfig, site_id: str, tally: _SiteDevicesTally
+    ) -> domain.SiteStatus:
+        if tally.gateway_id is not None:
+            self._site_gateway_ids.put(site_id, tally.gateway_id)
 
         rule_engine_state: domain.RuleEngineState | None = None
-        if gateway_online:
+        if tally.gateway_online:
             engine = await self._enapter_api.get_rule_engine(auth, site_id)
             rule_engine_state = engine.state
 
         return domain.SiteStatus(
-            gateway_id=gateway_id,
-            gateway_online=gateway_online,
-            devices_total=len(device_ids),
-            devices_online=devices_online,
+            gateway_id=tally.gateway_id,
+            gateway_online=tally.gateway_online,
+            devices_total=tally.devices_total,
+            devices_online=tally.devices_online,
             rule_engine_state=rule_engine_state,
         )
 
+    @tracing.traced("ApplicationServer.search_rules")
     async def search_rules(
         self,
         auth: AuthConfig,
         query: RuleSearchQuery,
         offset: int,
         limit: int,
-    ) -> list[domain.Rule]:
+        cursor: str | None = None,
+    ) -> Page[domain.Rule]:
         await self._assert_gateway_online(auth, query.site_id)
-        rules = await self._search_rules(auth, query)
-        rules.sort(key=lambda r: r.id)
-        return rules[offset : offset + limit]
+        return await self._search_snapshots.page(
+            auth,
+            ("rules", query),
+            functools.partial(self._search_rules, auth, query),
+            offset,
+            limit,
+            cursor,
+        )
 
     async def _search_rules(
         self, auth: AuthConfig, query: RuleSearchQuery
-    ) -> list[domain.Rule]:
+    ) -> Scan[domain.Rule]:
         rules: list[domain.Rule] = []
-        async with self._enapter_api.list_rules(auth, query.site_id) as rules_gen:
-            async for rule in rules_gen:
-                if not query.matches(rule):
-                    continue
+        async with until_deadline() as cutoff:
+            async with self._enapter_api.list_rules(auth, query.site_id) as rules_gen:
+                async for rule in rules_gen:
+                    if not query.matches(rule):
+                        continue
 
-                rules.append(rule)
+                    rules.append(rule)
 
-        return rules
+        rules.sort(key=lambda r: r.id)
+        return Scan(items=rules, truncated=cutoff.reached)
 
+    @tracing.traced("ApplicationServer.read_rule")
     async def read_rule(
         self,
         auth: AuthConfig,
@@ -143,6 +349,7 @@ class ApplicationServer:
         lines = rule.script.code.splitlines()
         return lines[offset : offset + limit]
 
+    @tracing.traced("ApplicationServer.create_rule")
     async def create_rule(
         self,
         auth: AuthConfig,
@@ -151,7 +358,7 @@ class ApplicationServer:
         script: domain.RuleScript,
         disabled: bool,
     ) -> domain.Rule:
-        await self._assert_gateway_online(auth, site_id)
+        await self._assert_gateway_online(auth, site_id, fresh=True)
         self._rule_policy.assert_can_create(
             slug=slug,
             script=script,
@@ -165,6 +372,7 @@ class ApplicationServer:
             disabled=disabled,
         )
 
+    @tracing.traced("ApplicationServer.edit_rule")
     async def edit_rule(
         self,
         auth: AuthConfig,
@@ -173,7 +381,7 @@ class ApplicationServer:
         old_string: str,
         new_string: str,
     ) -> domain.Rule:
-        await self._assert_gateway_online(auth, site_id)
+        await self._assert_gateway_online(auth, site_id, fresh=True)
 
         rule = await self._enapter_api.get_rule(auth, site_id, rule_id)
         self._rule_policy.assert_can_edit(rule)
@@ -195,13 +403,14 @@ class ApplicationServer:
             script,
         )
 
+    @tracing.traced("ApplicationServer.delete_rule")
     async def delete_rule(
         self,
         auth: AuthConfig,
         site_id: str,
         rule_id: str,
     ) -> None:
-        await self._assert_gateway_online(auth, site_id)
+        await self._assert_gateway_online(auth, site_id, fresh=True)
         rule = await self._enapter_api.get_rule(auth, site_id, rule_id)
         self._rule_policy.assert_can_delete(rule)
 
@@ -211,21 +420,64 @@ class ApplicationServer:
         # is accepted in v1.
         await self._enapter_api.delete_rule(auth, rule_id, site_id)
 
-    async def _assert_gateway_online(self, auth: AuthConfig, site_id: str) -> None:
+    async def _assert_gateway_online(
+        self, auth: AuthConfig, site_id: str, fresh: bool = False
+    ) -> None:
+        key = (auth, site_id)
+        if fresh:
+            self._gateway_liveness_cache.invalidate(key)
+        liveness = await self._gateway_liveness_cache.get(
+            key, functools.partial(self._check_gateway_liveness, auth, site_id)
+        )
+        match liveness:
+            case _GatewayLiveness.ONLINE:
+                return
+            case _GatewayLiveness.OFFLINE:
+                raise GatewayUnavailable("The site's gateway is currently offline.")
+            case _GatewayLiveness.ABSENT:
+                raise GatewayUnavailable("The site has no gateway.")
+            case _:
+                raise NotImplementedError(liveness)
+
+    async def _check_gateway_liveness(
+        self, auth: AuthConfig, site_id: str
+    ) -> _GatewayLiveness:
+        gateway_id = self._site_gateway_ids.lookup(site_id)
+        if gateway_id is not None:
+            try:
+                gateway: domain.Device | None = await self._enapter_api.get_device(
+                    auth, gateway_id, expand_connectivity=True
+                )
+            except DeviceNotFound:
+                gateway = None
+            if (
+                gateway is not None
+                and gateway.is_gateway
+                and gateway.site_id == site_id
+            ):
+                return self._gateway_liveness(gateway)
+            # The gateway was replaced or moved, fall back to a site scan.
+            self._site_gateway_ids.invalidate(site_id)
+
         async with self._enapter_api.list_devices(
             auth,
             site_id=site_id,
             expand_connectivity=True,
         ) as devices_gen:
             async for device in devices_gen:
-                if not device.is_gateway:
-                    continue
-                if device.is_online:
-                    return
-                raise GatewayUnavailable("The site's gateway is currently offline.")
+                if device.is_gateway:
+                    self._site_gateway_ids.put(site_id, device.id)
+                    return self._gateway_liveness(device)
 
-        raise GatewayUnavailable("The site has no gateway.")
+        return _GatewayLiveness.ABSENT
 
+    @staticmethod
+    def _gateway_liveness(gateway: domain.Device) -> _GatewayLiveness:
+        return (
+            _GatewayLiveness.ONLINE if gateway.is_online else _GatewayLiveness.OFFLINE
+        )
+
+    @tracing.traced("ApplicationServer.search_devices")
     async def search_devices(
         self,
         auth: AuthConfig,
@@ -233,58 +485,191 @@ class ApplicationServer:
         offset: int,
         limit: int,
         view: domain.DeviceViewType,
-    ) -> list[domain.DeviceView]:
+        cursor: str | None = None,
+    ) -> Page[domain.DeviceView]:
         match view:
             case domain.DeviceViewType.BASIC:
-                views = await self._search_devices_basic(auth, query)
+                search = functools.partial(self._search_devices_basic, auth, query)
             case domain.DeviceViewType.FULL:
-                views = await self._search_devices_full(auth, query)
+                search = functools.partial(self._search_devices_full, auth, query)
             case _:
                 raise NotImplementedError(view)
 
-        views.sort(key=lambda v: v.id)
-        return views[offset : offset + limit]
+        return await self._search_snapshots.page(
+            auth,
+            ("devices", view, query),
+            search,
+            offset,
+            limit,
+            cursor,
+        )
 
     async def _search_devices_basic(
         self, auth: AuthConfig, query: DeviceSearchQuery
-    ) -> list[domain.DeviceView]:
-        views: list[domain.DeviceView] = []
-        async with self._enapter_api.list_devices(
-            auth,
-            site_id=query.site_id,
-            expand_manifest=True,
-            expand_connectivity=True,
-            expand_active_alerts=True,
-        ) as devices_gen:
-            async for device in devices_gen:
-                if query.matches(device):
-                    views.append(domain.DeviceViewBasic(device))
-
-        return views
+    ) -> Scan[domain.DeviceView]:
+        found = await self._find_devices(auth, query, expand_properties=False)
+        summaries = await self._resolve_blueprint_summaries(auth, found.items)
+        return Scan(
+            items=[
+                domain.DeviceViewBasic(
+                    device, blueprint_summary=summaries[device.blueprint_id]
+                )
+                for device in found.items
+            ],
+            truncated=found.truncated,
+        )
 
     async def _search_devices_full(
         self, auth: AuthConfig, query: DeviceSearchQuery
-    ) -> list[domain.DeviceView]:
+    ) -> Scan[domain.DeviceView]:
         if query.site_id is None and query.device_id is None:
             raise SearchQueryTooBroad(
                 "Please provide `site_id` or `device_id` to narrow down the search."
             )
 
-        views: list[domain.DeviceView] = []
-        async with self._enapter_api.list_devices(
-            auth,
-            site_id=query.site_id,
-            expand_manifest=True,
-            expand_properties=True,
-            expand_connectivity=True,
-            expand_active_alerts=True,
-        ) as devices_gen:
-            async for device in devices_gen:
-                if query.matches(device):
-                    views.append(domain.DeviceViewFull(device))
+        found = await self._find_devices(auth, query, expand_properties=True)
+        devices = await self._attach_manifests(auth, found.items)
+        return Scan(
+            items=[domain.DeviceViewFull(device) for device in devices],
+            truncated=found.truncated,
+        )
+
+    async def _find_devices(
+        self, auth: AuthConfig, query: DeviceSearchQuery, expand_properties: bool
+    ) -> Scan[domain.Device]:
+        if query.access_path == DeviceAccessPath.GET_DEVICE:
+            assert query.device_id is not None
+            try:
+                device = await self._enapter_api.get_device(
+                    auth,
+                    query.device_id,
+                    expand_properties=expand_properties,
+                    expand_connectivity=True,
+                    expand_active_alerts=True,
+                )
+            except DeviceNotFound:
+                return Scan(items=[])
+            return Scan(items=[device] if query.matches(device) else [])
+
+        devices: list[domain.Device] = []
+        async with until_deadline() as cutoff:
+            async with self._enapter_api.list_devices(
+                auth,
+                site_id=query.site_id,
+                expand_properties=expand_properties,
+                expand_connectivity=True,
+                expand_active_alerts=True,
+            ) as devices_gen:
+                async for device in devices_gen:
+                    if query.matches(device):
+                        devices.append(device)
+
+        devices.sort(key=lambda d: d.id)
+        return Scan(items=devices, truncated=cutoff.reached)
+
+    async def _resolve_blueprint_summaries(
+        self, auth: AuthConfig, devices: list[domain.Device]
+    ) -> dict[str, domain.BlueprintSummary]:
+        summaries: dict[str, domain.BlueprintSummary] = {}
+        unindexed: dict[str, domain.Device] = {}
+        for device in devices:
+            blueprint_id = device.blueprint_id
+            if blueprint_id in summaries or blueprint_id in unindexed:
+                continue
+            summary = (
+                self._blueprint_summaries.lookup(blueprint_id)
+                if device.manifest is None
+                else None
+            )
+            if summary is not None:
+                summaries[blueprint_id] = summary
+            else:
+                unindexed[blueprint_id] = device
+
+        manifests = await self._resolve_manifests(auth, list(unindexed.values()))
+        for blueprint_id, manifest in manifests.items():
+            summary = self._blueprint_summaries.lookup(blueprint_id)
+            if summary is None:
+                summary = domain.BlueprintSummary.from_device_manifest(manifest)
+                self._blueprint_summaries.put(blueprint_id, summary)
+            summaries[blueprint_id] = summary
+
+        return summaries
+
+    async def _attach_manifests(
+        self, auth: AuthConfig, devices: list[domain.Device]
+    ) -> list[domain.Device]:
+        manifests = await self._resolve_manifests(auth, devices)
+        return [
+            dataclasses.replace(device, manifest=manifests[device.blueprint_id])
+            for device in devices
+        ]
+
+    async def _resolve_manifests(
+        self, auth: AuthConfig, devices: list[domain.Device]
+    ) -> dict[str, domain.DeviceManifest]:
+        manifests: dict[str, domain.DeviceManifest] = {}
+        missing: dict[str, str] = {}
+        for device in devices:
+            blueprint_id = device.blueprint_id
+            if blueprint_id in manifests or blueprint_id in missing:
+                continue
+            if device.manifest is not None:
+                self._remember_manifest(blueprint_id, device.manifest)
+                manifests[blueprint_id] = device.manifest
+                continue
+            manifest = self._manifest_cache.lookup(blueprint_id)
+            if manifest is not None:
+                manifests[blueprint_id] = manifest
+            else:
+                missing[blueprint_id] = device.id
+
+        # One device per missing blueprint is enough to learn its manifest.
+        async with asyncio.TaskGroup() as tg:
+            tasks = {
+                blueprint_id: tg.create_task(
+                    self._manifest_cache.fill(
+                        blueprint_id,
+                        functools.partial(self._fetch_manifest, auth, device_id),
+                    )
+                )
+                for blueprint_id, device_id in missing.items()
+            }
+        manifests.update({bp: task.result() for bp, task in tasks.items()})
 
-        return views
+        return manifests
 
+    def _remember_manifest(
+        self, blueprint_id: str, manifest: domain.DeviceManifest
+    ) -> None:
+        self._manifest_cache.put(blueprint_id, manifest)
+        self._blueprint_summaries.put(
+            blueprint_id, domain.BlueprintSummary.from_device_manifest(manifest)
+        )
+
+    async def _get_device_manifest(
+        self, auth: AuthConfig, device_id: str
+    ) -> domain.DeviceManifest:
+        device = await self._enapter_api.get_device(auth, device_id)
+        (device,) = await self._attach_manifests(auth, [device])
+        assert device.manifest is not None
+        return device.manifest
+
+    async def _fetch_manifest(
+        self, auth: AuthConfig, device_id: str
+    ) -> domain.DeviceManifest:
+        device = await self._enapter_api.get_device(
+            auth, device_id, expand_manifest=True
+        )
+        assert device.manifest is not None
+        # Refresh the summary as well, the blueprint may have changed.
+        self._blueprint_summaries.put(
+            device.blueprint_id,
+            domain.BlueprintSummary.from_device_manifest(device.manifest),
+        )
+        return device.manifest
+
+    @tracing.traced("ApplicationServer.read_blueprint")
     async def read_blueprint(
         self,
         auth: AuthConfig,
@@ -301,10 +686,7 @@ class ApplicationServer:
         | domain.CommandDeclaration
     ]:
         name_pattern = re.compile(name_regexp)
-        device = await self._enapter_api.get_device(
-            auth, device_id, expand_manifest=True
-        )
-        assert device.manifest is not None
+        manifest = await self._get_device_manifest(auth, device_id)
 
         entities: list[
             str
@@ -316,15 +698,15 @@ class ApplicationServer:
 
         match section:
             case domain.BlueprintSection.IMPLEMENTS:
-                entities = list(device.manifest.implements)
+                entities = list(manifest.implements)
             case domain.BlueprintSection.PROPERTIES:
-                entities = list(device.manifest.properties.values())
+                entities = list(manifest.properties.values())
             case domain.BlueprintSection.TELEMETRY:
-                entities = list(device.manifest.telemetry.values())
+                entities = list(manifest.telemetry.values())
             case domain.BlueprintSection.ALERTS:
-                entities = list(device.manifest.alerts.values())
+                entities = list(manifest.alerts.values())
             case domain.BlueprintSection.COMMANDS:
-                entities = list(device.manifest.commands.values())
+                entities = list(manifest.commands.values())
             case _:
                 raise NotImplementedError(section)
 
@@ -333,6 +715,7 @@ class ApplicationServer:
         entities.sort(key=key)
         return entities[offset : offset + limit]
 
+    @tracing.traced("ApplicationServer.execute_command")
     async def execute_command(
         self,
         auth: AuthConfig,
@@ -365,12 +748,10 @@ class ApplicationServer:
     async def _resolve_manifest_commands(
         self, auth: AuthConfig, device_id: str
     ) -> dict[str, domain.CommandDeclaration]:
-        device = await self._enapter_api.get_device(
-            auth, device_id, expand_manifest=True
-        )
-        assert device.manifest is not None
-        return device.manifest.commands
+        manifest = await self._get_device_manifest(auth, device_id)
+        return manifest.commands
 
+    @tracing.traced("ApplicationServer.get_historical_telemetry")
     async def get_historical_telemetry(
         self,
         auth: AuthConfig,
@@ -391,6 +772,7 @@ class ApplicationServer:
             aggregation,
         )
 
+    @tracing.traced("ApplicationServer.search_command_executions")
     async def search_command_executions(
         self,
         auth: AuthConfig,
@@ -398,85 +780,87 @@ class ApplicationServer:
         offset: int,
         limit: int,
         view: domain.CommandExecutionView,
-    ) -> list[domain.CommandExecution]:
+        cursor: str | None = None,
+    ) -> Page[domain.CommandExecution]:
         match view:
             case domain.CommandExecutionView.BASIC:
-                return await self._search_command_executions_basic(
-                    auth, query, offset, limit
+                if query.site_id is None and query.device_id is None:
+                    raise SearchQueryTooBroad(
+                        "Please provide `site_id` or `device_id` to narrow down the search."
+                    )
+                page = await self._search_command_executions(
+                    auth, query, offset, limit, view, cursor
                 )
+                items = [execution.strip() for execution in page.items]
+                return dataclasses.replace(page, items=items)
             case domain.CommandExecutionView.FULL:
-                return await self._search_command_executions_full(
-                    auth, query, offset, limit
+                if query.device_id is None:
+                    raise SearchQueryTooBroad(
+                        "Please provide `device_id` to narrow down the search."
+                    )
+                return await self._search_command_executions(
+                    auth, query, offset, limit, view, cursor
                 )
             case _:
                 raise NotImplementedError(view)
 
-    async def _search_command_executions_basic(
+    async def _search_command_executions(
         self,
         auth: AuthConfig,
         query: CommandExecutionSearchQuery,
         offset: int,
         limit: int,
-    ) -> list[domain.CommandExecution]:
-        if query.site_id is None and query.device_id is None:
-            raise SearchQueryTooBroad(
-                "Please provide `site_id` or `device_id` to narrow down the search."
-            )
+        view: domain.CommandExecutionView,
+        cursor: str | None,
+    ) -> Page[domain.CommandExecution]:
+        search = ("command_executions", view, query)
+        created_at_lt = query.created_at_lt
+        after: KeysetCursor | None = None
+        if cursor is not None:
+            # The listing is ordered by `created_at` desc, so the next page
+            # starts below the last returned item instead of at an offset.
+            after = KeysetCursor.decode(cursor, search)
+            offset = 0
+            if created_at_lt is None or after.created_at_lt < created_at_lt:
+                created_at_lt = after.created_at_lt
 
         executions: list[domain.CommandExecution] = []
         skipped = 0
-
-        async with self._enapter_api.list_command_executions(
-            auth,
-            device_id=query.device_id,
-            site_id=query.site_id,
-            created_at_gte=query.created_at_gte,
-            created_at_lt=query.created_at_lt,
-            state=query.state,
-        ) as executions_gen:
-            async for execution in executions_gen:
-                if query.matches(execution):
-                    if skipped < offset:
-                        skipped += 1
-                        continue
-
-                    executions.append(execution.strip())
-                    if len(executions) >= limit:
-                        break
-
-        return executions
-
-    async def _search_command_executions_full(
-        self,
-        auth: AuthConfig,
-        query: CommandExecutionSearchQuery,
-        offset: int,
-        limit: int,
-    ) -> list[domain.CommandExecution]:
-        if query.device_id is None:
-            raise SearchQueryTooBroad(
-                "Please provide `device_id` to narrow down the search."
+        resumed = after is None
+
+        async with until_deadline() as cutoff:
+            async with self._enapter_api.list_command_executions(
+                auth,
+                device_id=query.device_id,
+                site_id=query.site_id,
+                created_at_gte=query.created_at_gte,
+                created_at_lt=created_at_lt,
+                state=query.state,
+            ) as executions_gen:
+                async for execution in executions_gen:
+                    if not resumed:
+                        assert after is not None
+                        if execution.created_at == after.created_at:
+                            resumed = execution.id == after.id
+                            continue
+                        resumed = True
+
+                    if query.matches(execution):
+                        if skipped < offset:
+                            skipped += 1
+                            continue
+
+                        executions.append(execution)
+                        if len(executions) >= limit:
+                            break
+
+        # The listing is ordered, so a page cut short by the deadline is
+        # continued from its last item like a full one.
+        next_cursor: str | None = None
+        if executions and (len(executions) >= limit or cutoff.reached):
+            last = executions[-1]
+            next_cursor = KeysetCursor(created_at=last.created_at, id=last.id).encode(
+                search
             )
 
-        executions: list[domain.CommandExecution] = []
-        skipped = 0
-
-        async with self._enapter_api.list_command_executions(
-            auth,
-            device_id=query.device_id,
-            site_id=query.site_id,
-            created_at_gte=query.created_at_gte,
-            created_at_lt=query.created_at_lt,
-            state=query.state,
-        ) as executions_gen:
-            async for execution in executions_gen:
-                if query.matches(execution):
-                    if skipped < offset:
-                        skipped += 1
-                        continue
-
-                    executions.append(execution)
-                    if len(executions) >= limit:
-                        break
-
-        return executions
+        return Page(items=executions, next_cursor=next_cursor, truncated=cutoff.reached)
@@ -1,7 +1,16 @@
 import dataclasses
+import hashlib
 
 
 @dataclasses.dataclass(frozen=True, kw_only=True)
 class AuthConfig:
     token: str | None = None
     user: str | None = None
+
+    @property
+    def identity(self) -> str:
+        """The user calls are made on behalf of, or a label hiding the token."""
+        if self.user is not None:
+            return self.user
+        digest = hashlib.sha256((self.token or "").encode()).hexdigest()
+        return f"token:{digest[:12]}"
@@ -0,0 +1,393 @@
+import asyncio
+import contextlib
+import contextvars
+import dataclasses
+import datetime
+import functools
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncGenerator,
+    Callable,
+    Coroutine,
+    Hashable,
+    Iterator,
+)
+
+import enapter
+
+from enapter_mcp_server import domain
+
+from .auth_config import AuthConfig
+from .enapter_api import EnapterAPI
+
+_memo: contextvars.ContextVar[dict[Hashable, Any] | None] = contextvars.ContextVar(
+    "_memo", default=None
+)
+
+
+@contextlib.contextmanager
+def memoize_reads() -> Iterator[None]:
+    """Remember the results of coalesced reads made in this context.
+
+    Until the context exits, a read identical to one that already succeeded
+    in it returns the same result without calling upstream again. Tasks
+    started from the context share the results. Failed reads are not
+    remembered.
+    """
+    token = _memo.set({})
+    try:
+        yield
+    finally:
+        _memo.reset(token)
+
+
+@dataclasses.dataclass
+class _Listing:
+    items: list[Any] = dataclasses.field(default_factory=list)
+    done: bool = False
+    error: Exception | None = None
+    changed: asyncio.Event = dataclasses.field(default_factory=asyncio.Event)
+
+    def notify(self) -> None:
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+
+@dataclasses.dataclass
+class _Flight:
+    task: asyncio.Task[Any]
+    waiters: int = 0
+    listing: _Listing | None = None
+
+
+class CoalescingEnapterAPI:
+    """Enapter API that merges identical in-flight reads into one call.
+
+    Reads are identical when they call the same method with the same
+    arguments on behalf of the same auth identity. The first caller starts
+    the upstream call and every caller arriving before it completes awaits
+    the same result, including its exception. Nothing is remembered once the
+    call completes, unless the read is made under `memoize_reads`.
+
+    A cancelled caller leaves the shared call running for the others. The
+    call is cancelled only when all of its callers are gone.
+
+    Listings are handed to every caller item by item as they are read, so
+    that a caller cut short by its deadline keeps the items read so far.
+    Callers arriving later are first replayed the items read before.
+    Command executions are not coalesced, since their history is unbounded
+    and callers stop reading it early. Writes are never coalesced.
+    """
+
+    def __init__(self, enapter_api: EnapterAPI) -> None:
+        self._enapter_api = enapter_api
+        self._flights: dict[Hashable, _Flight] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    @enapter.async_.generator
+    async def list_sites(self, auth: AuthConfig) -> AsyncGenerator[domain.Site, None]:
+        async with self._stream(
+            ("list_sites", auth), lambda: self._enapter_api.list_sites(auth)
+        ) as sites:
+            async for site in sites:
+                yield site
+
+    async def get_rule_engine(
+        self, auth: AuthConfig, site_id: str
+    ) -> domain.RuleEngine:
+        return await self._coalesce(
+            ("get_rule_engine", auth, site_id),
+            lambda: self._enapter_api.get_rule_engine(auth, site_id),
+        )
+
+    @enapter.async_.generator
+    async def list_rules(
+        self, auth: AuthConfig, site_id: str
+    ) -> AsyncGenerator[domain.Rule, None]:
+        async with self._stream(
+            ("list_rules", auth, site_id),
+            lambda: self._enapter_api.list_rules(auth, site_id),
+        ) as rules:
+            async for rule in rules:
+                yield rule
+
+    async def get_rule(
+        self, auth: AuthConfig, site_id: str, rule_id: str
+    ) -> domain.Rule:
+        return await self._coalesce(
+            ("get_rule", auth, site_id, rule_id),
+            lambda: self._enapter_api.get_rule(auth, site_id, rule_id),
+        )
+
+    @enapter.async_.generator
+    async def list_devices(
+        self,
+        auth: AuthConfig,
+        site_id: str | None = None,
+        expand_manifest: bool = False,
+        expand_properties: bool = False,
+        expand_connectivity: bool = False,
+        expand_active_alerts: bool = False,
+    ) -> AsyncGenerator[domain.Device, None]:
+        async with self._stream(
+            (
+                "list_devices",
+                auth,
+                site_id,
+                expand_manifest,
+                expand_properties,
+                expand_connectivity,
+                expand_active_alerts,
+            ),
+            lambda: self._enapter_api.list_devices(
+                auth,
+                site_id=site_id,
+                expand_manifest=expand_manifest,
+                expand_properties=expand_properties,
+                expand_connectivity=expand_connectivity,
+                expand_active_alerts=expand_active_alerts,
+            ),
+        ) as devices:
+            async for device in devices:
+                yield device
+
+    async def get_device(
+        self,
+        auth: AuthConfig,
+        device_id: str,
+        expand_manifest: bool = False,
+        expand_connectivity: bool = False,
+        expand_properties: bool = False,
+        expand_active_alerts: bool = False,
+    ) -> domain.Device:
+        return await self._coalesce(
+            (
+                "get_device",
+                auth,
+                device_id,
+                expand_manifest,
+                expand_connectivity,
+                expand_properties,
+                expand_active_alerts,
+            ),
+            lambda: self._enapter_api.get_device(
+                auth,
+                device_id,
+                expand_manifest=expand_manifest,
+                expand_connectivity=expand_connectivity,
+                expand_properties=expand_properties,
+                expand_active_alerts=expand_active_alerts,
+            ),
+        )
+
+    async def execute_command(
+        self,
+        auth: AuthConfig,
+        device_id: str,
+        command_name: str,
+        arguments: dict[str, Any] | None,
+    ) -> domain.CommandExecution:
+        return await self._enapter_api.execute_command(
+            auth, device_id, command_name, arguments
+        )
+
+    @enapter.async_.generator
+    async def list_command_executions(
+        self,
+        auth: AuthConfig,
+        device_id: str | None = None,
+        site_id: str | None = None,
+        created_at_gte: datetime.datetime | None = None,
+        created_at_lt: datetime.datetime | None = None,
+        state: domain.CommandExecutionState | None = None,
+    ) -> AsyncGenerator[domain.CommandExecution, None]:
+        async with self._enapter_api.list_command_executions(
+            auth,
+            device_id=device_id,
+            site_id=site_id,
+            created_at_gte=created_at_gte,
+            created_at_lt=created_at_lt,
+            state=state,
+        ) as executions:
+            async for execution in executions:
+                yield execution
+
+    async def get_latest_telemetry(
+        self, auth: AuthConfig, attributes_by_device: dict[str, list[str]]
+    ) -> dict[str, dict[str, Any]]:
+        return await self._coalesce(
+            (
+                "get_latest_telemetry",
+                auth,
+                tuple(
+                    (device_id, tuple(attributes))
+                    for device_id, attributes in sorted(attributes_by_device.items())
+                ),
+            ),
+            lambda: self._enapter_api.get_latest_telemetry(auth, attributes_by_device),
+        )
+
+    async def get_historical_telemetry(
+        self,
+        auth: AuthConfig,
+        device_id: str,
+        attributes: list[str],
+        time_from: datetime.datetime,
+        time_to: datetime.datetime,
+        granularity: int,
+        aggregation: domain.AggregationFunction,
+    ) -> domain.HistoricalTelemetry:
+        return await self._coalesce(
+            (
+                "get_historical_telemetry",
+                auth,
+                device_id,
+                tuple(attributes),
+                time_from,
+                time_to,
+                granularity,
+                aggregation,
+            ),
+            lambda: self._enapter_api.get_historical_telemetry(
+                auth,
+                device_id,
+                attributes,
+                time_from,
+                time_to,
+                granularity,
+                aggregation,
+            ),
+        )
+
+    async def create_rule(
+        self,
+        auth: AuthConfig,
+        site_id: str,
+        slug: str,
+        script: domain.RuleScript,
+        disabled: bool,
+    ) -> domain.Rule:
+        return await self._enapter_api.create_rule(
+            auth, site_id, slug, script, disabled
+        )
+
+    async def update_rule_script(
+        self,
+        auth: AuthConfig,
+        rule_id: str,
+        site_id: str,
+        script: domain.RuleScript,
+    ) -> domain.Rule:
+        return await self._enapter_api.update_rule_script(
+            auth, rule_id, site_id, script
+        )
+
+    async def delete_rule(self, auth: AuthConfig, rule_id: str, site_id: str) -> None:
+        await self._enapter_api.delete_rule(auth, rule_id, site_id)
+
+    async def _coalesce[T](
+        self, key: Hashable, call: Callable[[], Coroutine[Any, Any, T]]
+    ) -> T:
+        memo = _memo.get()
+        if memo is not None and key in memo:
+            return memo[key]
+
+        flight = self._flights.get(key)
+        if flight is None:
+            task = asyncio.create_task(call())
+            flight = _Flight(task=task)
+            task.add_done_callback(functools.partial(self._on_flight_done, key))
+            self._flights[key] = flight
+
+        flight.waiters += 1
+        try:
+            # Shielded so that a cancelled caller does not cancel the call
+            # shared with other callers.
+            result = await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Forgotten at once, so that a caller arriving before the
+                # cancellation completes starts a new call instead of joining
+                # the cancelled one.
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+        if memo is not None:
+            memo[key] = result
+        return result
+
+    @enapter.async_.generator
+    async def _stream[T](
+        self,
+        key: Hashable,
+        list_items: Callable[[], AsyncContextManager[AsyncGenerator[T, None]]],
+    ) -> AsyncGenerator[T, None]:
+        memo = _memo.get()
+        if memo is not None and key in memo:
+            for item in memo[key]:
+                yield item
+            return
+
+        flight = self._flights.get(key)
+        if flight is None:
+            listing = _Listing()
+            task = asyncio.create_task(self._read_listing(listing, list_items()))
+            flight = _Flight(task=task, listing=listing)
+            task.add_done_callback(functools.partial(self._on_flight_done, key))
+            self._flights[key] = flight
+        assert flight.listing is not None
+        listing = flight.listing
+
+        flight.waiters += 1
+        try:
+            read = 0
+            while True:
+                while read < len(listing.items):
+                    yield listing.items[read]
+                    read += 1
+                if listing.done:
+                    break
+                await listing.changed.wait()
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Forgotten at once, so that a caller arriving before the
+                # cancellation completes starts a new listing instead of
+                # joining the cancelled one.
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+
+        if listing.error is not None:
+            raise listing.error
+        if memo is not None:
+            memo[key] = listing.items
+
+    @staticmethod
+    async def _read_listing[T](
+        listing: _Listing, items: AsyncContextManager[AsyncGenerator[T, None]]
+    ) -> None:
+        try:
+            async with items as items_gen:
+                async for item in items_gen:
+                    listing.items.append(item)
+                    listing.notify()
+        except Exception as e:
+            # Handed to every caller once they have read the items before it.
+            listing.error = e
+        finally:
+            listing.done = True
+            listing.notify()
+
+    def _on_flight_done(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        flight = self._flights.get(key)
+        if flight is not None and flight.task is task:
+            del self._flights[key]
+        if not task.cancelled():
+            # Retrieve the exception of calls all callers have given up on.
+            task.exception()
@@ -0,0 +1,42 @@
+import base64
+import binascii
+import hashlib
+import json
+from typing import Any
+
+from .errors import InvalidCursor
+
+
+def fingerprint(search: object) -> str:
+    """Returns a short digest identifying the parameters of a search."""
+    return hashlib.sha256(repr(search).encode()).hexdigest()[:16]
+
+
+def encode(search: object, fields: list[Any]) -> str:
+    """Encodes the JSON fields of a cursor returned for the given search."""
+    payload = json.dumps([fingerprint(search), *fields])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode(cursor: str, search: object) -> list[Any]:
+    """Decodes the fields of a cursor presented for the given search.
+
+    Raises `InvalidCursor` when the cursor cannot be decoded or was returned
+    for a search with different parameters.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise malformed()
+    if not isinstance(payload, list) or not payload:
+        raise malformed()
+    if payload[0] != fingerprint(search):
+        raise InvalidCursor(
+            "The cursor belongs to a different search, "
+            "repeat the search parameters it was returned for."
+        )
+    return payload[1:]
+
+
+def malformed() -> InvalidCursor:
+    return InvalidCursor("The cursor is malformed.")
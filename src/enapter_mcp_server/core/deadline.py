@@ -0,0 +1,70 @@
+import asyncio
+import contextlib
+import contextvars
+import dataclasses
+from typing import AsyncIterator, Iterator
+
+_expires_at: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    "deadline", default=None
+)
+
+
+@dataclasses.dataclass
+class Cutoff:
+    reached: bool = False
+
+
+@contextlib.contextmanager
+def deadline(timeout: float) -> Iterator[None]:
+    """Limit work that supports partial results to `timeout` seconds.
+
+    The deadline applies to everything run in this context, including tasks
+    started from it, and never extends an enclosing deadline.
+    """
+    expires_at = asyncio.get_running_loop().time() + timeout
+    enclosing = _expires_at.get()
+    if enclosing is not None:
+        expires_at = min(expires_at, enclosing)
+    token = _expires_at.set(expires_at)
+    try:
+        yield
+    finally:
+        _expires_at.reset(token)
+
+
+@contextlib.contextmanager
+def deadline_share(share: float) -> Iterator[None]:
+    """Limit work in this context to `share` of the time left to the deadline.
+
+    This leaves the rest of the time to work done after the context exits.
+    Without a deadline nothing is limited.
+    """
+    expires_at = _expires_at.get()
+    if expires_at is None:
+        yield
+        return
+    now = asyncio.get_running_loop().time()
+    token = _expires_at.set(now + max(0.0, expires_at - now) * share)
+    try:
+        yield
+    finally:
+        _expires_at.reset(token)
+
+
+@contextlib.asynccontextmanager
+async def until_deadline() -> AsyncIterator[Cutoff]:
+    """Cancel the block when the deadline passes instead of failing.
+
+    The yielded cutoff tells whether the block was cut short, in which case
+    whatever it gathered so far is incomplete. Without a deadline the block
+    runs to completion.
+    """
+    cutoff = Cutoff()
+    timeout = asyncio.timeout_at(_expires_at.get())
+    try:
+        async with timeout:
+            yield cutoff
+    except TimeoutError:
+        if not timeout.expired():
+            raise
+        cutoff.reached = True
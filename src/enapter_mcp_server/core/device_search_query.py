@@ -1,9 +1,18 @@
 import dataclasses
+import enum
 import re
 
 from enapter_mcp_server import domain
 
 
+class DeviceAccessPath(enum.Enum):
+    """Upstream access path of a device search, from cheapest to costliest."""
+
+    GET_DEVICE = "get_device"
+    LIST_SITE_DEVICES = "list_site_devices"
+    LIST_ALL_DEVICES = "list_all_devices"
+
+
 @dataclasses.dataclass(kw_only=True)
 class DeviceSearchQuery:
     device_id: str | None = None
@@ -18,6 +27,14 @@ class DeviceSearchQuery:
             re.compile(self.name_regexp) if self.name_regexp is not None else None
         )
 
+    @property
+    def access_path(self) -> DeviceAccessPath:
+        if self.device_id is not None:
+            return DeviceAccessPath.GET_DEVICE
+        if self.site_id is not None:
+            return DeviceAccessPath.LIST_SITE_DEVICES
+        return DeviceAccessPath.LIST_ALL_DEVICES
+
     def matches(self, device: domain.Device) -> bool:
         if self.device_id is not None and device.id != self.device_id:
             return False
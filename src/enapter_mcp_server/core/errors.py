@@ -18,6 +18,31 @@ class CommandNotFound(Exception):
     pass
 
 
+class InvalidCursor(Exception):
+    pass
+
+
+class UpstreamUnavailable(Exception):
+    pass
+
+
+class RateLimitExceeded(Exception):
+    pass
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class ServerOverloaded(Exception):
+    def __init__(self, reason: str, retry_after: float) -> None:
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(
+            f"The server is handling too many tool calls, retry in {retry_after:g}s."
+        )
+
+
 class RuleNotFound(Exception):
     def __init__(self, rule_id: str, site_id: str) -> None:
         self.rule_id = rule_id
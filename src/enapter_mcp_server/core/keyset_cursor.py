@@ -0,0 +1,37 @@
+import dataclasses
+import datetime
+from typing import Self
+
+from . import cursor_codec
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class KeysetCursor:
+    """Position after the last item of a page ordered by `created_at` desc.
+
+    The next page starts right after the item with the given `created_at`
+    and `id`, which turns resumption into an upper time bound instead of
+    skipping already returned items.
+    """
+
+    created_at: datetime.datetime
+    id: str
+
+    @property
+    def created_at_lt(self) -> datetime.datetime:
+        # Items sharing the timestamp of the last item may still follow it.
+        return self.created_at + datetime.timedelta(microseconds=1)
+
+    def encode(self, search: object) -> str:
+        return cursor_codec.encode(search, [self.created_at.isoformat(), self.id])
+
+    @classmethod
+    def decode(cls, cursor: str, search: object) -> Self:
+        try:
+            created_at, id = cursor_codec.decode(cursor, search)
+            decoded = cls(created_at=datetime.datetime.fromisoformat(created_at), id=id)
+        except (ValueError, TypeError):
+            raise cursor_codec.malformed()
+        if not isinstance(decoded.id, str):
+            raise cursor_codec.malformed()
+        return decoded
@@ -0,0 +1,8 @@
+import dataclasses
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class Page[T]:
+    items: list[T]
+    next_cursor: str | None = None
+    truncated: bool = False
@@ -0,0 +1,100 @@
+import dataclasses
+import secrets
+import time
+from typing import Any, Awaitable, Callable, Self
+
+from . import cursor_codec
+from .auth_config import AuthConfig
+from .page import Page
+from .ttl_cache import TTLCache
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class _Cursor:
+    snapshot_id: str
+    offset: int
+
+    def encode(self, search: object) -> str:
+        return cursor_codec.encode(search, [self.snapshot_id, self.offset])
+
+    @classmethod
+    def decode(cls, cursor: str, search: object) -> Self:
+        try:
+            snapshot_id, offset = cursor_codec.decode(cursor, search)
+        except ValueError:
+            raise cursor_codec.malformed()
+        if not (
+            isinstance(snapshot_id, str) and isinstance(offset, int) and offset >= 0
+        ):
+            raise cursor_codec.malformed()
+        return cls(snapshot_id=snapshot_id, offset=offset)
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class Scan[T]:
+    items: list[T]
+    truncated: bool = False
+
+
+class SearchSnapshots:
+    """Short-lived per-user snapshots of sorted search results.
+
+    A page that is followed by more results stores the whole sorted result
+    and returns a cursor pointing into it, so later pages are sliced from
+    memory instead of re-scanning upstream. Snapshots are keyed by user, so a
+    cursor presented by another user never reads someone else's snapshot. A
+    cursor whose snapshot has expired or was evicted is served by re-running
+    the search.
+
+    A truncated scan is incomplete, so its page is returned without a cursor
+    and nothing is stored.
+
+    The snapshots together hold at most `max_items` results, the least
+    recently used ones are evicted to make room for new ones.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        max_items: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._snapshots: TTLCache[tuple[AuthConfig, str], list[Any]] = TTLCache(
+            ttl=ttl, max_size=max_items, clock=clock, weigh=len
+        )
+
+    async def page[T](
+        self,
+        auth: AuthConfig,
+        search: object,
+        scan: Callable[[], Awaitable[Scan[T]]],
+        offset: int,
+        limit: int,
+        cursor: str | None = None,
+    ) -> Page[T]:
+        items: list[T] | None = None
+        if cursor is None:
+            snapshot_id = secrets.token_urlsafe(12)
+        else:
+            decoded = _Cursor.decode(cursor, search)
+            snapshot_id = decoded.snapshot_id
+            offset = decoded.offset
+            items = self._snapshots.lookup((auth, snapshot_id))
+
+        end = offset + limit
+        truncated = False
+        if items is None:
+            result = await scan()
+            items, truncated = result.items, result.truncated
+            # A result that ends on this page is never paged through.
+            if end < len(items) and not truncated:
+                self._snapshots.put((auth, snapshot_id), items)
+
+        next_cursor = (
+            _Cursor(snapshot_id=snapshot_id, offset=end).encode(search)
+            if end < len(items) and not truncated
+            else None
+        )
+        return Page(
+            items=items[offset:end], next_cursor=next_cursor, truncated=truncated
+        )
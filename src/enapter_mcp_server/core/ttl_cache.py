@@ -0,0 +1,159 @@
+import asyncio
+import collections
+import dataclasses
+import functools
+import time
+from typing import Awaitable, Callable, Hashable
+
+
+@dataclasses.dataclass
+class CacheStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+@dataclasses.dataclass(frozen=True)
+class _Entry[V]:
+    value: V
+    stored_at: float
+    weight: int
+
+
+@dataclasses.dataclass
+class _Flight[V]:
+    task: asyncio.Task[V]
+    waiters: int = 0
+    background: bool = False
+
+
+class TTLCache[K: Hashable, V]:
+    """In-memory LRU cache with TTL, single-flight and stale-while-revalidate.
+
+    An entry younger than `ttl` is served as is. An entry older than `ttl` but
+    younger than `ttl + stale_ttl` is served while a background refresh runs.
+    Older entries are treated as missing. Concurrent loads of the same key
+    share one call of the loader.
+
+    A load is cancelled once all of its callers are gone, so that abandoned
+    calls stop hitting upstream. Background refreshes run to completion.
+
+    Entries weigh one each unless `weigh` is given, in which case `max_size`
+    bounds the total weight of the entries instead of their number.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        stale_ttl: float = 0.0,
+        max_size: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+        weigh: Callable[[V], int] | None = None,
+    ) -> None:
+        self._ttl = ttl
+        self._stale_ttl = stale_ttl
+        self._max_size = max_size
+        self._clock = clock
+        self._weigh = weigh
+        self._entries: collections.OrderedDict[K, _Entry[V]] = collections.OrderedDict()
+        self._weight = 0
+        self._inflight: dict[K, _Flight[V]] = {}
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: K, load: Callable[[], Awaitable[V]]) -> V:
+        value = self.lookup(key, load)
+        if value is not None:
+            return value
+        return await self.fill(key, load)
+
+    def lookup(
+        self, key: K, reload: Callable[[], Awaitable[V]] | None = None
+    ) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        age = self._clock() - entry.stored_at
+        if age < self._ttl:
+            self.stats.hits += 1
+        elif age < self._ttl + self._stale_ttl:
+            self.stats.stale_hits += 1
+            if reload is not None:
+                self._flight(key, reload).background = True
+        else:
+            self._remove(key)
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        return entry.value
+
+    async def fill(self, key: K, load: Callable[[], Awaitable[V]]) -> V:
+        flight = self._flight(key, load)
+        flight.waiters += 1
+        try:
+            # Shielded so that a cancelled caller does not cancel the load
+            # shared with other callers.
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not (flight.waiters or flight.background or flight.task.done()):
+                # Forgotten at once, so that a caller arriving before the
+                # cancellation completes starts a new load instead of joining
+                # the cancelled one.
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+                flight.task.cancel()
+
+    def put(self, key: K, value: V) -> None:
+        self._remove(key)
+        weight = self._weigh(value) if self._weigh is not None else 1
+        if weight > self._max_size:
+            # Storing it would evict every other entry and then itself.
+            self.stats.evictions += 1
+            return
+        self._entries[key] = _Entry(value=value, stored_at=self._clock(), weight=weight)
+        self._weight += weight
+        while self._weight > self._max_size:
+            self._remove(next(iter(self._entries)))
+            self.stats.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        self._remove(key)
+        self._inflight.pop(key, None)
+
+    def _remove(self, key: K) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._weight -= entry.weight
+
+    def _flight(self, key: K, load: Callable[[], Awaitable[V]]) -> _Flight[V]:
+        flight = self._inflight.get(key)
+        if flight is None:
+            task = asyncio.create_task(self._fill(key, load))
+            task.add_done_callback(functools.partial(self._on_fill_done, key))
+            flight = _Flight(task=task)
+            self._inflight[key] = flight
+        return flight
+
+    async def _fill(self, key: K, load: Callable[[], Awaitable[V]]) -> V:
+        value = await load()
+        # The key may have been invalidated while loading, in which case the
+        # value is handed to the waiters but not stored.
+        flight = self._inflight.get(key)
+        if flight is not None and flight.task is asyncio.current_task():
+            self.put(key, value)
+        return value
+
+    def _on_fill_done(self, key: K, task: asyncio.Task[V]) -> None:
+        flight = self._inflight.get(key)
+        if flight is not None and flight.task is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Retrieve the exception of background refreshes nobody awaits.
+            task.exception()
@@ -16,8 +16,11 @@ class DeviceViewType(enum.Enum):
 class DeviceView:
     """Base view of a device — common fields shared by all views."""
 
-    def __init__(self, device: Device) -> None:
+    def __init__(
+        self, device: Device, blueprint_summary: BlueprintSummary | None = None
+    ) -> None:
         self._device = device
+        self._blueprint_summary = blueprint_summary
 
     @property
     def id(self) -> str:
@@ -56,7 +59,7 @@ class DeviceView:
 
     @property
     def blueprint_summary(self) -> BlueprintSummary:
-        summary = self._device.blueprint_summary
+        summary = self._blueprint_summary or self._device.blueprint_summary
         assert summary is not None
         return summary
 
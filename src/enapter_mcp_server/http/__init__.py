@@ -1,4 +1,24 @@
+from .adaptive_concurrency_limiter import AdaptiveConcurrencyLimiter
+from .circuit_breaker import CircuitBreaker
+from .client_pool import ClientPool
 from .enapter_api import EnapterAPI
 from .enapter_data_mapper import EnapterDataMapper
+from .hedger import Hedger
+from .retry_policy import RetryPolicy
+from .transport import Transport
+from .transport_config import TransportConfig
+from .user_rate_limiter import UserRateLimiter, UserRateStats
 
-__all__ = ["EnapterAPI", "EnapterDataMapper"]
+__all__ = [
+    "AdaptiveConcurrencyLimiter",
+    "CircuitBreaker",
+    "ClientPool",
+    "EnapterAPI",
+    "EnapterDataMapper",
+    "Hedger",
+    "RetryPolicy",
+    "Transport",
+    "TransportConfig",
+    "UserRateLimiter",
+    "UserRateStats",
+]
@@ -0,0 +1,113 @@
+import asyncio
+import collections
+import dataclasses
+import time
+from typing import Callable
+
+
+@dataclasses.dataclass
+class _Latency:
+    baseline: float
+    recent: float
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on the number of concurrent upstream requests.
+
+    The limit grows by one per limit's worth of successful requests while the
+    limit is saturated and latency stays flat. It is multiplied by
+    `backoff_ratio` when a request is rejected as overloaded (429, 5xx,
+    transport errors) or when the smoothed latency of an endpoint exceeds its
+    long-term baseline by `latency_tolerance` times. Endpoints keep separate
+    baselines, so a mix of slow and fast endpoints does not read as rising
+    latency. Requests that started before the
+    last decrease do not decrease the limit again, so one congestion event
+    backs off once.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        backoff_ratio: float = 0.5,
+        latency_tolerance: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._limit = float(initial_limit)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._backoff_ratio = backoff_ratio
+        self._latency_tolerance = latency_tolerance
+        self._clock = clock
+        self._in_flight = 0
+        self._waiters: collections.deque[asyncio.Future[None]] = collections.deque()
+        self._last_decrease_at = float("-inf")
+        self._latencies: dict[str, _Latency] = {}
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> float:
+        """Wait for a free slot and return the time the request started."""
+        if not self._waiters and self._in_flight < self.limit:
+            self._in_flight += 1
+            return self._clock()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over right before the cancellation.
+                self._in_flight -= 1
+                self._wake_waiters()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+        return self._clock()
+
+    def release(self, started_at: float, overloaded: bool, endpoint: str = "") -> None:
+        now = self._clock()
+        saturated = self._in_flight >= self.limit
+        self._in_flight -= 1
+
+        latency_rising = self._observe_latency(endpoint, now - started_at)
+        if overloaded or latency_rising:
+            if started_at >= self._last_decrease_at:
+                self._limit = max(
+                    float(self._min_limit), self._limit * self._backoff_ratio
+                )
+                self._last_decrease_at = now
+        elif saturated:
+            self._limit = min(float(self._max_limit), self._limit + 1 / self._limit)
+
+        self._wake_waiters()
+
+    def _observe_latency(self, endpoint: str, latency: float) -> bool:
+        observed = self._latencies.get(endpoint)
+        if observed is None:
+            self._latencies[endpoint] = _Latency(baseline=latency, recent=latency)
+            return False
+
+        observed.recent += 0.2 * (latency - observed.recent)
+        observed.baseline += 0.01 * (latency - observed.baseline)
+        return observed.recent > observed.baseline * self._latency_tolerance
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self._in_flight += 1
+            waiter.set_result(None)
@@ -0,0 +1,59 @@
+import time
+from typing import Callable
+
+from enapter_mcp_server import core
+
+
+class CircuitBreaker:
+    """Fails requests fast after consecutive upstream failures.
+
+    The circuit opens after `failure_threshold` consecutive failures. While
+    it is open requests fail with `core.UpstreamUnavailable`. After
+    `reset_timeout` seconds a single probe request is let through, and its
+    outcome either closes the circuit or keeps it open.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._name = name
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def check(self) -> None:
+        if self._opened_at is None:
+            return
+        now = self._clock()
+        remaining = self._opened_at + self._reset_timeout - now
+        if remaining > 0:
+            raise core.UpstreamUnavailable(
+                f"Enapter HTTP API endpoint {self._name} is temporarily "
+                f"unavailable, retry in {remaining:.0f}s."
+            )
+        # Let this request through as a probe and hold the others back for
+        # another timeout, which also covers a probe that never completes.
+        self._opened_at = now
+        self._probing = True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._probing or self._failures >= self._failure_threshold:
+            self._opened_at = self._clock()
+            self._probing = False
@@ -0,0 +1,65 @@
+import collections
+import time
+from typing import Callable
+
+import enapter
+
+from enapter_mcp_server import core
+
+
+class ClientPool:
+    """LRU pool of API clients keyed by auth identity.
+
+    All clients share one transport, so pooling saves building the httpx
+    client, its authentication scheme and headers for every upstream call.
+    Clients idle for `idle_timeout` seconds are dropped, and the least
+    recently used client is dropped once the pool exceeds `max_size`.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        transport: enapter.http.api.Transport,
+        max_size: int = 1024,
+        idle_timeout: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._base_url = base_url
+        self._transport = transport
+        self._max_size = max_size
+        self._idle_timeout = idle_timeout
+        self._clock = clock
+        self._clients: collections.OrderedDict[
+            core.AuthConfig, tuple[enapter.http.api.Client, float]
+        ] = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def get(self, auth: core.AuthConfig) -> enapter.http.api.Client:
+        now = self._clock()
+        self._evict_idle(now)
+
+        entry = self._clients.pop(auth, None)
+        client = entry[0] if entry is not None else self._new_client(auth)
+        self._clients[auth] = (client, now)
+        while len(self._clients) > self._max_size:
+            self._clients.popitem(last=False)
+
+        return client
+
+    def _evict_idle(self, now: float) -> None:
+        # Clients are ordered by last use, so idle ones are at the front.
+        while self._clients:
+            _, last_used_at = next(iter(self._clients.values()))
+            if now - last_used_at < self._idle_timeout:
+                break
+            self._clients.popitem(last=False)
+
+    def _new_client(self, auth: core.AuthConfig) -> enapter.http.api.Client:
+        config = enapter.http.api.Config(
+            base_url=self._base_url, token=auth.token, user=auth.user
+        )
+        # Clients never close the shared transport, so dropping one needs no
+        # cleanup.
+        return enapter.http.api.Client(config=config, transport=self._transport)
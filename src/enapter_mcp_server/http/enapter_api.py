@@ -1,59 +1,108 @@
-import contextlib
 import datetime
-from typing import Any, AsyncGenerator, Self
+from typing import Any, AsyncGenerator, Awaitable, Callable, Self
 
 import enapter
+import httpx
 
-from enapter_mcp_server import core, domain
+from enapter_mcp_server import core, domain, tracing
 
+from .adaptive_concurrency_limiter import AdaptiveConcurrencyLimiter
+from .client_pool import ClientPool
 from .enapter_data_mapper import EnapterDataMapper
+from .hedger import Hedger
+from .retry_policy import RetryPolicy
+from .transport import Transport, record_statuses
+from .transport_config import TransportConfig
+from .user_rate_limiter import UserRateLimiter
 
 
 class EnapterAPI:
 
-    def __init__(self, base_url: str) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        limiter: AdaptiveConcurrencyLimiter | None = None,
+        transport_config: TransportConfig | None = None,
+        hedger: Hedger | None = None,
+        user_rate_limiter: UserRateLimiter | None = None,
+    ) -> None:
         self._base_url = base_url
-        self._transport = enapter.http.api.Transport()
+        self._limiter = limiter if limiter is not None else AdaptiveConcurrencyLimiter()
+        self._transport_config = (
+            transport_config if transport_config is not None else TransportConfig()
+        )
+        self._transport = Transport(
+            limiter=self._limiter,
+            timeout=self._transport_config.timeout,
+            retry_policy=RetryPolicy(),
+            limits=self._transport_config.limits,
+            http2=self._transport_config.http2,
+        )
+        self._clients = ClientPool(base_url=base_url, transport=self._transport)
+        self._hedger = hedger
+        self._user_rate_limiter = user_rate_limiter
         self._data_mapper = EnapterDataMapper()
 
     async def __aenter__(self) -> Self:
         await self._transport.__aenter__()
+        if self._transport_config.prewarm_connections > 0:
+            await self._transport.prewarm(
+                self._base_url, self._transport_config.prewarm_connections
+            )
         return self
 
     async def __aexit__(self, *args: Any) -> None:
         await self._transport.__aexit__(*args)
 
+    @property
+    def limiter(self) -> AdaptiveConcurrencyLimiter:
+        return self._limiter
+
+    @property
+    def user_rate_limiter(self) -> UserRateLimiter | None:
+        return self._user_rate_limiter
+
     @enapter.async_.generator
     async def list_sites(
         self, auth: core.AuthConfig
     ) -> AsyncGenerator[domain.Site, None]:
-        async with self._new_client(auth) as client:
-            async with client.sites.list() as s:
-                async for site in s:
-                    yield self._data_mapper.to_site(site)
+        client = await self._admit(auth)
+        async with tracing.listing_span(
+            "EnapterAPI.list_sites", client.sites.list()
+        ) as s:
+            async for site in s:
+                yield self._data_mapper.to_site(site)
 
+    @tracing.traced("EnapterAPI.get_rule_engine")
     async def get_rule_engine(
         self, auth: core.AuthConfig, site_id: str
     ) -> domain.RuleEngine:
-        async with self._new_client(auth) as client:
-            engine = await client.rule_engine.get(site_id)
-            return self._data_mapper.to_rule_engine(engine)
+        client = await self._admit(auth)
+        engine = await self._hedged(
+            "get_rule_engine", lambda: client.rule_engine.get(site_id)
+        )
+        return self._data_mapper.to_rule_engine(engine)
 
     @enapter.async_.generator
     async def list_rules(
         self, auth: core.AuthConfig, site_id: str
     ) -> AsyncGenerator[domain.Rule, None]:
-        async with self._new_client(auth) as client:
-            async with client.rule_engine.list_rules(site_id) as rules:
-                async for rule in rules:
-                    yield self._data_mapper.to_rule(rule)
+        client = await self._admit(auth)
+        async with tracing.listing_span(
+            "EnapterAPI.list_rules", client.rule_engine.list_rules(site_id)
+        ) as rules:
+            async for rule in rules:
+                yield self._data_mapper.to_rule(rule)
 
+    @tracing.traced("EnapterAPI.get_rule")
     async def get_rule(
         self, auth: core.AuthConfig, site_id: str, rule_id: str
     ) -> domain.Rule:
-        async with self._new_client(auth) as client:
-            rule = await client.rule_engine.get_rule(rule_id, site_id)
-            return self._data_mapper.to_rule(rule)
+        client = await self._admit(auth)
+        rule = await self._hedged(
+            "get_rule", lambda: client.rule_engine.get_rule(rule_id, site_id)
+        )
+        return self._data_mapper.to_rule(rule)
 
     @enapter.async_.generator
     async def list_devices(
@@ -65,17 +114,21 @@ class EnapterAPI:
         expand_connectivity: bool = False,
         expand_active_alerts: bool = False,
     ) -> AsyncGenerator[domain.Device, None]:
-        async with self._new_client(auth) as client:
-            async with client.devices.list(
+        client = await self._admit(auth)
+        async with tracing.listing_span(
+            "EnapterAPI.list_devices",
+            client.devices.list(
                 site_id=site_id,
                 expand_manifest=expand_manifest,
                 expand_properties=expand_properties,
                 expand_connectivity=expand_connectivity,
                 expand_raised_alert_names=expand_active_alerts,
-            ) as s:
-                async for device in s:
-                    yield self._data_mapper.to_device(device)
+            ),
+        ) as s:
+            async for device in s:
+                yield self._data_mapper.to_device(device)
 
+    @tracing.traced("EnapterAPI.get_device")
     async def get_device(
         self,
         auth: core.AuthConfig,
@@ -85,16 +138,36 @@ class EnapterAPI:
         expand_properties: bool = False,
         expand_active_alerts: bool = False,
     ) -> domain.Device:
-        async with self._new_client(auth) as client:
-            device = await client.devices.get(
-                device_id,
-                expand_manifest=expand_manifest,
-                expand_connectivity=expand_connectivity,
-                expand_properties=expand_properties,
-                expand_raised_alert_names=expand_active_alerts,
-            )
-            return self._data_mapper.to_device(device)
+        client = await self._admit(auth)
+        with record_statuses() as statuses:
+            try:
+                device = await self._hedged(
+                    self._hedge_key(
+                        "get_device",
+                        manifest=expand_manifest,
+                        connectivity=expand_connectivity,
+                        properties=expand_properties,
+                        active_alerts=expand_active_alerts,
+                    ),
+                    lambda: client.devices.get(
+                        device_id,
+                        expand_manifest=expand_manifest,
+                        expand_connectivity=expand_connectivity,
+                        expand_properties=expand_properties,
+                        expand_raised_alert_names=expand_active_alerts,
+                    ),
+                )
+            except (
+                enapter.http.api.Error,
+                enapter.http.api.MultiError,
+                httpx.HTTPStatusError,
+            ) as exc:
+                if 404 in statuses:
+                    raise core.DeviceNotFound(device_id) from exc
+                raise
+        return self._data_mapper.to_device(device)
 
+    @tracing.traced("EnapterAPI.execute_command")
     async def execute_command(
         self,
         auth: core.AuthConfig,
@@ -102,11 +175,9 @@ class EnapterAPI:
         command_name: str,
         arguments: dict[str, Any] | None,
     ) -> domain.CommandExecution:
-        async with self._new_client(auth) as client:
-            execution = await client.commands.execute(
-                device_id, command_name, arguments
-            )
-            return self._data_mapper.to_command_execution(execution)
+        client = await self._admit(auth)
+        execution = await client.commands.execute(device_id, command_name, arguments)
+        return self._data_mapper.to_command_execution(execution)
 
     @enapter.async_.generator
     async def list_command_executions(
@@ -118,8 +189,10 @@ class EnapterAPI:
         created_at_lt: datetime.datetime | None = None,
         state: domain.CommandExecutionState | None = None,
     ) -> AsyncGenerator[domain.CommandExecution, None]:
-        async with self._new_client(auth) as client:
-            async with client.commands.list_executions(
+        client = await self._admit(auth)
+        async with tracing.listing_span(
+            "EnapterAPI.list_command_executions",
+            client.commands.list_executions(
                 device_id=device_id,
                 site_id=site_id,
                 created_at_gte=created_at_gte,
@@ -130,21 +203,24 @@ class EnapterAPI:
                     else None
                 ),
                 order=enapter.http.api.commands.ListExecutionsOrder.CREATED_AT_DESC,
-            ) as executions:
-                async for execution in executions:
-                    yield self._data_mapper.to_command_execution(execution)
+            ),
+        ) as executions:
+            async for execution in executions:
+                yield self._data_mapper.to_command_execution(execution)
 
+    @tracing.traced("EnapterAPI.get_latest_telemetry")
     async def get_latest_telemetry(
         self, auth: core.AuthConfig, attributes_by_device: dict[str, list[str]]
     ) -> dict[str, dict[str, Any]]:
-        async with self._new_client(auth) as client:
-            try:
-                return self._data_mapper.to_latest_telemetry(
-                    await client.telemetry.latest(attributes_by_device)
-                )
-            except (enapter.http.api.Error, enapter.http.api.MultiError) as exc:
-                raise core.LatestTelemetryUnavailable() from exc
+        client = await self._admit(auth)
+        try:
+            return self._data_mapper.to_latest_telemetry(
+                await client.telemetry.latest(attributes_by_device)
+            )
+        except (enapter.http.api.Error, enapter.http.api.MultiError) as exc:
+            raise core.LatestTelemetryUnavailable() from exc
 
+    @tracing.traced("EnapterAPI.get_historical_telemetry")
     async def get_historical_telemetry(
         self,
         auth: core.AuthConfig,
@@ -155,23 +231,24 @@ class EnapterAPI:
         granularity: int,
         aggregation: domain.AggregationFunction,
     ) -> domain.HistoricalTelemetry:
-        async with self._new_client(auth) as client:
-            telemetry = await client.telemetry.wide_timeseries(
-                from_=time_from,
-                to=time_to,
-                granularity=granularity,
-                selectors=[
-                    enapter.http.api.telemetry.Selector(
-                        device=device_id,
-                        attributes=attributes,
-                        aggregation=enapter.http.api.telemetry.Aggregation(
-                            aggregation.value.upper()
-                        ),
-                    )
-                ],
-            )
-            return self._data_mapper.to_historical_telemetry(telemetry)
+        client = await self._admit(auth)
+        telemetry = await client.telemetry.wide_timeseries(
+            from_=time_from,
+            to=time_to,
+            granularity=granularity,
+            selectors=[
+                enapter.http.api.telemetry.Selector(
+                    device=device_id,
+                    attributes=attributes,
+                    aggregation=enapter.http.api.telemetry.Aggregation(
+                        aggregation.value.upper()
+                    ),
+                )
+            ],
+        )
+        return self._data_mapper.to_historical_telemetry(telemetry)
 
+    @tracing.traced("EnapterAPI.create_rule")
     async def create_rule(
         self,
         auth: core.AuthConfig,
@@ -180,15 +257,16 @@ class EnapterAPI:
         script: domain.RuleScript,
         disabled: bool,
     ) -> domain.Rule:
-        async with self._new_client(auth) as client:
-            rule = await client.rule_engine.create_rule(
-                script=self._data_mapper.from_rule_script(script),
-                slug=slug,
-                site_id=site_id,
-                disable=disabled,
-            )
-            return self._data_mapper.to_rule(rule)
+        client = await self._admit(auth)
+        rule = await client.rule_engine.create_rule(
+            script=self._data_mapper.from_rule_script(script),
+            slug=slug,
+            site_id=site_id,
+            disable=disabled,
+        )
+        return self._data_mapper.to_rule(rule)
 
+    @tracing.traced("EnapterAPI.update_rule_script")
     async def update_rule_script(
         self,
         auth: core.AuthConfig,
@@ -196,28 +274,37 @@ class EnapterAPI:
         site_id: str,
         script: domain.RuleScript,
     ) -> domain.Rule:
-        async with self._new_client(auth) as client:
-            rule = await client.rule_engine.update_rule_script(
-                rule_id=rule_id,
-                script=self._data_mapper.from_rule_script(script),
-                site_id=site_id,
-            )
-            return self._data_mapper.to_rule(rule)
+        client = await self._admit(auth)
+        rule = await client.rule_engine.update_rule_script(
+            rule_id=rule_id,
+            script=self._data_mapper.from_rule_script(script),
+            site_id=site_id,
+        )
+        return self._data_mapper.to_rule(rule)
 
+    @tracing.traced("EnapterAPI.delete_rule")
     async def delete_rule(
         self, auth: core.AuthConfig, rule_id: str, site_id: str
     ) -> None:
-        async with self._new_client(auth) as client:
-            await client.rule_engine.delete_rule(rule_id, site_id)
+        client = await self._admit(auth)
+        await client.rule_engine.delete_rule(rule_id, site_id)
 
-    @contextlib.asynccontextmanager
-    async def _new_client(
-        self, auth: core.AuthConfig
-    ) -> AsyncGenerator[enapter.http.api.Client, None]:
-        config = enapter.http.api.Config(
-            base_url=self._base_url, token=auth.token, user=auth.user
-        )
-        async with enapter.http.api.Client(
-            config=config, transport=self._transport
-        ) as client:
-            yield client
+    async def _admit(self, auth: core.AuthConfig) -> enapter.http.api.Client:
+        if self._user_rate_limiter is not None:
+            await self._user_rate_limiter.acquire(auth)
+        return self._client(auth)
+
+    def _client(self, auth: core.AuthConfig) -> enapter.http.api.Client:
+        return self._clients.get(auth)
+
+    async def _hedged[T](self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        if self._hedger is None:
+            return await call()
+        return await self._hedger.run(key, call)
+
+    @staticmethod
+    def _hedge_key(method: str, **expansions: bool) -> str:
+        # Expansions change the latency of a call a lot, so each combination
+        # keeps its own latency samples.
+        expanded = ",".join(name for name, enabled in expansions.items() if enabled)
+        return f"{method}?expand={expanded}" if expanded else method
@@ -1,3 +1,7 @@
+import hashlib
+import json
+import sys
+import weakref
 from typing import Any
 
 import enapter
@@ -6,6 +10,14 @@ from enapter_mcp_server import domain
 
 
 class EnapterDataMapper:
+    def __init__(self) -> None:
+        # Parsed manifests are hash-consed by content, so devices sharing a
+        # blueprint share one DeviceManifest for as long as any of them is
+        # alive.
+        self._manifests: weakref.WeakValueDictionary[str, domain.DeviceManifest] = (
+            weakref.WeakValueDictionary()
+        )
+
     def to_site(self, site: enapter.http.api.sites.Site) -> domain.Site:
         return domain.Site(
             id=site.id,
@@ -62,9 +74,9 @@ class EnapterDataMapper:
 
         return domain.Device(
             id=device.id,
-            blueprint_id=device.blueprint_id,
+            blueprint_id=sys.intern(device.blueprint_id),
             name=device.name,
-            site_id=device.site_id,
+            site_id=sys.intern(device.site_id),
             type=domain.DeviceType(device.type.value.lower()),
             authorized_role=domain.AccessRole(device.authorized_role.value.lower()),
             connectivity=connectivity,
@@ -79,6 +91,16 @@ class EnapterDataMapper:
         if manifest is None:
             return None
 
+        digest = hashlib.sha256(
+            json.dumps(manifest, sort_keys=True, separators=(",", ":")).encode()
+        ).hexdigest()
+        parsed = self._manifests.get(digest)
+        if parsed is None:
+            parsed = self._parse_device_manifest(manifest)
+            self._manifests[digest] = parsed
+        return parsed
+
+    def _parse_device_manifest(self, manifest: dict[str, Any]) -> domain.DeviceManifest:
         return domain.DeviceManifest(
             description=manifest.get("description"),
             vendor=manifest.get("vendor"),
@@ -113,7 +135,7 @@ class EnapterDataMapper:
             ),
             description=dto.get("description"),
             enum=dto.get("enum"),
-            unit=dto.get("unit"),
+            unit=self._intern(dto.get("unit")),
             implements=dto.get("implements") or [],
         )
 
@@ -129,7 +151,7 @@ class EnapterDataMapper:
             ),
             description=dto.get("description"),
             enum=dto.get("enum"),
-            unit=dto.get("unit"),
+            unit=self._intern(dto.get("unit")),
             implements=dto.get("implements") or [],
         )
 
@@ -226,3 +248,6 @@ class EnapterDataMapper:
                 column.labels.telemetry: column.values for column in telemetry.columns
             },
         )
+
+    def _intern(self, value: str | None) -> str | None:
+        return sys.intern(value) if value is not None else None
@@ -0,0 +1,93 @@
+import asyncio
+import collections
+import math
+import time
+from typing import Awaitable, Callable
+
+
+class Hedger:
+    """Duplicates slow idempotent requests and uses the first response.
+
+    A request still running after the `percentile` latency of recent
+    requests with the same key is sent once more, and whichever copy succeeds
+    first wins while the other one is cancelled. Every request earns
+    `max_hedge_rate` of a hedge, and a hedge is only sent while a whole one
+    has been earned, which caps hedges to that share of all requests with
+    bursts of at most `max_hedge_burst`.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        max_hedge_rate: float = 0.05,
+        max_hedge_burst: float = 10.0,
+        min_samples: int = 20,
+        window: int = 1000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._percentile = percentile
+        self._max_hedge_rate = max_hedge_rate
+        self._max_hedge_burst = max_hedge_burst
+        self._min_samples = min_samples
+        self._window = window
+        self._clock = clock
+        self._latencies: dict[str, collections.deque[float]] = {}
+        self._hedge_budget = 0.0
+        self.requests = 0
+        self.hedges = 0
+
+    async def run[T](self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        self.requests += 1
+        self._hedge_budget = min(
+            self._max_hedge_burst, self._hedge_budget + self._max_hedge_rate
+        )
+        latencies = self._latencies.setdefault(
+            key, collections.deque(maxlen=self._window)
+        )
+        delay = self._hedge_delay(latencies)
+
+        started_at = self._clock()
+        primary = asyncio.ensure_future(call())
+        tasks: set[asyncio.Future[T]] = {primary}
+        try:
+            if delay is not None:
+                await asyncio.wait(tasks, timeout=delay)
+                if not primary.done() and self._hedge_budget >= 1.0:
+                    self._hedge_budget -= 1.0
+                    self.hedges += 1
+                    tasks.add(asyncio.ensure_future(call()))
+            result = await self._first_success(tasks)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    # Retrieve the error of a losing copy to keep it quiet.
+                    task.exception()
+
+        latencies.append(self._clock() - started_at)
+        return result
+
+    def _hedge_delay(self, latencies: collections.deque[float]) -> float | None:
+        if len(latencies) < self._min_samples:
+            return None
+        ordered = sorted(latencies)
+        index = min(len(ordered) - 1, math.ceil(self._percentile * len(ordered)) - 1)
+        return ordered[index]
+
+    @staticmethod
+    async def _first_success[T](tasks: set[asyncio.Future[T]]) -> T:
+        pending = set(tasks)
+        error: BaseException | None = None
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                exception = task.exception()
+                if exception is None:
+                    return task.result()
+                if error is None:
+                    error = exception
+        assert error is not None
+        raise error
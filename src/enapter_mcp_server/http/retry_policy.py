@@ -0,0 +1,53 @@
+import dataclasses
+import datetime
+import email.utils
+import random
+
+import httpx
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class RetryPolicy:
+    """Bounded retries with full-jitter exponential backoff.
+
+    A `Retry-After` header sets the lower bound of the delay. A response
+    asking to wait longer than `max_retry_after` is not retried.
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.1
+    max_delay: float = 2.0
+    max_retry_after: float = 10.0
+
+    def delay(self, attempt: int, response: httpx.Response | None) -> float | None:
+        """Return seconds to wait before retrying or None to give up."""
+        if attempt + 1 >= self.max_attempts:
+            return None
+
+        delay = random.uniform(0.0, min(self.max_delay, self.base_delay * 2**attempt))
+        retry_after = (
+            self._parse_retry_after(response.headers.get("Retry-After"))
+            if response is not None
+            else None
+        )
+        if retry_after is not None:
+            if retry_after > self.max_retry_after:
+                return None
+            delay = max(delay, retry_after)
+
+        return delay
+
+    @staticmethod
+    def _parse_retry_after(value: str | None) -> float | None:
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            date = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        now = datetime.datetime.now(datetime.UTC)
+        return max(0.0, (date - now).total_seconds())
@@ -0,0 +1,184 @@
+import asyncio
+import contextlib
+import contextvars
+from typing import Any, Callable, Iterator
+
+import enapter
+import httpx
+
+from enapter_mcp_server import tracing
+
+from .adaptive_concurrency_limiter import AdaptiveConcurrencyLimiter
+from .circuit_breaker import CircuitBreaker
+from .retry_policy import RetryPolicy
+
+# Timeseries are queried with a POST, but the query has no side effects.
+_IDEMPOTENT_POST_PATHS = ("/v3/telemetry/query_timeseries",)
+
+# Path segments following these are resource ids, which endpoints abstract.
+_COLLECTIONS = frozenset(
+    {"sites", "devices", "rules", "blueprints", "command_executions"}
+)
+
+_statuses: contextvars.ContextVar[list[int] | None] = contextvars.ContextVar(
+    "_statuses", default=None
+)
+
+
+@contextlib.contextmanager
+def record_statuses() -> Iterator[list[int]]:
+    """Record the status of every upstream response received within.
+
+    The SDK reports failed responses without their status, so callers that
+    need to tell a missing resource from other failures look it up here.
+    """
+    statuses: list[int] = []
+    token = _statuses.set(statuses)
+    try:
+        yield statuses
+    finally:
+        _statuses.reset(token)
+
+
+class Transport(enapter.http.api.Transport):
+    """Transport that admits upstream requests through a concurrency limiter.
+
+    Idempotent reads are retried on transient failures according to the
+    retry policy and fail fast through a per-endpoint circuit breaker while
+    the endpoint keeps failing. Writes are never retried.
+
+    The SDK builds its own httpx clients, so timeouts are applied here by
+    overriding the timeout each request carries.
+    """
+
+    def __init__(
+        self,
+        limiter: AdaptiveConcurrencyLimiter,
+        timeout: httpx.Timeout | None = None,
+        retry_policy: RetryPolicy | None = None,
+        new_circuit_breaker: Callable[[str], CircuitBreaker] = CircuitBreaker,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self._limiter = limiter
+        self._timeout = timeout
+        self._retry_policy = (
+            retry_policy if retry_policy is not None else RetryPolicy(max_attempts=1)
+        )
+        self._new_circuit_breaker = new_circuit_breaker
+        self._circuit_breakers: dict[str, CircuitBreaker] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        tracing.count_page()
+        with tracing.span(f"HTTP {request.method}") as span:
+            if span.is_recording():
+                span.set_attribute("http.request.method", request.method)
+                span.set_attribute("url.path", request.url.path)
+            response = await self._handle(request)
+            statuses = _statuses.get()
+            if statuses is not None:
+                statuses.append(response.status_code)
+            if span.is_recording():
+                span.set_attribute("http.response.status_code", response.status_code)
+            return response
+
+    async def _handle(self, request: httpx.Request) -> httpx.Response:
+        if self._timeout is not None:
+            request.extensions["timeout"] = self._timeout.as_dict()
+
+        if not self._is_idempotent(request):
+            return await self._send(request)
+
+        circuit_breaker = self._circuit_breaker(request)
+        attempt = 0
+        while True:
+            circuit_breaker.check()
+            try:
+                response = await self._send(request)
+            except httpx.TransportError:
+                circuit_breaker.record_failure()
+                delay = self._retry_policy.delay(attempt, None)
+                if delay is None:
+                    raise
+            else:
+                if not self._is_transient_failure(response):
+                    circuit_breaker.record_success()
+                    return response
+                # Rate limiting says nothing about the health of the endpoint,
+                # so it is retried without counting towards the breaker.
+                if response.status_code >= 500:
+                    circuit_breaker.record_failure()
+                delay = self._retry_policy.delay(attempt, response)
+                if delay is None:
+                    return response
+                await response.aclose()
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def prewarm(self, url: str, connections: int) -> None:
+        """Open keep-alive connections to `url` before the first real request.
+
+        Requests are sent concurrently, so each of them needs a connection of
+        its own. They bypass the limiter to keep its latency samples clean.
+        """
+
+        async def connect() -> None:
+            request = httpx.Request("HEAD", url)
+            if self._timeout is not None:
+                request.extensions["timeout"] = self._timeout.as_dict()
+            try:
+                response = await super(Transport, self).handle_async_request(request)
+                await response.aread()
+                await response.aclose()
+            except httpx.TransportError:
+                # Prewarming is best effort, real requests connect on demand.
+                pass
+
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(connections):
+                tg.create_task(connect())
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        started_at = await self._limiter.acquire()
+        overloaded = False
+        try:
+            response = await super().handle_async_request(request)
+            overloaded = response.status_code == 429 or response.status_code >= 500
+            return response
+        except httpx.TransportError:
+            overloaded = True
+            raise
+        finally:
+            self._limiter.release(
+                started_at, overloaded=overloaded, endpoint=self._endpoint(request)
+            )
+
+    def _circuit_breaker(self, request: httpx.Request) -> CircuitBreaker:
+        endpoint = self._endpoint(request)
+        circuit_breaker = self._circuit_breakers.get(endpoint)
+        if circuit_breaker is None:
+            circuit_breaker = self._new_circuit_breaker(endpoint)
+            self._circuit_breakers[endpoint] = circuit_breaker
+        return circuit_breaker
+
+    @staticmethod
+    def _endpoint(request: httpx.Request) -> str:
+        segments = request.url.path.split("/")
+        template = [
+            "{id}" if i > 0 and segments[i - 1] in _COLLECTIONS else segment
+            for i, segment in enumerate(segments)
+        ]
+        return f"{request.method} {'/'.join(template)}"
+
+    @staticmethod
+    def _is_idempotent(request: httpx.Request) -> bool:
+        if request.method in ("GET", "HEAD"):
+            return True
+        return request.method == "POST" and request.url.path.endswith(
+            _IDEMPOTENT_POST_PATHS
+        )
+
+    @staticmethod
+    def _is_transient_failure(response: httpx.Response) -> bool:
+        return response.status_code in (429, 502, 503, 504)
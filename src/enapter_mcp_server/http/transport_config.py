@@ -0,0 +1,33 @@
+import dataclasses
+
+import httpx
+
+
+@dataclasses.dataclass(frozen=True, kw_only=True)
+class TransportConfig:
+    max_connections: int | None = 100
+    max_keepalive_connections: int | None = 20
+    keepalive_expiry: float | None = 5.0
+    http2: bool = False
+    connect_timeout: float | None = 5.0
+    read_timeout: float | None = 5.0
+    write_timeout: float | None = 5.0
+    pool_timeout: float | None = 5.0
+    prewarm_connections: int = 0
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    @property
+    def timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.write_timeout,
+            pool=self.pool_timeout,
+        )
@@ -0,0 +1,103 @@
+import asyncio
+import collections
+import dataclasses
+import time
+from typing import Callable
+
+from enapter_mcp_server import core
+
+
+@dataclasses.dataclass
+class UserRateStats:
+    admitted: int = 0
+    rejected: int = 0
+    wait_seconds: float = 0.0
+
+
+@dataclasses.dataclass
+class _Bucket:
+    tokens: float
+    updated_at: float
+    stats: UserRateStats = dataclasses.field(default_factory=UserRateStats)
+
+
+class UserRateLimiter:
+    """Token bucket limiting upstream calls per auth identity.
+
+    An identity is the user the calls are made on behalf of, or the token
+    when there is no user. Every identity gets a bucket of `burst` tokens
+    refilled at `rate` tokens per second, and every call takes one token. A
+    call that finds the bucket empty reserves the next token and waits for
+    it, so waiting calls are admitted in arrival order. A call that would
+    wait longer than `max_wait` seconds fails with `core.RateLimitExceeded`
+    instead.
+
+    Calls are charged when they start, so a listing takes one token however
+    many pages it reads.
+
+    Buckets of the least recently seen identities are dropped once there are
+    more than `max_identities` of them, which only forgets how much an idle
+    identity has consumed.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: int = 20,
+        max_wait: float = 5.0,
+        max_identities: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._rate = rate
+        self._burst = burst
+        self._max_wait = max_wait
+        self._max_identities = max_identities
+        self._clock = clock
+        self._buckets: collections.OrderedDict[str, _Bucket] = collections.OrderedDict()
+
+    @property
+    def stats(self) -> dict[str, UserRateStats]:
+        """Consumption per identity, keyed by a label that hides the token."""
+        return {identity: bucket.stats for identity, bucket in self._buckets.items()}
+
+    async def acquire(self, auth: core.AuthConfig) -> None:
+        bucket = self._bucket(auth.identity)
+        bucket.tokens -= 1
+        if bucket.tokens >= 0:
+            bucket.stats.admitted += 1
+            return
+
+        wait = -bucket.tokens / self._rate
+        if wait > self._max_wait:
+            bucket.tokens += 1
+            bucket.stats.rejected += 1
+            raise core.RateLimitExceeded(
+                f"Too many Enapter HTTP API calls for this user, "
+                f"retry in {wait:.1f}s."
+            )
+
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            # Hand the reserved token back to the calls queued behind.
+            bucket.tokens += 1
+            raise
+        bucket.stats.admitted += 1
+        bucket.stats.wait_seconds += wait
+
+    def _bucket(self, identity: str) -> _Bucket:
+        now = self._clock()
+        bucket = self._buckets.pop(identity, None)
+        if bucket is None:
+            bucket = _Bucket(tokens=self._burst, updated_at=now)
+        else:
+            bucket.tokens = min(
+                float(self._burst),
+                bucket.tokens + (now - bucket.updated_at) * self._rate,
+            )
+            bucket.updated_at = now
+
+        self._buckets[identity] = bucket
+        while len(self._buckets) > self._max_identities:
+            self._buckets.popitem(last=False)
+        return bucket
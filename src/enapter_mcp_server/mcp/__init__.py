@@ -4,6 +4,7 @@ from .logging import configure_logging
 from .oauth_proxy_config import OAuthProxyConfig
 from .server import Server
 from .server_config import ServerConfig
+from .user_info_resolver import UserInfoResolver
 
 __all__ = [
     "models",
@@ -11,5 +12,6 @@ __all__ = [
     "Server",
     "ServerConfig",
     "OAuthProxyConfig",
+    "UserInfoResolver",
     "configure_logging",
 ]
@@ -0,0 +1,81 @@
+from typing import Awaitable, Callable, Iterable
+
+import fastmcp.server.middleware
+import fastmcp.tools.base
+import mcp
+
+from enapter_mcp_server import core, metrics
+
+
+class AdmissionMiddleware(fastmcp.server.middleware.Middleware):
+    """Sheds tool calls that the server has no capacity for.
+
+    Calls are admitted by an admission controller on behalf of the identity
+    resolved by `identify`. Rejected calls fail fast with a hint on when to
+    retry, instead of piling up upstream requests. Calls of `exempt_tools`
+    are not admitted themselves, for tools that admit the calls they make.
+    """
+
+    def __init__(
+        self,
+        controller: core.AdmissionController,
+        identify: Callable[[], Awaitable[core.AuthConfig]],
+        registry: metrics.Registry | None = None,
+        exempt_tools: Iterable[str] = (),
+    ) -> None:
+        self._controller = controller
+        self._identify = identify
+        self._exempt_tools = frozenset(exempt_tools)
+        self._queue_wait: metrics.HistogramChild | None = None
+        self._rejected: metrics.Counter | None = None
+        if registry is not None:
+            self._register_metrics(registry)
+
+    async def on_call_tool(
+        self,
+        context: fastmcp.server.middleware.MiddlewareContext[
+            mcp.types.CallToolRequestParams
+        ],
+        call_next: fastmcp.server.middleware.CallNext[
+            mcp.types.CallToolRequestParams, fastmcp.tools.base.ToolResult
+        ],
+    ) -> fastmcp.tools.base.ToolResult:
+        if context.message.name in self._exempt_tools:
+            return await call_next(context)
+        identity = (await self._identify()).identity
+        try:
+            waited = await self._controller.acquire(identity)
+        except core.ServerOverloaded as e:
+            if self._rejected is not None:
+                self._rejected.labels(e.reason).inc()
+            raise
+        try:
+            if self._queue_wait is not None:
+                self._queue_wait.observe(waited)
+            return await call_next(context)
+        finally:
+            self._controller.release(identity)
+
+    def _register_metrics(self, registry: metrics.Registry) -> None:
+        self._queue_wait = registry.histogram(
+            "enapter_mcp_tool_call_queue_wait_seconds",
+            "Time admitted MCP tool calls waited for capacity",
+        ).labels()
+        self._rejected = registry.counter(
+            "enapter_mcp_tool_calls_rejected_total",
+            "MCP tool calls rejected for lack of capacity by reason, either"
+            " queue_full or queue_timeout",
+            ("reason",),
+        )
+        registry.callback_gauge(
+            "enapter_mcp_tool_calls_admitted",
+            "MCP tool calls holding an admission slot",
+            (),
+            lambda: [((), self._controller.in_flight)],
+        )
+        registry.callback_gauge(
+            "enapter_mcp_tool_calls_queued",
+            "MCP tool calls waiting for an admission slot",
+            (),
+            lambda: [((), self._controller.queue_depth)],
+        )
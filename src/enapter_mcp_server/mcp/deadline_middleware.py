@@ -0,0 +1,95 @@
+import asyncio
+from typing import Mapping
+
+import fastmcp.server.middleware
+import fastmcp.tools.base
+import mcp
+
+from enapter_mcp_server import core
+
+# Request metadata key a client may use to set the deadline of a tool call in
+# seconds.
+DEADLINE_META_KEY = "enapter.com/deadline"
+
+# Share of the deadline after which searches stop gathering results and
+# return what they have, leaving time to build the response.
+_PARTIAL_RESULTS_SHARE = 0.9
+
+
+class DeadlineMiddleware(fastmcp.server.middleware.Middleware):
+    """Bounds the time a tool call may take.
+
+    Work that supports partial results, such as searches, is cut short at
+    most of the deadline and reported as truncated. Whatever still runs when
+    the deadline expires is cancelled, including outstanding Enapter API
+    calls, and the tool call fails.
+    """
+
+    def __init__(
+        self,
+        default: float,
+        per_tool: Mapping[str, float] | None = None,
+        maximum: float | None = None,
+    ) -> None:
+        self._default = default
+        self._per_tool = dict(per_tool or {})
+        self._maximum = maximum
+
+    async def on_call_tool(
+        self,
+        context: fastmcp.server.middleware.MiddlewareContext[
+            mcp.types.CallToolRequestParams
+        ],
+        call_next: fastmcp.server.middleware.CallNext[
+            mcp.types.CallToolRequestParams, fastmcp.tools.base.ToolResult
+        ],
+    ) -> fastmcp.tools.base.ToolResult:
+        seconds = self._select_timeout(context)
+        timeout = asyncio.timeout(seconds)
+        try:
+            async with timeout:
+                with core.deadline(seconds * _PARTIAL_RESULTS_SHARE):
+                    return await call_next(context)
+        except TimeoutError as e:
+            if not timeout.expired():
+                raise
+            raise core.DeadlineExceeded(
+                f"The tool call did not complete within its deadline of"
+                f" {seconds:g}s. Narrow down the request or raise the deadline"
+                f" through the {DEADLINE_META_KEY!r} request metadata."
+            ) from e
+
+    def _select_timeout(
+        self,
+        context: fastmcp.server.middleware.MiddlewareContext[
+            mcp.types.CallToolRequestParams
+        ],
+    ) -> float:
+        requested = self._requested_timeout(context)
+        if requested is None:
+            return self._per_tool.get(context.message.name, self._default)
+        if self._maximum is not None:
+            return min(requested, self._maximum)
+        return requested
+
+    @staticmethod
+    def _requested_timeout(
+        context: fastmcp.server.middleware.MiddlewareContext[
+            mcp.types.CallToolRequestParams
+        ],
+    ) -> float | None:
+        # The request metadata is taken off the tool call parameters before
+        # they reach middleware, and is kept in the request context instead.
+        if context.fastmcp_context is None:
+            return None
+        request_context = context.fastmcp_context.request_context
+        if request_context is None or request_context.meta is None:
+            return None
+        extra = request_context.meta.model_extra or {}
+        value = extra.get(DEADLINE_META_KEY)
+        # Booleans are numbers in Python but not a meaningful deadline.
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return None
+        if value <= 0:
+            return None
+        return float(value)
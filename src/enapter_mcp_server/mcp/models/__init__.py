@@ -2,6 +2,8 @@ from .access_role import AccessRole
 from .aggregation_function import AggregationFunction
 from .alert_declaration import AlertDeclaration
 from .alert_severity import AlertSeverity
+from .batch_call import BatchCall
+from .batch_result import BatchResult
 from .blueprint_section import BlueprintSection
 from .blueprint_summary import BlueprintSummary
 from .command_argument_declaration import CommandArgumentDeclaration
@@ -16,6 +18,7 @@ from .device import Device
 from .device_type import DeviceType
 from .device_view import DeviceView
 from .historical_telemetry import HistoricalTelemetry
+from .page import Page
 from .property_declaration import PropertyDeclaration
 from .rule import Rule
 from .rule_engine_state import RuleEngineState
@@ -30,6 +33,8 @@ __all__ = [
     "AlertDeclaration",
     "AlertSeverity",
     "AccessRole",
+    "BatchCall",
+    "BatchResult",
     "BlueprintSection",
     "BlueprintSummary",
     "CommandArgumentDeclaration",
@@ -44,6 +49,7 @@ __all__ = [
     "DeviceType",
     "DeviceView",
     "HistoricalTelemetry",
+    "Page",
     "PropertyDeclaration",
     "Rule",
     "RuleEngineState",
@@ -0,0 +1,10 @@
+from typing import Any
+
+import pydantic
+
+
+class BatchCall(pydantic.BaseModel):
+    """A call of a read-only tool made as part of a batch."""
+
+    tool: str
+    arguments: dict[str, Any] = pydantic.Field(default_factory=dict)
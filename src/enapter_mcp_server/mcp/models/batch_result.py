@@ -0,0 +1,15 @@
+from typing import Any
+
+import pydantic
+
+
+class BatchResult(pydantic.BaseModel):
+    """The outcome of a call made as part of a batch.
+
+    Exactly one of `result` and `error` is set. `result` holds what the tool
+    would have returned if called on its own.
+    """
+
+    tool: str
+    result: Any = None
+    error: str | None = None
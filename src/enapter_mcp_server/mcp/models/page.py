@@ -0,0 +1,18 @@
+import pydantic
+
+
+class Page[T](pydantic.BaseModel):
+    """Represents a page of search results.
+
+    `next_cursor` is set when more results follow. Pass it as `cursor`,
+    together with the same search parameters, to fetch the next page. It is
+    null on the last page.
+
+    `truncated` is set when the search ran out of time and `items` holds only
+    the results found so far. Narrow down the search or retry it later to get
+    the rest.
+    """
+
+    items: list[T]
+    next_cursor: str | None = None
+    truncated: bool = False
@@ -18,21 +18,30 @@ class Site(pydantic.BaseModel):
     execution on devices at this site, a user can read the value (or execute
     the command) only if their `authorized_role` is at or after the
     declaration's `access_level`.
+
+    The gateway and device counts are null when the status of the site could
+    not be computed in time, in which case the page is marked as truncated.
     """
 
     id: str
     name: str
     timezone: str
     authorized_role: AccessRole
-    gateway_id: str | None
-    gateway_online: bool
-    devices_total: int
-    devices_online: int
+    gateway_id: str | None = None
+    gateway_online: bool | None = None
+    devices_total: int | None = None
+    devices_online: int | None = None
     rule_engine_state: RuleEngineState | None = None
 
     @classmethod
     def from_domain(cls, site: domain.Site) -> Self:
-        assert site.status is not None
+        if site.status is None:
+            return cls(
+                id=site.id,
+                name=site.name,
+                timezone=site.timezone,
+                authorized_role=site.authorized_role.value,
+            )
         rule_engine_state: RuleEngineState | None = None
         if site.status.rule_engine_state is not None:
             rule_engine_state = site.status.rule_engine_state.value
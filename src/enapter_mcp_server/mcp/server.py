@@ -1,23 +1,40 @@
 import asyncio
+import contextvars
 import datetime
+import functools
 import pathlib
+import socket
 import urllib.parse
-from typing import Any, Literal
+from typing import Any, Awaitable, Callable, Literal
 
 import enapter
 import fastmcp
 import fastmcp.server.auth.providers.introspection
-import httpx
+import fastmcp.server.middleware
 import key_value.aio.protocols
 import key_value.aio.stores.disk
 import key_value.aio.stores.memory
 import mcp
+import pydantic
 import starlette
+import starlette.requests
+import starlette.responses
 
-from enapter_mcp_server import __version__, core, domain
+from enapter_mcp_server import __version__, core, domain, metrics, sqlite
 
 from . import models
+from .admission_middleware import AdmissionMiddleware
+from .deadline_middleware import DeadlineMiddleware
 from .server_config import ServerConfig
+from .tool_metrics_middleware import ToolMetricsMiddleware
+from .user_info_resolver import UserInfoResolver
+
+# Calls of a batch share the auth config resolved for the batch.
+_batch_auth: contextvars.ContextVar[core.AuthConfig | None] = contextvars.ContextVar(
+    "_batch_auth", default=None
+)
+
+_MAX_BATCH_SIZE = 30
 
 
 class Server(enapter.async_.Routine):
@@ -26,12 +43,39 @@ class Server(enapter.async_.Routine):
         app: core.ApplicationServer,
         config: ServerConfig,
         task_group: asyncio.TaskGroup | None = None,
+        metrics_registry: metrics.Registry | None = None,
     ) -> None:
         super().__init__(task_group=task_group)
         self._app = app
         self._config = config
+        self._metrics_registry = metrics_registry
+        self._user_info_resolver = (
+            UserInfoResolver(config.oauth_proxy.user_info_endpoint_url)
+            if config.oauth_proxy is not None
+            else None
+        )
+        # Calls made by a batch run through the same middleware as the tool
+        # calls of clients, which is set up with the FastMCP server.
+        self._middleware: list[fastmcp.server.middleware.Middleware] = []
 
     async def _run(self) -> None:
+        fastmcp_server = self._new_fastmcp_server()
+        try:
+            await fastmcp_server.run_async(
+                transport="streamable-http",
+                show_banner=False,
+                host=self._config.host,
+                port=self._config.port,
+                uvicorn_config={"timeout_graceful_shutdown": 5.0},
+                middleware=self._new_middleware(),
+                stateless_http=True,
+                sockets=self._new_sockets(),
+            )
+        finally:
+            if self._user_info_resolver is not None:
+                await self._user_info_resolver.aclose()
+
+    def _new_fastmcp_server(self) -> fastmcp.FastMCP:
         icon = (
             mcp.types.Icon(src=self._config.logo_url)
             if self._config.logo_url is not None
@@ -51,16 +95,64 @@ class Server(enapter.async_.Routine):
             auth=auth_provider,
         )
         self._register_tools(fastmcp_server)
-        await fastmcp_server.run_async(
-            transport="streamable-http",
-            show_banner=False,
-            host=self._config.host,
-            port=self._config.port,
-            uvicorn_config={"timeout_graceful_shutdown": 5.0},
-            middleware=self._new_middleware(),
-            stateless_http=True,
+        # Middleware added first runs outermost, so that metrics also cover
+        # rejected calls and calls failed by their deadline, and the time a
+        # call waits for admission does not count towards its deadline.
+        middleware: list[fastmcp.server.middleware.Middleware] = []
+        if self._metrics_registry is not None:
+            middleware.append(
+                self._register_metrics(fastmcp_server, self._metrics_registry)
+            )
+        admission_controller = self._new_admission_controller()
+        if admission_controller is not None:
+            middleware.append(
+                AdmissionMiddleware(
+                    admission_controller,
+                    self._get_auth_config,
+                    self._metrics_registry,
+                    # A batch holds no slot of its own, its calls take one
+                    # each.
+                    exempt_tools=("batch",),
+                )
+            )
+        middleware.append(
+            DeadlineMiddleware(
+                default=self._config.tool_deadline,
+                per_tool=self._config.tool_deadlines,
+                maximum=self._config.max_tool_deadline,
+            )
+        )
+        for m in middleware:
+            fastmcp_server.add_middleware(m)
+        self._middleware = middleware
+        return fastmcp_server
+
+    def _new_admission_controller(self) -> core.AdmissionController | None:
+        if (
+            self._config.max_concurrent_tool_calls is None
+            and self._config.max_concurrent_tool_calls_per_user is None
+        ):
+            return None
+        return core.AdmissionController(
+            max_in_flight=self._config.max_concurrent_tool_calls,
+            max_in_flight_per_identity=self._config.max_concurrent_tool_calls_per_user,
+            max_queued=self._config.tool_call_queue_size,
+            max_wait=self._config.tool_call_queue_timeout,
+            retry_after=self._config.tool_call_queue_timeout,
         )
 
+    def _new_sockets(self) -> list[socket.socket] | None:
+        if not self._config.reuse_port:
+            return None
+        # Several processes may listen on the same address, and the kernel
+        # balances connections between them.
+        family = socket.AF_INET6 if ":" in self._config.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind((self._config.host, self._config.port))
+        return [sock]
+
     def _select_auth_provider(self) -> fastmcp.server.auth.AuthProvider | None:
         if self._config.oauth_proxy is None:
             return None
@@ -99,6 +191,8 @@ class Server(enapter.async_.Routine):
                 # FIXME: DiskStore is vulnerable to pickle deserialization
                 # exploits (CVE-2025-69872).
                 return key_value.aio.stores.disk.DiskStore(directory=jwt_store_url.path)
+            case "sqlite":
+                return sqlite.KeyValueStore(path=jwt_store_url.path)
             case _:
                 raise NotImplementedError(f"{jwt_store_url.scheme}")
 
@@ -119,6 +213,26 @@ class Server(enapter.async_.Routine):
             )
             fastmcp_server.tool(tool, annotations=annotations)
 
+    def _register_metrics(
+        self, fastmcp_server: fastmcp.FastMCP, registry: metrics.Registry
+    ) -> ToolMetricsMiddleware:
+        tools = [
+            tool.__name__
+            for tool, _ in [*self._read_only_tools, *self._read_write_tools]
+        ]
+
+        @fastmcp_server.custom_route(
+            "/metrics", methods=["GET"], include_in_schema=False
+        )
+        async def render_metrics(
+            request: starlette.requests.Request,
+        ) -> starlette.responses.Response:
+            return starlette.responses.PlainTextResponse(
+                registry.render(), media_type="text/plain; version=0.0.4"
+            )
+
+        return ToolMetricsMiddleware(registry, tools)
+
     @property
     def _read_only_tools(self) -> list[tuple[mcp.types.AnyFunction, str]]:
         tools: list[tuple[mcp.types.AnyFunction, str]] = [
@@ -134,6 +248,8 @@ class Server(enapter.async_.Routine):
         if self._config.skills_enabled:
             tools.append((self.read_skill, "Read Skill"))
 
+        tools.append((self.batch, "Batch"))
+
         return tools
 
     @property
@@ -176,7 +292,8 @@ class Server(enapter.async_.Routine):
         timezone_regexp: str = ".*",
         offset: int = 0,
         limit: int = 20,
-    ) -> list[models.Site]:
+        cursor: str | None = None,
+    ) -> models.Page[models.Site]:
         """
         Search among energy system sites accessible to the authenticated user.
 
@@ -184,6 +301,7 @@ class Server(enapter.async_.Routine):
 
         Tips:
         - Both `name_regexp` and `timezone_regexp` accept Python-style regular expressions.
+        - When `next_cursor` is set, pass it as `cursor` with the same search parameters to fetch the next page. It is cheaper than increasing `offset`.
 
         Related tools:
         - `search_devices`: Pass the discovered `site_id` to find devices located at this site.
@@ -196,13 +314,18 @@ class Server(enapter.async_.Routine):
             name_regexp=name_regexp,
             timezone_regexp=timezone_regexp,
         )
-        sites = await self._app.search_sites(
+        page = await self._app.search_sites(
             auth=auth,
             query=query,
             offset=offset,
             limit=limit,
+            cursor=cursor,
+        )
+        return models.Page(
+            items=[models.Site.from_domain(s) for s in page.items],
+            next_cursor=page.next_cursor,
+            truncated=page.truncated,
         )
-        return [models.Site.from_domain(s) for s in sites]
 
     async def search_rules(
         self,
@@ -211,7 +334,8 @@ class Server(enapter.async_.Routine):
         slug_regexp: str | None = None,
         offset: int = 0,
         limit: int = 20,
-    ) -> list[models.Rule]:
+        cursor: str | None = None,
+    ) -> models.Page[models.Rule]:
         """
         Search for automation rules running on a specific site.
 
@@ -219,6 +343,7 @@ class Server(enapter.async_.Routine):
 
         Tips:
         - `slug_regexp` accepts a Python-style regular expression.
+        - When `next_cursor` is set, pass it as `cursor` with the same search parameters to fetch the next page.
 
         Related tools:
         - `read_rule`: Pass the discovered `rule_id` and `site_id` to read the actual Lua script code of the rule.
@@ -229,13 +354,18 @@ class Server(enapter.async_.Routine):
             rule_id=rule_id,
             slug_regexp=slug_regexp,
         )
-        rules = await self._app.search_rules(
+        page = await self._app.search_rules(
             auth=auth,
             query=query,
             offset=offset,
             limit=limit,
+            cursor=cursor,
+        )
+        return models.Page(
+            items=[models.Rule.from_domain(r) for r in page.items],
+            next_cursor=page.next_cursor,
+            truncated=page.truncated,
         )
-        return [models.Rule.from_domain(r) for r in rules]
 
     async def read_rule(
         self,
@@ -272,7 +402,8 @@ class Server(enapter.async_.Routine):
         view: models.DeviceView = "basic",
         offset: int = 0,
         limit: int = 20,
-    ) -> list[models.Device]:
+        cursor: str | None = None,
+    ) -> models.Page[models.Device]:
         """
         Search for energy system devices.
 
@@ -282,6 +413,7 @@ class Server(enapter.async_.Routine):
         - Use `has_active_alerts=True` to quickly find devices that require attention.
         - The default `view="basic"` returns summary information. To retrieve the `active_alerts` list and device `properties`, use `view="full"` (requires specifying either `site_id` or `device_id`).
         - `name_regexp` accepts a Python-style regular expression.
+        - When `next_cursor` is set, pass it as `cursor` with the same search parameters to fetch the next page. It is cheaper than increasing `offset`.
         - Devices sharing the same `blueprint_id` have identical manifests, so `read_blueprint` need only be called once per unique `blueprint_id`. Reuse the result for every device with a matching `blueprint_id` to avoid redundant calls.
 
         Related tools:
@@ -303,14 +435,19 @@ class Server(enapter.async_.Routine):
             ),
             has_active_alerts=has_active_alerts,
         )
-        views = await self._app.search_devices(
+        page = await self._app.search_devices(
             auth=auth,
             query=query,
             offset=offset,
             limit=limit,
             view=domain.DeviceViewType(view.lower()),
+            cursor=cursor,
+        )
+        return models.Page(
+            items=[models.Device.from_view(v) for v in page.items],
+            next_cursor=page.next_cursor,
+            truncated=page.truncated,
         )
-        return [models.Device.from_view(v) for v in views]
 
     async def read_blueprint(
         self,
@@ -390,7 +527,8 @@ class Server(enapter.async_.Routine):
         view: models.CommandExecutionView = "basic",
         offset: int = 0,
         limit: int = 20,
-    ) -> list[models.CommandExecution]:
+        cursor: str | None = None,
+    ) -> models.Page[models.CommandExecution]:
         """
         Search the history of commands executed on devices.
 
@@ -402,6 +540,7 @@ class Server(enapter.async_.Routine):
         - `view="full"` requires specifying a `device_id`.
         - `command_name_regexp` accepts a Python-style regular expression.
         - `created_at_gte` and `created_at_lt` can be used to filter by time.
+        - When `next_cursor` is set, pass it as `cursor` with the same search parameters to fetch the next page. Unlike `offset`, it costs the same no matter how deep the page is.
         """
         auth = await self._get_auth_config()
         query = core.CommandExecutionSearchQuery(
@@ -416,14 +555,19 @@ class Server(enapter.async_.Routine):
             created_at_gte=created_at_gte,
             created_at_lt=created_at_lt,
         )
-        executions = await self._app.search_command_executions(
+        page = await self._app.search_command_executions(
             auth=auth,
             query=query,
             offset=offset,
             limit=limit,
             view=domain.CommandExecutionView(view.lower()),
+            cursor=cursor,
+        )
+        return models.Page(
+            items=[models.CommandExecution.from_domain(e) for e in page.items],
+            next_cursor=page.next_cursor,
+            truncated=page.truncated,
         )
-        return [models.CommandExecution.from_domain(e) for e in executions]
 
     async def execute_command(
         self,
@@ -597,7 +741,106 @@ class Server(enapter.async_.Routine):
         """
         return await self._app.read_skill(name, pathlib.PurePosixPath(file))
 
+    async def batch(self, calls: list[models.BatchCall]) -> list[models.BatchResult]:
+        """
+        Run several read-only tool calls at once and return their results in order.
+
+        Each entry of `calls` names a read-only tool of this server (e.g. `read_blueprint`, `search_devices`, `get_historical_telemetry`) and the arguments to call it with. The calls run concurrently, so a batch takes about as long as its slowest call.
+
+        Tips:
+        - Prefer one batch over many sequential calls when the calls do not depend on each other's results.
+        - A failed call reports its `error` without affecting the others.
+        - Identical upstream reads made by calls of the same batch are performed only once.
+        - `batch` cannot be nested, and it runs at most 30 calls.
+        """
+        if not calls:
+            raise ValueError("At least one call is required")
+        if len(calls) > _MAX_BATCH_SIZE:
+            raise ValueError(f"A batch runs at most {_MAX_BATCH_SIZE} calls")
+
+        # Calls beyond the per-user limit would only wait in the admission
+        # queue, where they could time out behind the rest of the batch.
+        limit = (
+            self._config.max_concurrent_tool_calls_per_user
+            or self._config.max_concurrent_tool_calls
+            or len(calls)
+        )
+        semaphore = asyncio.Semaphore(limit)
+        token = _batch_auth.set(await self._get_auth_config())
+        try:
+            with core.memoize_reads():
+                async with asyncio.TaskGroup() as tg:
+                    tasks = [
+                        tg.create_task(self._run_batch_call(c, semaphore))
+                        for c in calls
+                    ]
+        finally:
+            _batch_auth.reset(token)
+
+        return [task.result() for task in tasks]
+
+    async def _run_batch_call(
+        self, call: models.BatchCall, semaphore: asyncio.Semaphore
+    ) -> models.BatchResult:
+        tool = self._batch_tools.get(call.tool)
+        if tool is None:
+            return models.BatchResult(
+                tool=call.tool,
+                error=f"Unknown read-only tool {call.tool!r}",
+            )
+        try:
+            async with semaphore:
+                result = await self._call_through_middleware(call, tool)
+        except Exception as e:
+            return models.BatchResult(tool=call.tool, error=str(e) or type(e).__name__)
+        return models.BatchResult(tool=call.tool, result=result)
+
+    async def _call_through_middleware(
+        self, call: models.BatchCall, tool: Callable[..., Awaitable[Any]]
+    ) -> Any:
+        # Admission, deadlines and metrics apply to each call of a batch as
+        # they would if the call was made on its own.
+        try:
+            fastmcp_context = fastmcp.server.dependencies.get_context()
+        except RuntimeError:
+            fastmcp_context = None
+        context = fastmcp.server.middleware.MiddlewareContext(
+            message=mcp.types.CallToolRequestParams(
+                name=call.tool, arguments=call.arguments
+            ),
+            fastmcp_context=fastmcp_context,
+            method="tools/call",
+        )
+
+        async def call_tool(
+            context: fastmcp.server.middleware.MiddlewareContext[
+                mcp.types.CallToolRequestParams
+            ],
+        ) -> Any:
+            return await tool(**call.arguments)
+
+        call_next: fastmcp.server.middleware.CallNext[
+            mcp.types.CallToolRequestParams, Any
+        ] = call_tool
+        for middleware in reversed(self._middleware):
+            call_next = functools.partial(middleware, call_next=call_next)
+        return await call_next(context)
+
+    @functools.cached_property
+    def _batch_tools(self) -> dict[str, Callable[..., Awaitable[Any]]]:
+        # Arguments are validated against the tool signature, as they would
+        # be when the tool is called on its own.
+        return {
+            tool.__name__: pydantic.validate_call(tool)
+            for tool, _ in self._read_only_tools
+            if tool.__name__ != "batch"
+        }
+
     async def _get_auth_config(self) -> core.AuthConfig:
+        auth = _batch_auth.get()
+        if auth is not None:
+            return auth
+
         if self._config.oauth_proxy is None:
             headers = fastmcp.server.dependencies.get_http_headers()
             return core.AuthConfig(
@@ -607,12 +850,8 @@ class Server(enapter.async_.Routine):
 
         access_token = fastmcp.server.dependencies.get_access_token()
         assert access_token is not None
-        async with httpx.AsyncClient() as client:
-            assert self._config.oauth_proxy is not None
-            response = await client.get(
-                self._config.oauth_proxy.user_info_endpoint_url,
-                headers={"Authorization": f"Bearer {access_token.token}"},
-            )
-            response.raise_for_status()
-            user_info = response.json()
-            return core.AuthConfig(user=user_info["guid"])
+        assert self._user_info_resolver is not None
+        guid = await self._user_info_resolver.resolve(
+            access_token.token, access_token.expires_at
+        )
+        return core.AuthConfig(user=guid)
@@ -15,6 +15,14 @@ class ServerConfig:
     command_execution_enabled: bool = False
     rule_editing_enabled: bool = False
     skills_enabled: bool = False
+    reuse_port: bool = False
+    tool_deadline: float = 30.0
+    tool_deadlines: dict[str, float] = dataclasses.field(default_factory=dict)
+    max_tool_deadline: float | None = None
+    max_concurrent_tool_calls: int | None = 64
+    max_concurrent_tool_calls_per_user: int | None = None
+    tool_call_queue_size: int = 32
+    tool_call_queue_timeout: float = 2.0
 
     @property
     def address(self) -> str:
@@ -0,0 +1,83 @@
+import time
+from typing import Callable, Iterable
+
+import fastmcp.server.middleware
+import fastmcp.tools.base
+import mcp
+
+from enapter_mcp_server import metrics
+
+# Calls of tools that are not registered share one label, so that clients
+# cannot create new series.
+_UNKNOWN_TOOL = "unknown"
+
+
+class _ToolMetrics:
+    __slots__ = ("duration", "in_flight", "ok", "error")
+
+    def __init__(
+        self,
+        tool: str,
+        duration: metrics.Histogram,
+        in_flight: metrics.Gauge,
+        calls: metrics.Counter,
+    ) -> None:
+        self.duration = duration.labels(tool)
+        self.in_flight = in_flight.labels(tool)
+        self.ok = calls.labels(tool, "ok")
+        self.error = calls.labels(tool, "error")
+
+
+class ToolMetricsMiddleware(fastmcp.server.middleware.Middleware):
+    """Records the latency, outcome and concurrency of MCP tool calls."""
+
+    def __init__(
+        self,
+        registry: metrics.Registry,
+        tools: Iterable[str],
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        duration = registry.histogram(
+            "enapter_mcp_tool_call_duration_seconds",
+            "Duration of MCP tool calls",
+            ("tool",),
+        )
+        in_flight = registry.gauge(
+            "enapter_mcp_tool_calls_in_flight",
+            "MCP tool calls in progress",
+            ("tool",),
+        )
+        calls = registry.counter(
+            "enapter_mcp_tool_calls_total",
+            "MCP tool calls by outcome, either ok or error",
+            ("tool", "status"),
+        )
+        self._tools = {
+            tool: _ToolMetrics(tool, duration, in_flight, calls)
+            for tool in (*tools, _UNKNOWN_TOOL)
+        }
+        self._unknown = self._tools[_UNKNOWN_TOOL]
+        self._clock = clock
+
+    async def on_call_tool(
+        self,
+        context: fastmcp.server.middleware.MiddlewareContext[
+            mcp.types.CallToolRequestParams
+        ],
+        call_next: fastmcp.server.middleware.CallNext[
+            mcp.types.CallToolRequestParams, fastmcp.tools.base.ToolResult
+        ],
+    ) -> fastmcp.tools.base.ToolResult:
+        tool = self._tools.get(context.message.name, self._unknown)
+        tool.in_flight.inc()
+        started = self._clock()
+        try:
+            result = await call_next(context)
+        except BaseException:
+            tool.error.inc()
+            raise
+        finally:
+            tool.duration.observe(self._clock() - started)
+            tool.in_flight.dec()
+        tool.ok.inc()
+        return result
@@ -0,0 +1,59 @@
+import dataclasses
+import hashlib
+import time
+from typing import Callable
+
+import httpx
+
+from enapter_mcp_server import core
+
+
+@dataclasses.dataclass(frozen=True)
+class _UserInfo:
+    guid: str
+    expires_at: float | None
+
+
+class UserInfoResolver:
+    """Resolves OAuth access tokens to Enapter user ids.
+
+    Lookups of the user info endpoint share one HTTP client, so connections
+    to the SSO are reused. Resolved ids are cached by a hash of the token for
+    up to `ttl` seconds, but never past the expiry of the token itself.
+    Concurrent lookups of the same token share one request.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        ttl: float = 300.0,
+        max_size: int = 10_000,
+        client: httpx.AsyncClient | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._url = url
+        self._client = client if client is not None else httpx.AsyncClient()
+        self._clock = clock
+        self._cache: core.TTLCache[str, _UserInfo] = core.TTLCache(
+            ttl=ttl, max_size=max_size
+        )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def resolve(self, token: str, expires_at: float | None = None) -> str:
+        key = hashlib.sha256(token.encode()).hexdigest()
+        user_info = await self._cache.get(key, lambda: self._fetch(token, expires_at))
+        if user_info.expires_at is not None and user_info.expires_at <= self._clock():
+            self._cache.invalidate(key)
+            user_info = await self._cache.fill(
+                key, lambda: self._fetch(token, expires_at)
+            )
+        return user_info.guid
+
+    async def _fetch(self, token: str, expires_at: float | None) -> _UserInfo:
+        response = await self._client.get(
+            self._url, headers={"Authorization": f"Bearer {token}"}
+        )
+        response.raise_for_status()
+        return _UserInfo(guid=response.json()["guid"], expires_at=expires_at)
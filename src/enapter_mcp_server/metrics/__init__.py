@@ -0,0 +1,25 @@
+from .event_loop_lag_monitor import EventLoopLagMonitor
+from .instrumented_enapter_api import InstrumentedEnapterAPI
+from .registry import (
+    CallbackGauge,
+    Counter,
+    CounterChild,
+    Gauge,
+    GaugeChild,
+    Histogram,
+    HistogramChild,
+    Registry,
+)
+
+__all__ = [
+    "CallbackGauge",
+    "Counter",
+    "CounterChild",
+    "EventLoopLagMonitor",
+    "Gauge",
+    "GaugeChild",
+    "Histogram",
+    "HistogramChild",
+    "InstrumentedEnapterAPI",
+    "Registry",
+]
@@ -0,0 +1,40 @@
+import asyncio
+import time
+from typing import Callable
+
+import enapter
+
+from .registry import Registry
+
+_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class EventLoopLagMonitor(enapter.async_.Routine):
+    """Measures how late the event loop runs a callback scheduled on time.
+
+    The monitor sleeps for `interval` seconds and records how much longer
+    than that the sleep took. A busy loop, e.g. one blocked by synchronous
+    work, delays every coroutine by the same amount.
+    """
+
+    def __init__(
+        self,
+        registry: Registry,
+        interval: float = 0.5,
+        clock: Callable[[], float] = time.perf_counter,
+        task_group: asyncio.TaskGroup | None = None,
+    ) -> None:
+        super().__init__(task_group=task_group)
+        self._interval = interval
+        self._clock = clock
+        self._lag = registry.histogram(
+            "enapter_mcp_event_loop_lag_seconds",
+            "Delay of event loop callbacks behind their schedule",
+            buckets=_LAG_BUCKETS,
+        ).labels()
+
+    async def _run(self) -> None:
+        while True:
+            started = self._clock()
+            await asyncio.sleep(self._interval)
+            self._lag.observe(max(0.0, self._clock() - started - self._interval))
@@ -0,0 +1,312 @@
+import datetime
+import time
+from typing import Any, AsyncGenerator, Awaitable, Callable
+
+import enapter
+
+from enapter_mcp_server import core, domain
+
+from .registry import Registry
+
+_METHODS = (
+    "list_sites",
+    "get_rule_engine",
+    "list_rules",
+    "get_rule",
+    "list_devices",
+    "get_device",
+    "execute_command",
+    "list_command_executions",
+    "get_latest_telemetry",
+    "get_historical_telemetry",
+    "create_rule",
+    "update_rule_script",
+    "delete_rule",
+)
+
+
+class _Metrics:
+    def __init__(self, registry: Registry) -> None:
+        self.duration = registry.histogram(
+            "enapter_mcp_upstream_call_duration_seconds",
+            "Duration of Enapter HTTP API calls",
+            ("method",),
+        )
+        self.calls = registry.counter(
+            "enapter_mcp_upstream_calls_total",
+            "Enapter HTTP API calls by outcome, either ok or the error type",
+            ("method", "status"),
+        )
+        self.in_flight = registry.gauge(
+            "enapter_mcp_upstream_calls_in_flight",
+            "Enapter HTTP API calls in progress",
+            ("method",),
+        )
+
+
+class _MethodMetrics:
+    __slots__ = ("_method", "_calls", "_ok", "_duration", "_in_flight", "_clock")
+
+    def __init__(
+        self,
+        method: str,
+        metrics: _Metrics,
+        clock: Callable[[], float],
+    ) -> None:
+        self._method = method
+        self._calls = metrics.calls
+        self._ok = metrics.calls.labels(method, "ok")
+        self._duration = metrics.duration.labels(method)
+        self._in_flight = metrics.in_flight.labels(method)
+        self._clock = clock
+
+    def start(self) -> float:
+        self._in_flight.inc()
+        return self._clock()
+
+    def finish(self, started: float, error: BaseException | None) -> None:
+        self._duration.observe(self._clock() - started)
+        self._in_flight.dec()
+        # A caller that stops reading a listing early is not a failed call.
+        if error is None or isinstance(error, GeneratorExit):
+            self._ok.inc()
+        else:
+            self._calls.labels(self._method, type(error).__name__).inc()
+
+
+class InstrumentedEnapterAPI:
+    """Enapter API that records the latency and outcome of every call.
+
+    Calls are recorded per method: a latency histogram, a counter of
+    outcomes labelled `ok` or with the name of the raised exception, and a
+    gauge of calls in progress. Listings are timed until the caller stops
+    reading them.
+    """
+
+    def __init__(
+        self,
+        enapter_api: core.EnapterAPI,
+        registry: Registry,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self._enapter_api = enapter_api
+        metrics = _Metrics(registry)
+        self._methods = {
+            method: _MethodMetrics(method, metrics, clock) for method in _METHODS
+        }
+
+    @enapter.async_.generator
+    async def list_sites(
+        self, auth: core.AuthConfig
+    ) -> AsyncGenerator[domain.Site, None]:
+        metrics = self._methods["list_sites"]
+        started = metrics.start()
+        error: BaseException | None = None
+        try:
+            async with self._enapter_api.list_sites(auth) as sites:
+                async for site in sites:
+                    yield site
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            metrics.finish(started, error)
+
+    async def get_rule_engine(
+        self, auth: core.AuthConfig, site_id: str
+    ) -> domain.RuleEngine:
+        return await self._measure(
+            "get_rule_engine", self._enapter_api.get_rule_engine(auth, site_id)
+        )
+
+    @enapter.async_.generator
+    async def list_rules(
+        self, auth: core.AuthConfig, site_id: str
+    ) -> AsyncGenerator[domain.Rule, None]:
+        metrics = self._methods["list_rules"]
+        started = metrics.start()
+        error: BaseException | None = None
+        try:
+            async with self._enapter_api.list_rules(auth, site_id) as rules:
+                async for rule in rules:
+                    yield rule
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            metrics.finish(started, error)
+
+    async def get_rule(
+        self, auth: core.AuthConfig, site_id: str, rule_id: str
+    ) -> domain.Rule:
+        return await self._measure(
+            "get_rule", self._enapter_api.get_rule(auth, site_id, rule_id)
+        )
+
+    @enapter.async_.generator
+    async def list_devices(
+        self,
+        auth: core.AuthConfig,
+        site_id: str | None = None,
+        expand_manifest: bool = False,
+        expand_properties: bool = False,
+        expand_connectivity: bool = False,
+        expand_active_alerts: bool = False,
+    ) -> AsyncGenerator[domain.Device, None]:
+        metrics = self._methods["list_devices"]
+        started = metrics.start()
+        error: BaseException | None = None
+        try:
+            async with self._enapter_api.list_devices(
+                auth,
+                site_id=site_id,
+                expand_manifest=expand_manifest,
+                expand_properties=expand_properties,
+                expand_connectivity=expand_connectivity,
+                expand_active_alerts=expand_active_alerts,
+            ) as devices:
+                async for device in devices:
+                    yield device
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            metrics.finish(started, error)
+
+    async def get_device(
+        self,
+        auth: core.AuthConfig,
+        device_id: str,
+        expand_manifest: bool = False,
+        expand_connectivity: bool = False,
+        expand_properties: bool = False,
+        expand_active_alerts: bool = False,
+    ) -> domain.Device:
+        return await self._measure(
+            "get_device",
+            self._enapter_api.get_device(
+                auth,
+                device_id,
+                expand_manifest=expand_manifest,
+                expand_connectivity=expand_connectivity,
+                expand_properties=expand_properties,
+                expand_active_alerts=expand_active_alerts,
+            ),
+        )
+
+    async def execute_command(
+        self,
+        auth: core.AuthConfig,
+        device_id: str,
+        command_name: str,
+        arguments: dict[str, Any] | None,
+    ) -> domain.CommandExecution:
+        return await self._measure(
+            "execute_command",
+            self._enapter_api.execute_command(auth, device_id, command_name, arguments),
+        )
+
+    @enapter.async_.generator
+    async def list_command_executions(
+        self,
+        auth: core.AuthConfig,
+        device_id: str | None = None,
+        site_id: str | None = None,
+        created_at_gte: datetime.datetime | None = None,
+        created_at_lt: datetime.datetime | None = None,
+        state: domain.CommandExecutionState | None = None,
+    ) -> AsyncGenerator[domain.CommandExecution, None]:
+        metrics = self._methods["list_command_executions"]
+        started = metrics.start()
+        error: BaseException | None = None
+        try:
+            async with self._enapter_api.list_command_executions(
+                auth,
+                device_id=device_id,
+                site_id=site_id,
+                created_at_gte=created_at_gte,
+                created_at_lt=created_at_lt,
+                state=state,
+            ) as executions:
+                async for execution in executions:
+                    yield execution
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            metrics.finish(started, error)
+
+    async def get_latest_telemetry(
+        self, auth: core.AuthConfig, attributes_by_device: dict[str, list[str]]
+    ) -> dict[str, dict[str, Any]]:
+        return await self._measure(
+            "get_latest_telemetry",
+            self._enapter_api.get_latest_telemetry(auth, attributes_by_device),
+        )
+
+    async def get_historical_telemetry(
+        self,
+        auth: core.AuthConfig,
+        device_id: str,
+        attributes: list[str],
+        time_from: datetime.datetime,
+        time_to: datetime.datetime,
+        granularity: int,
+        aggregation: domain.AggregationFunction,
+    ) -> domain.HistoricalTelemetry:
+        return await self._measure(
+            "get_historical_telemetry",
+            self._enapter_api.get_historical_telemetry(
+                auth,
+                device_id,
+                attributes,
+                time_from,
+                time_to,
+                granularity,
+                aggregation,
+            ),
+        )
+
+    async def create_rule(
+        self,
+        auth: core.AuthConfig,
+        site_id: str,
+        slug: str,
+        script: domain.RuleScript,
+        disabled: bool,
+    ) -> domain.Rule:
+        return await self._measure(
+            "create_rule",
+            self._enapter_api.create_rule(auth, site_id, slug, script, disabled),
+        )
+
+    async def update_rule_script(
+        self,
+        auth: core.AuthConfig,
+        rule_id: str,
+        site_id: str,
+        script: domain.RuleScript,
+    ) -> domain.Rule:
+        return await self._measure(
+            "update_rule_script",
+            self._enapter_api.update_rule_script(auth, rule_id, site_id, script),
+        )
+
+    async def delete_rule(
+        self, auth: core.AuthConfig, rule_id: str, site_id: str
+    ) -> None:
+        await self._measure(
+            "delete_rule", self._enapter_api.delete_rule(auth, rule_id, site_id)
+        )
+
+    async def _measure[T](self, method: str, call: Awaitable[T]) -> T:
+        metrics = self._methods[method]
+        started = metrics.start()
+        error: BaseException | None = None
+        try:
+            return await call
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            metrics.finish(started, error)
@@ -0,0 +1,246 @@
+import abc
+import bisect
+import math
+from typing import Callable, Iterable
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+class CounterChild:
+    __slots__ = ("labels", "value")
+
+    def __init__(self, labels: str) -> None:
+        self.labels = labels
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class GaugeChild:
+    __slots__ = ("labels", "value")
+
+    def __init__(self, labels: str) -> None:
+        self.labels = labels
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+
+class HistogramChild:
+    __slots__ = ("labels", "bounds", "counts", "sum")
+
+    def __init__(self, labels: str, bounds: tuple[float, ...]) -> None:
+        self.labels = labels
+        self.bounds = bounds
+        # One count per bucket, not cumulative, plus the +Inf bucket.
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class _Family[C](abc.ABC):
+    type_name = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...]) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._children: dict[tuple[str, ...], C] = {}
+
+    def labels(self, *values: str) -> C:
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects labels {self.labelnames}, got {values}"
+                )
+            child = self._new_child(_format_labels(self.labelnames, values))
+            self._children[values] = child
+        return child
+
+    def render(self, lines: list[str]) -> None:
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} {self.type_name}")
+        for child in self._children.values():
+            self._render_child(child, lines)
+
+    @abc.abstractmethod
+    def _new_child(self, labels: str) -> C:
+        pass  # pragma: no cover
+
+    @abc.abstractmethod
+    def _render_child(self, child: C, lines: list[str]) -> None:
+        pass  # pragma: no cover
+
+
+class Counter(_Family[CounterChild]):
+    type_name = "counter"
+
+    def _new_child(self, labels: str) -> CounterChild:
+        return CounterChild(labels)
+
+    def _render_child(self, child: CounterChild, lines: list[str]) -> None:
+        lines.append(f"{self.name}{_braced(child.labels)} {_format_value(child.value)}")
+
+
+class Gauge(_Family[GaugeChild]):
+    type_name = "gauge"
+
+    def _new_child(self, labels: str) -> GaugeChild:
+        return GaugeChild(labels)
+
+    def _render_child(self, child: GaugeChild, lines: list[str]) -> None:
+        lines.append(f"{self.name}{_braced(child.labels)} {_format_value(child.value)}")
+
+
+class Histogram(_Family[HistogramChild]):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...],
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self, labels: str) -> HistogramChild:
+        return HistogramChild(labels, self.buckets)
+
+    def _render_child(self, child: HistogramChild, lines: list[str]) -> None:
+        prefix = f"{child.labels}," if child.labels else ""
+        total = 0
+        for bound, count in zip(child.bounds, child.counts):
+            total += count
+            lines.append(
+                f'{self.name}_bucket{{{prefix}le="{_format_value(bound)}"}} {total}'
+            )
+        total += child.counts[-1]
+        lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {total}')
+        lines.append(
+            f"{self.name}_sum{_braced(child.labels)} {_format_value(child.sum)}"
+        )
+        lines.append(f"{self.name}_count{_braced(child.labels)} {total}")
+
+
+class CallbackGauge:
+    """Gauge whose samples are read from `collect` at scrape time."""
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...],
+        collect: Callable[[], Iterable[tuple[tuple[str, ...], float]]],
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._collect = collect
+
+    def render(self, lines: list[str]) -> None:
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} {self.type_name}")
+        for values, value in self._collect():
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}{_braced(labels)} {_format_value(value)}")
+
+
+class Registry:
+    """Metrics rendered in the Prometheus text exposition format.
+
+    Metrics are recorded from the event loop thread only, so samples are
+    plain attributes updated without locks. Labelled samples are looked up
+    once with `labels()` and kept by the caller, so recording a value does
+    not allocate.
+    """
+
+    def __init__(self) -> None:
+        self._families: dict[str, _Family | CallbackGauge] = {}
+
+    def counter(
+        self, name: str, help: str, labelnames: tuple[str, ...] = ()
+    ) -> Counter:
+        return self._add(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._add(Gauge(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def callback_gauge(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...],
+        collect: Callable[[], Iterable[tuple[tuple[str, ...], float]]],
+    ) -> CallbackGauge:
+        return self._add(CallbackGauge(name, help, labelnames, collect))
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for family in self._families.values():
+            family.render(lines)
+        lines.append("")
+        return "\n".join(lines)
+
+    def _add[F: _Family | CallbackGauge](self, family: F) -> F:
+        if family.name in self._families:
+            raise ValueError(f"metric already registered: {family.name}")
+        self._families[family.name] = family
+        return family
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+def _braced(labels: str) -> str:
+    return f"{{{labels}}}" if labels else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
@@ -0,0 +1,3 @@
+from .key_value_store import KeyValueStore
+
+__all__ = ["KeyValueStore"]
@@ -0,0 +1,165 @@
+import asyncio
+import concurrent.futures
+import datetime
+import pathlib
+import sqlite3
+import time
+from typing import Any, Callable
+
+import key_value.aio.stores.base
+
+# Not exported publicly, but the store base class is typed with it. The
+# dependency is pinned to the releases this import was checked against.
+from key_value.aio._utils.managed_entry import ManagedEntry
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    collection TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires_at REAL,
+    PRIMARY KEY (collection, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_expires_at ON entries (expires_at)
+WHERE expires_at IS NOT NULL;
+"""
+
+
+class KeyValueStore(
+    key_value.aio.stores.base.BaseContextManagerStore,
+    key_value.aio.stores.base.BaseStore,
+):
+    """Key-value store kept in a SQLite database file.
+
+    Several processes may share one database file. The database runs in WAL
+    mode, so readers do not block the writer, and writers wait up to
+    `busy_timeout` seconds for each other instead of failing. Entries are
+    serialized as JSON.
+
+    Expired entries are never returned. They are deleted from the file by a
+    sweep that runs on writes at most once per `sweep_interval` seconds.
+
+    SQLite calls block, so they run on a dedicated thread that owns the
+    connection.
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path | str,
+        busy_timeout: float = 5.0,
+        sweep_interval: float = 60.0,
+        default_collection: str | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._path = pathlib.Path(path)
+        self._busy_timeout = busy_timeout
+        self._sweep_interval = sweep_interval
+        self._clock = clock
+        self._swept_at = float("-inf")
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="sqlite-key-value-store"
+        )
+        self._connection: sqlite3.Connection | None = None
+        super().__init__(default_collection=default_collection, stable_api=True)
+
+    async def _setup(self) -> None:
+        await self._call(self._connect)
+        self._exit_stack.push_async_callback(self._disconnect)
+
+    async def _get_managed_entry(
+        self, *, collection: str, key: str
+    ) -> ManagedEntry | None:
+        row = await self._call(self._select, collection, key)
+        if row is None:
+            return None
+        value, expires_at = row
+        managed_entry = self._serialization_adapter.load_json(json_str=value)
+        if expires_at is not None:
+            managed_entry.expires_at = datetime.datetime.fromtimestamp(
+                expires_at, tz=datetime.UTC
+            )
+        return managed_entry
+
+    async def _put_managed_entry(
+        self, *, collection: str, key: str, managed_entry: ManagedEntry
+    ) -> None:
+        value = self._serialization_adapter.dump_json(
+            entry=managed_entry, key=key, collection=collection
+        )
+        expires_at = (
+            managed_entry.expires_at.timestamp()
+            if managed_entry.expires_at is not None
+            else None
+        )
+        await self._call(self._upsert, collection, key, value, expires_at)
+
+    async def _delete_managed_entry(self, *, key: str, collection: str) -> bool:
+        return await self._call(self._delete, collection, key)
+
+    async def _disconnect(self) -> None:
+        await self._call(self._close)
+        self._executor.shutdown(wait=False)
+
+    async def _call[T](self, func: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _connect(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(
+            self._path,
+            timeout=self._busy_timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(_SCHEMA)
+        self._connection = connection
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _select(self, collection: str, key: str) -> tuple[str, float | None] | None:
+        assert self._connection is not None
+        cursor = self._connection.execute(
+            "SELECT value, expires_at FROM entries"
+            " WHERE collection = ? AND key = ?"
+            " AND (expires_at IS NULL OR expires_at > ?)",
+            (collection, key, self._clock()),
+        )
+        return cursor.fetchone()
+
+    def _upsert(
+        self, collection: str, key: str, value: str, expires_at: float | None
+    ) -> None:
+        assert self._connection is not None
+        self._connection.execute(
+            "INSERT INTO entries (collection, key, value, expires_at)"
+            " VALUES (?, ?, ?, ?)"
+            " ON CONFLICT (collection, key) DO UPDATE"
+            " SET value = excluded.value, expires_at = excluded.expires_at",
+            (collection, key, value, expires_at),
+        )
+        self._sweep()
+
+    def _delete(self, collection: str, key: str) -> bool:
+        assert self._connection is not None
+        cursor = self._connection.execute(
+            "DELETE FROM entries WHERE collection = ? AND key = ?",
+            (collection, key),
+        )
+        return cursor.rowcount > 0
+
+    def _sweep(self) -> None:
+        assert self._connection is not None
+        now = self._clock()
+        if now - self._swept_at < self._sweep_interval:
+            return
+        self._swept_at = now
+        self._connection.execute(
+            "DELETE FROM entries WHERE expires_at <= ?",
+            (now,),
+        )
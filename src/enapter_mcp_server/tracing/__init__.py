@@ -0,0 +1,9 @@
+from .spans import configure, count_page, listing_span, span, traced
+
+__all__ = [
+    "configure",
+    "count_page",
+    "listing_span",
+    "span",
+    "traced",
+]
@@ -0,0 +1,128 @@
+import contextvars
+import dataclasses
+import functools
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    ContextManager,
+    Coroutine,
+)
+
+import enapter
+import opentelemetry.trace
+
+from enapter_mcp_server import __version__
+
+_tracer: opentelemetry.trace.Tracer | None = None
+
+
+@dataclasses.dataclass
+class _Listing:
+    pages: int = 0
+
+
+_listing: contextvars.ContextVar[_Listing | None] = contextvars.ContextVar(
+    "_listing", default=None
+)
+
+
+class _NoSpan:
+    def __enter__(self) -> opentelemetry.trace.Span:
+        return opentelemetry.trace.INVALID_SPAN
+
+    def __exit__(self, *_: Any) -> None:
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def configure(tracer_provider: opentelemetry.trace.TracerProvider | None) -> None:
+    """Send spans of this server and of fastmcp to `tracer_provider`.
+
+    Until this is called, or after it is called with None, spans are not
+    created at all, so tracing costs a global lookup per traced call.
+    """
+    global _tracer
+    if tracer_provider is None:
+        _tracer = None
+        return
+    opentelemetry.trace.set_tracer_provider(tracer_provider)
+    _tracer = tracer_provider.get_tracer("enapter_mcp_server", __version__)
+
+
+def span(name: str) -> ContextManager[opentelemetry.trace.Span]:
+    """Start a span that is current until the context exits."""
+    if _tracer is None:
+        return _NO_SPAN
+    return _tracer.start_as_current_span(name)
+
+
+def traced[**P, R](
+    name: str,
+) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Coroutine[Any, Any, R]]]:
+    """Run every call of a coroutine function in a span called `name`."""
+
+    def decorator(
+        func: Callable[P, Awaitable[R]],
+    ) -> Callable[P, Coroutine[Any, Any, R]]:
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if _tracer is None:
+                return await func(*args, **kwargs)
+            with _tracer.start_as_current_span(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@enapter.async_.generator
+async def listing_span[T](
+    name: str, items: AsyncContextManager[AsyncGenerator[T, None]]
+) -> AsyncGenerator[T, None]:
+    """Trace reading a listing in a span called `name`.
+
+    The span records how many items were read and how many upstream
+    requests fetched them. It is current only while the next item is being
+    fetched, so that spans the reader starts between items do not become
+    its children.
+    """
+    tracer = _tracer
+    if tracer is None:
+        async with items as items_gen:
+            async for item in items_gen:
+                yield item
+        return
+
+    listing = _Listing()
+    count = 0
+    current_span = tracer.start_span(name)
+    try:
+        async with items as items_gen:
+            while True:
+                with opentelemetry.trace.use_span(current_span, end_on_exit=False):
+                    token = _listing.set(listing)
+                    try:
+                        item = await anext(items_gen)
+                    except StopAsyncIteration:
+                        break
+                    finally:
+                        _listing.reset(token)
+                count += 1
+                yield item
+    finally:
+        current_span.set_attribute("enapter.items", count)
+        current_span.set_attribute("enapter.pages", listing.pages)
+        current_span.end()
+
+
+def count_page() -> None:
+    """Count an upstream request towards the listing being read, if any."""
+    listing = _listing.get()
+    if listing is not None:
+        listing.pages += 1
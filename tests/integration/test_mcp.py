@@ -59,7 +59,7 @@ class TestServer:
         # 1. Verify the exact hard-coded count of tools. With the default
         #    (disabled) config the destructive `execute_command` tool is NOT
         #    registered.
-        assert len(tools_result) == 7
+        assert len(tools_result) == 8
 
         # 2. Assert on each tool's schema individually
         tool_names: list[str] = [
@@ -70,6 +70,7 @@ class TestServer:
             "get_historical_telemetry",
             "search_rules",
             "read_rule",
+            "batch",
         ]
         for name in tool_names:
             tool: Any | None = next((t for t in tools_result if t.name == name), None)
@@ -103,15 +104,15 @@ class TestServerWithCommandExecution:
                 async with mcp.Client(url=f"http://{config.address}/mcp") as client:
                     yield client
 
-    async def test_registers_eight_tools_including_execute_command(
+    async def test_registers_nine_tools_including_execute_command(
         self, mcp_client: mcp.Client
     ) -> None:
         tools_result: list[Any] = await mcp_client.list_tools()
 
-        assert len(tools_result) == 8
+        assert len(tools_result) == 9
         assert any(t.name == "execute_command" for t in tools_result)
 
-        # The existing seven tools stay read-only.
+        # The existing eight tools stay read-only.
         for tool in tools_result:
             if tool.name == "execute_command":
                 continue
@@ -195,10 +196,10 @@ class TestServerWithRuleEditing:
                 async with mcp.Client(url=f"http://{config.address}/mcp") as client:
                     yield client
 
-    async def test_registers_twelve_tools(self, mcp_client: mcp.Client) -> None:
+    async def test_registers_thirteen_tools(self, mcp_client: mcp.Client) -> None:
         tools_result: list[Any] = await mcp_client.list_tools()
 
-        assert len(tools_result) == 12
+        assert len(tools_result) == 13
         assert any(t.name == "execute_command" for t in tools_result)
         assert any(t.name == "create_rule" for t in tools_result)
         assert any(t.name == "edit_rule" for t in tools_result)
@@ -369,10 +370,10 @@ class TestServerWithRuleEditingOnly:
                 async with mcp.Client(url=f"http://{config.address}/mcp") as client:
                     yield client
 
-    async def test_registers_eleven_tools(self, mcp_client: mcp.Client) -> None:
+    async def test_registers_twelve_tools(self, mcp_client: mcp.Client) -> None:
         tools_result: list[Any] = await mcp_client.list_tools()
 
-        assert len(tools_result) == 11
+        assert len(tools_result) == 12
         assert any(t.name == "create_rule" for t in tools_result)
         assert any(t.name == "edit_rule" for t in tools_result)
         assert any(t.name == "delete_rule" for t in tools_result)
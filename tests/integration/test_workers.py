@@ -0,0 +1,108 @@
+import asyncio
+import os
+import pathlib
+import signal
+import socket
+import sys
+import time
+
+import pytest
+
+from enapter_mcp_server import mcp
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[2]
+FAKE_API_URL = "fake://?state=tests.fake._sample_state"
+MAX_WORKERS = min(os.cpu_count() or 1, 4)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+        return port
+
+
+async def start_server(port: int, workers: int) -> asyncio.subprocess.Process:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([str(REPO_ROOT / "src"), str(REPO_ROOT)])
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "enapter_mcp_server",
+        "--address",
+        f"127.0.0.1:{port}",
+        "serve",
+        "--workers",
+        str(workers),
+        "--enapter-http-api-url",
+        FAKE_API_URL,
+        env=env,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            async with mcp.Client(url=f"http://127.0.0.1:{port}/mcp") as client:
+                await client.ping()
+            return process
+        except Exception:
+            if time.monotonic() > deadline:
+                process.kill()
+                raise
+            await asyncio.sleep(0.5)
+
+
+async def stop_server(process: asyncio.subprocess.Process) -> int:
+    process.send_signal(signal.SIGTERM)
+    return await asyncio.wait_for(process.wait(), timeout=30)
+
+
+async def measure_throughput(
+    port: int, duration: float = 5.0, concurrency: int = 16
+) -> float:
+    calls = 0
+    deadline = time.monotonic() + duration
+
+    async def run_client() -> None:
+        nonlocal calls
+        async with mcp.Client(url=f"http://127.0.0.1:{port}/mcp") as client:
+            while time.monotonic() < deadline:
+                await client.call_tool("search_sites")
+                calls += 1
+
+    async with asyncio.TaskGroup() as tg:
+        for _ in range(concurrency):
+            tg.create_task(run_client())
+    return calls / duration
+
+
+class TestWorkers:
+    async def test_workers_shut_down_together(self) -> None:
+        port = free_port()
+        process = await start_server(port, workers=2)
+
+        assert await stop_server(process) == 0
+        with pytest.raises(OSError):
+            await asyncio.open_connection("127.0.0.1", port)
+
+    @pytest.mark.skipif(MAX_WORKERS < 2, reason="needs at least two cores")
+    async def test_throughput_scales_with_workers(self) -> None:
+        port = free_port()
+        process = await start_server(port, workers=1)
+        try:
+            single = await measure_throughput(port)
+        finally:
+            await stop_server(process)
+
+        port = free_port()
+        process = await start_server(port, workers=MAX_WORKERS)
+        try:
+            multiple = await measure_throughput(port)
+        finally:
+            await stop_server(process)
+
+        assert multiple > single * (1 + 0.5 * (MAX_WORKERS - 1)), (
+            f"1 worker: {single:.0f} calls/s,"
+            f" {MAX_WORKERS} workers: {multiple:.0f} calls/s"
+        )
@@ -1,14 +1,16 @@
+import argparse
+import importlib.util
+import unittest.mock
+
 import pytest
 
-from enapter_mcp_server import fake, http
+from enapter_mcp_server import core, fake, http, mcp, metrics
 from enapter_mcp_server.cli import serve_command
 
 
 class TestMakeEnapterAPI:
     def test_fake_url_creates_fake_adapter(self) -> None:
-        api = serve_command._make_enapter_api(
-            "fake://?state=tests.unit.fake._sample_state"
-        )
+        api = serve_command._make_enapter_api("fake://?state=tests.fake._sample_state")
         assert isinstance(api, fake.EnapterAPI)
 
     def test_filetree_url_raises(self) -> None:
@@ -19,6 +21,20 @@ class TestMakeEnapterAPI:
         api = serve_command._make_enapter_api("https://api.enapter.com")
         assert isinstance(api, http.EnapterAPI)
 
+    def test_http_url_passes_transport_config(self) -> None:
+        config = http.TransportConfig(max_connections=7, prewarm_connections=2)
+        api = serve_command._make_enapter_api("http://localhost:8080", config)
+        assert isinstance(api, http.EnapterAPI)
+        assert api._transport_config == config
+
+    def test_http_url_passes_user_rate_limiter(self) -> None:
+        limiter = http.UserRateLimiter(rate=1.0)
+        api = serve_command._make_enapter_api(
+            "http://localhost:8080", user_rate_limiter=limiter
+        )
+        assert isinstance(api, http.EnapterAPI)
+        assert api.user_rate_limiter is limiter
+
     def test_http_url_creates_http_adapter(self) -> None:
         api = serve_command._make_enapter_api("http://localhost:8080")
         assert isinstance(api, http.EnapterAPI)
@@ -30,3 +46,96 @@ class TestMakeEnapterAPI:
     def test_empty_url_raises(self) -> None:
         with pytest.raises(ValueError, match="Unsupported URL scheme"):
             serve_command._make_enapter_api("")
+
+
+class TestCheckHTTP2Support:
+    def test_http2_without_h2_is_rejected(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+        args = argparse.Namespace(enapter_http_api_http2="1")
+        with pytest.raises(ValueError, match="h2 package"):
+            serve_command._check_http2_support(args)
+
+    def test_http1_needs_no_h2(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+        args = argparse.Namespace(enapter_http_api_http2="0")
+        serve_command._check_http2_support(args)
+
+
+class TestCheckSharedJWTStore:
+    @pytest.mark.parametrize("url", ["memory://", ""])
+    def test_process_local_store_is_rejected(self, url: str) -> None:
+        args = argparse.Namespace(
+            oauth_proxy_enabled="1", oauth_proxy_jwt_store_url=url
+        )
+        with pytest.raises(ValueError, match="shared between processes"):
+            serve_command._check_shared_jwt_store(args)
+
+    @pytest.mark.parametrize(
+        "enabled,url", [("1", "sqlite:///tmp/jwt.db"), ("0", "memory://")]
+    )
+    def test_shared_store_or_disabled_proxy_is_accepted(
+        self, enabled: str, url: str
+    ) -> None:
+        args = argparse.Namespace(
+            oauth_proxy_enabled=enabled, oauth_proxy_jwt_store_url=url
+        )
+        serve_command._check_shared_jwt_store(args)
+
+
+class TestUserRateLimiterMetrics:
+    async def test_consumption_is_exported_per_user(self) -> None:
+        limiter = http.UserRateLimiter(rate=0.1, burst=1, max_wait=0.0)
+        registry = metrics.Registry()
+        serve_command._register_user_rate_limiter_metrics(registry, limiter)
+
+        await limiter.acquire(core.AuthConfig(user="alice"))
+        with pytest.raises(core.RateLimitExceeded):
+            await limiter.acquire(core.AuthConfig(user="alice"))
+
+        text = registry.render()
+        assert (
+            'enapter_mcp_upstream_user_calls{identity="alice",outcome="admitted"} 1.0'
+            in text
+        )
+        assert (
+            'enapter_mcp_upstream_user_calls{identity="alice",outcome="rejected"} 1.0'
+            in text
+        )
+        assert 'enapter_mcp_upstream_user_wait_seconds{identity="alice"} 0.0' in text
+
+
+class TestCacheMetrics:
+    async def test_cache_stats_are_exported_per_cache(self) -> None:
+        app = core.ApplicationServer(unittest.mock.Mock(spec=core.EnapterAPI))
+        registry = metrics.Registry()
+        serve_command._register_cache_metrics(registry, app)
+
+        cache = app.caches["manifest"]
+        cache.lookup("bp-1")
+        cache.put("bp-1", unittest.mock.sentinel.manifest)
+        cache.lookup("bp-1")
+
+        text = registry.render()
+        assert 'enapter_mcp_cache_lookups{cache="manifest",result="hit"} 1.0' in text
+        assert 'enapter_mcp_cache_lookups{cache="manifest",result="miss"} 1.0' in text
+        assert 'enapter_mcp_cache_entries{cache="manifest"} 1.0' in text
+        assert 'enapter_mcp_cache_evictions{cache="site_status"} 0.0' in text
+
+
+class TestAdmissionDefaults:
+    def test_cli_defaults_match_server_config(self) -> None:
+        parser = argparse.ArgumentParser()
+        serve_command.ServeCommand.register(parser.add_subparsers())
+        args = parser.parse_args(["serve"])
+        config = mcp.ServerConfig(host="", port=0, enapter_http_api_url="")
+
+        assert (args.max_concurrent_tool_calls or None) == (
+            config.max_concurrent_tool_calls
+        )
+        assert (args.max_concurrent_tool_calls_per_user or None) == (
+            config.max_concurrent_tool_calls_per_user
+        )
+        assert args.tool_call_queue_size == config.tool_call_queue_size
+        assert args.tool_call_queue_timeout == config.tool_call_queue_timeout
@@ -0,0 +1,27 @@
+import json
+import pathlib
+
+import opentelemetry.sdk.trace
+import opentelemetry.sdk.trace.export
+
+from enapter_mcp_server.cli import tracing
+
+
+class TestFileSpanExporter:
+    def test_spans_are_written_as_json_lines_until_shutdown(
+        self, tmp_path: pathlib.Path
+    ) -> None:
+        path = tmp_path / "spans.jsonl"
+        exporter = tracing._make_span_exporter(f"file://{path}")
+        provider = opentelemetry.sdk.trace.TracerProvider(shutdown_on_exit=False)
+        provider.add_span_processor(
+            opentelemetry.sdk.trace.export.BatchSpanProcessor(exporter)
+        )
+
+        with provider.get_tracer("test").start_as_current_span("first"):
+            pass
+        provider.shutdown()
+
+        (line,) = path.read_text().splitlines()
+        assert json.loads(line)["name"] == "first"
+        assert exporter._file.closed  # type: ignore[attr-defined]
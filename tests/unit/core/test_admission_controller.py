@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from enapter_mcp_server import core
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestAdmissionController:
+    async def test_calls_beyond_limit_wait_in_queue(self) -> None:
+        clock = FakeClock()
+        controller = core.AdmissionController(
+            max_in_flight=1, max_queued=1, clock=clock
+        )
+        assert await controller.acquire("alice") == 0.0
+
+        waiter = asyncio.create_task(controller.acquire("bob"))
+        await asyncio.sleep(0)
+        assert controller.queue_depth == 1
+
+        clock.now += 0.3
+        controller.release("alice")
+        assert await waiter == pytest.approx(0.3)
+        assert controller.in_flight == 1
+        assert controller.queue_depth == 0
+
+    async def test_full_queue_rejects_at_once(self) -> None:
+        controller = core.AdmissionController(
+            max_in_flight=1, max_queued=0, retry_after=2.0
+        )
+        await controller.acquire("alice")
+
+        with pytest.raises(core.ServerOverloaded, match="retry in 2s") as e:
+            await controller.acquire("bob")
+        assert e.value.reason == "queue_full"
+
+    async def test_call_waiting_too_long_is_rejected(self) -> None:
+        controller = core.AdmissionController(
+            max_in_flight=1, max_queued=1, max_wait=0.01
+        )
+        await controller.acquire("alice")
+
+        with pytest.raises(core.ServerOverloaded) as e:
+            await controller.acquire("bob")
+        assert e.value.reason == "queue_timeout"
+        assert controller.queue_depth == 0
+
+    async def test_identity_at_its_limit_does_not_block_others(self) -> None:
+        controller = core.AdmissionController(
+            max_in_flight=3, max_in_flight_per_identity=1, max_queued=2
+        )
+        await controller.acquire("alice")
+        await controller.acquire("bob")
+        queued = asyncio.create_task(controller.acquire("alice"))
+        await asyncio.sleep(0)
+
+        controller.release("bob")
+        assert await controller.acquire("carol") == 0.0
+        assert controller.queue_depth == 1
+
+        controller.release("alice")
+        await queued
+        assert controller.in_flight == 2
+
+    async def test_cancelled_waiter_leaves_queue(self) -> None:
+        controller = core.AdmissionController(max_in_flight=1, max_queued=1)
+        await controller.acquire("alice")
+        waiter = asyncio.create_task(controller.acquire("bob"))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        controller.release("alice")
+
+        assert controller.in_flight == 0
+        assert controller.queue_depth == 0
@@ -1,3 +1,5 @@
+import asyncio
+import dataclasses
 import datetime
 from typing import Any, AsyncGenerator
 
@@ -77,6 +79,10 @@ class MockEnapterAPI:
         self._delete_rule_raises = delete_rule_raises
         self.latest_telemetry_batch_calls = 0
         self.get_rule_engine_calls = 0
+        self.list_devices_calls: list[str | None] = []
+        self.get_device_calls: list[str] = []
+        self.manifest_expansions = 0
+        self.list_command_executions_bounds: list[datetime.datetime | None] = []
         self.execute_command_calls: list[dict[str, Any]] = []
         self.create_rule_calls: list[dict[str, Any]] = []
         self.update_rule_script_calls: list[dict[str, Any]] = []
@@ -128,10 +134,11 @@ class MockEnapterAPI:
         expand_connectivity: bool = False,
         expand_active_alerts: bool = False,
     ) -> AsyncGenerator[domain.Device, None]:
+        self.list_devices_calls.append(site_id)
         for d in self._devices:
             if site_id is not None and d.site_id != site_id:
                 continue
-            yield d
+            yield self._expand(d, expand_manifest)
 
     @enapter.async_.generator
     async def list_command_executions(
@@ -143,6 +150,7 @@ class MockEnapterAPI:
         created_at_lt: datetime.datetime | None = None,
         state: domain.CommandExecutionState | None = None,
     ) -> AsyncGenerator[domain.CommandExecution, None]:
+        self.list_command_executions_bounds.append(created_at_lt)
         all_executions = []
         for executions in self._command_executions.values():
             for execution in executions:
@@ -175,10 +183,18 @@ class MockEnapterAPI:
         expand_properties: bool = False,
         expand_active_alerts: bool = False,
     ) -> domain.Device:
+        self.get_device_calls.append(device_id)
         for device in self._devices:
             if device.id == device_id:
-                return device
-        raise ValueError(f"Device {device_id} not found")
+                return self._expand(device, expand_manifest)
+        raise core.DeviceNotFound(device_id)
+
+    def _expand(self, device: domain.Device, expand_manifest: bool) -> domain.Device:
+        if not expand_manifest:
+            return dataclasses.replace(device, manifest=None)
+        if device.manifest is not None:
+            self.manifest_expansions += 1
+        return device
 
     async def execute_command(
         self,
@@ -281,6 +297,61 @@ class MockEnapterAPI:
         return None
 
 
+class HangingEnapterAPI(MockEnapterAPI):
+    """Mock API whose calls for some sites never complete."""
+
+    def __init__(
+        self,
+        hanging_site_ids: set[str],
+        hanging_site_listing: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self._hanging_site_ids = hanging_site_ids
+        self._hanging_site_listing = hanging_site_listing
+        self.cancelled_calls = 0
+
+    @enapter.async_.generator
+    async def list_sites(
+        self, auth: core.AuthConfig
+    ) -> AsyncGenerator[domain.Site, None]:
+        for site in self._sites:
+            if self._hanging_site_listing and site.id in self._hanging_site_ids:
+                await self._hang()
+            yield site
+
+    async def get_rule_engine(
+        self, auth: core.AuthConfig, site_id: str
+    ) -> domain.RuleEngine:
+        if site_id in self._hanging_site_ids:
+            await self._hang()
+        return await super().get_rule_engine(auth, site_id)
+
+    @enapter.async_.generator
+    async def list_devices(
+        self,
+        auth: core.AuthConfig,
+        site_id: str | None = None,
+        expand_manifest: bool = False,
+        expand_properties: bool = False,
+        expand_connectivity: bool = False,
+        expand_active_alerts: bool = False,
+    ) -> AsyncGenerator[domain.Device, None]:
+        for device in self._devices:
+            if site_id is not None and device.site_id != site_id:
+                continue
+            if device.site_id in self._hanging_site_ids:
+                await self._hang()
+            yield self._expand(device, expand_manifest)
+
+    async def _hang(self) -> None:
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.cancelled_calls += 1
+            raise
+
+
 class TestApplicationServer:
 
     async def test_search_sites_filtering(self) -> None:
@@ -364,12 +435,14 @@ class TestApplicationServer:
         auth = core.AuthConfig(token="test")
 
         # Test name filtering
-        result = await app.search_sites(
-            auth,
-            query=core.SiteSearchQuery(name_regexp="Alpha", timezone_regexp=".*"),
-            offset=0,
-            limit=20,
-        )
+        result = (
+            await app.search_sites(
+                auth,
+                query=core.SiteSearchQuery(name_regexp="Alpha", timezone_regexp=".*"),
+                offset=0,
+                limit=20,
+            )
+        ).items
         assert len(result) == 1
         assert result[0].name == "Alpha"
         assert result[0].authorized_role == domain.AccessRole.OWNER
@@ -381,14 +454,16 @@ class TestApplicationServer:
         assert result[0].status.rule_engine_state == domain.RuleEngineState.ACTIVE
 
         # Test site ID filtering
-        result = await app.search_sites(
-            auth,
-            query=core.SiteSearchQuery(
-                site_id="2", name_regexp=".*", timezone_regexp=".*"
-            ),
-            offset=0,
-            limit=20,
-        )
+        result = (
+            await app.search_sites(
+                auth,
+                query=core.SiteSearchQuery(
+                    site_id="2", name_regexp=".*", timezone_regexp=".*"
+                ),
+                offset=0,
+                limit=20,
+            )
+        ).items
         assert len(result) == 1
         assert result[0].id == "2"
         assert result[0].authorized_role == domain.AccessRole.USER
@@ -396,12 +471,14 @@ class TestApplicationServer:
         assert result[0].status.rule_engine_state is None
 
         # Test timezone filtering
-        result = await app.search_sites(
-            auth,
-            query=core.SiteSearchQuery(name_regexp=".*", timezone_regexp="Berlin"),
-            offset=0,
-            limit=20,
-        )
+        result = (
+            await app.search_sites(
+                auth,
+                query=core.SiteSearchQuery(name_regexp=".*", timezone_regexp="Berlin"),
+                offset=0,
+                limit=20,
+            )
+        ).items
         assert len(result) == 2
         assert result[0].name == "Alpha"
         assert result[0].status is not None
@@ -411,12 +488,14 @@ class TestApplicationServer:
         assert result[1].status.rule_engine_state is None
 
         # Test sorting and pagination
-        result = await app.search_sites(
-            auth,
-            query=core.SiteSearchQuery(name_regexp=".*", timezone_regexp=".*"),
-            offset=0,
-            limit=1,
-        )
+        result = (
+            await app.search_sites(
+                auth,
+                query=core.SiteSearchQuery(name_regexp=".*", timezone_regexp=".*"),
+                offset=0,
+                limit=1,
+            )
+        ).items
         assert len(result) == 1
         assert result[0].id == "1"
         assert result[0].status is not None
@@ -465,12 +544,14 @@ class TestApplicationServer:
         app = core.ApplicationServer(api)
         auth = core.AuthConfig(token="test")
 
-        result = await app.search_sites(
-            auth,
-            query=core.SiteSearchQuery(name_regexp=".*", timezone_regexp=".*"),
-            offset=0,
-            limit=20,
-        )
+        result = (
+            await app.search_sites(
+                auth,
+                query=core.SiteSearchQuery(name_regexp=".*", timezone_regexp=".*"),
+                offset=0,
+                limit=20,
+            )
+        ).items
 
         assert len(result) == 1
         assert result[0].id == "site-1"
@@ -513,12 +594,14 @@ class TestApplicationServer:
         app = core.ApplicationServer(api)
         auth = core.AuthConfig(token="test")
 
-        result = await app.search_sites(
-            auth,
-            query=core.SiteSearchQuery(name_regexp=".*", timezone_regexp=".*"),
-            offset=0,
-            limit=20,
-        )
+        result = (
+            await app.search_sites(
+                auth,
+                query=core.SiteSearchQuery(name_regexp=".*", timezone_regexp=".*"),
+                offset=0,
+                limit=20,
+            )
+        ).items
 
         assert len(result) == 1
         assert result[0].id == "site-1"
@@ -527,6 +610,368 @@ class TestApplicationServer:
         assert result[0].status.rule_engine_state is None
         assert api.get_rule_engine_calls == 0
 
+    async def test_search_sites_computes_status_only_for_page(self) -> None:
+        sites = [
+            domain.Site(
+                id=f"site-{i}",
+                name=f"Site {i}",
+                timezone="UTC",
+                authorized_role=domain.AccessRole.OWNER,
+            )
+            for i in reversed(range(5))
+        ]
+        devices = [
+            make_device(
+                blueprint_id="bp-1",
+                id=f"gw-{i}",
+                name="Gateway",
+                site_id=f"site-{i}",
+                type=domain.DeviceType.GATEWAY,
+                authorized_role=domain.AccessRole.OWNER,
+                connectivity=domain.ConnectivityStatus.ONLINE,
+            )
+            for i in range(5)
+        ]
+        api = MockEnapterAPI(
+            sites=sites,
+            devices=devices,
+            rule_engine_states={
+                f"site-{i}": domain.RuleEngine(
+                    id=f"eng-{i}", state=domain.RuleEngineState.ACTIVE, timezone="UTC"
+                )
+                for i in range(5)
+            },
+        )
+        app = core.ApplicationServer(api)
+        auth = core.AuthConfig(token="test")
+
+        result = (
+            await app.search_sites(
+                auth,
+                query=core.SiteSearchQuery(name_regexp=".*", timezone_regexp=".*"),
+                offset=1,
+                limit=2,
+            )
+        ).items
+
+        assert [s.id for s in result] == ["site-1", "site-2"]
+        assert all(s.status is not None for s in result)
+        assert api.list_devices_calls.count("site-1") == 1
+        assert api.list_devices_calls.count("site-2") == 1
+        assert len(api.list_devices_calls) == 2
+        assert api.get_rule_engine_calls == 2
+
+    async def test_search_sites_bulk_status_uses_single_device_listing(
+        self,
+    ) -> None:
+        sites = [
+            domain.Site(
+                id=f"site-{i}",
+                name=f"Site {i}",
+                timezone="UTC",
+                authorized_role=domain.AccessRole.OWNER,
+            )
+            for i in range(3)
+        ]
+        devices = [
+            make_device(
+                blueprint_id="bp-1",
+                id="gw-0",
+                name="Gateway 0",
+                site_id="site-0",
+                type=domain.DeviceType.GATEWAY,
+                authorized_role=domain.AccessRole.OWNER,
+                connectivity=domain.ConnectivityStatus.ONLINE,
+            ),
+            make_device(
+                blueprint_id="bp-2",
+                id="dev-0",
+                name="Device 0",
+                site_id="site-0",
+                type=domain.DeviceType.NATIVE,
+                authorized_role=domain.AccessRole.OWNER,
+                connectivity=domain.ConnectivityStatus.OFFLINE,
+            ),
+            make_device(
+                blueprint_id="bp-1",
+                id="gw-1",
+                name="Gateway 1",
+                site_id="site-1",
+                type=domain.DeviceType.GATEWAY,
+                authorized_role=domain.AccessRole.OWNER,
+                connectivity=domain.ConnectivityStatus.OFFLINE,
+            ),
+            make_device(
+                blueprint_id="bp-2",
+                id="dev-9",
+                name="Device 9",
+                site_id="site-9",
+                type=domain.DeviceType.NATIVE,
+                authorized_role=domain.AccessRole.OWNER,
+                connectivity=domain.ConnectivityStatus.ONLINE,
+            ),
+        ]
+        rule_engine_states = {
+            "site-0": domain.RuleEngine(
+                id="eng-0", state=domain.RuleEngineState.ACTIVE, timezone="UTC"
+            ),
+        }
+        query = core.SiteSearchQuery(name_regexp=".*", timezone_regexp=".*")
+        auth = core.AuthConfig(token="test")
+
+        per_site_api = MockEnapterAPI(
+            sites=sites, devices=devices, rule_engine_states=rule_engine_states
+        )
+        per_site = (
+            await core.ApplicationServer(
+                per_site_api, site_status_bulk_share=float("inf")
+            ).search_sites(auth, query=query, offset=0, limit=20)
+        ).items
+
+        bulk_api = MockEnapterAPI(
+            sites=sites, devices=devices, rule_engine_states=rule_engine_states
+        )
+        bulk = (
+            await core.ApplicationServer(bulk_api).search_sites(
+                auth, query=query, offset=0, limit=20
+            )
+        ).items
+
+        assert bulk == per_site
+        assert bulk_api.list_devices_calls == [None]
+        assert bulk_api.get_rule_engine_calls == 1
+        assert bulk[0].status == domain.SiteStatus(
+            gateway_id="gw-0",
+            gateway_online=True,
+            devices_total=2,
+            devices_online=1,
+            rule_engine_state=domain.RuleEngineState.ACTIVE,
+        )
+        assert bulk[2].status == domain.SiteStatus(
+            gateway_id=None,
+            gateway_online=False,
+            devices_total=0,
+            devices_online=0,
+        )
+
+    async def test_search_sites_shares_bulk_status_with_concurrent_searches(
+        self,
+    ) -> None:
+        sites = [
+            domain.Site(
+                id=f"site-{i}",
+                name=f"Site {i}",
+                timezone="UTC",
+                authorized_role=domain.AccessRole.OWNER,
+            )
+            for i in range(3)
+        ]
+        api = MockEnapterAPI(sites=sites, devices=[])
+        app = core.ApplicationServer(api)
+        auth = core.AuthConfig(token="test")
+        query = core.SiteSearchQuery(name_regexp=".*", timezone_regexp=".*")
+
+        pages = await asyncio.gather(
+            app.search_sites(auth, query=query, offset=0, limit=20),
+            app.search_sites(auth, query=query, offset=0, limit=20),
+        )
+
+        assert pages[0].items == pages[1].items
+        assert all(s.status is not None for s in pages[0].items)
+        assert api.list_devices_calls == [None]
+
+    async def test_search_sites_caches_site_status_per_auth(self) -> None:
+        site = domain.Site(
+            id="site-1",
+            name="Site 1",
+            timezone="UTC",
+            authorized_role=domain.AccessRole.OWNER,
+        )
+        gateway = make_device(
+            blueprint_id="bp-1",
+            id="gw-1",
+            name="Gateway",
+            site_id="site-1",
+            type=domain.DeviceType.GATEWAY,
+            authorized_role=domain.AccessRole.OWNER,
+            connectivity=domain.ConnectivityStatus.ONLINE,
+        )
+        api = MockEnapterAPI(
+            sites=[site],
+            devices=[gateway],
+            rule_engine_states={
+                "site-1": domain.RuleEngine(
+                    id="eng-1", state=domain.RuleEngineState.ACTIVE, timezone="UTC"
+                )
+            },
+        )
+        cache: core.TTLCache[tuple[core.AuthConfig, str], domain.SiteStatus] = (
+            core.TTLCache(ttl=60.0)
+        )
+        app = core.ApplicationServer(api, site_status_cache=cache)
+        query = core.SiteSearchQuery(name_regexp=".*", timezone_regexp=".*")
+
+        first = (
+            await app.search_sites(
+                core.AuthConfig(token="alice"), query=query, offset=0, limit=20
+            )
+        ).items
+        second = (
+            await app.search_sites(
+                core.AuthConfig(token="alice"), query=query, offset=0, limit=20
+            )
+        ).items
+        await app.search_sites(
+            core.AuthConfig(token="bob"), query=query, offset=0, limit=20
+        )
+
+        assert first == second
+        assert api.list_devices_calls == ["site-1", "site-1"]
+        assert api.get_rule_engine_calls == 2
+        assert cache.stats == core.CacheStats(hits=1, misses=2)
+
+    async def test_search_sites_returns_sites_enriched_before_deadline(
+        self,
+    ) -> None:
+        sites = [
+            domain.Site(
+                id=f"site-{i}",
+                name=f"Site {i}",
+                timezone="UTC",
+                authorized_role=domain.AccessRole.OWNER,
+            )
+            for i in range(2)
+        ]
+        gateways = [
+            make_device(
+                blueprint_id="bp-1",
+                id=f"gw-{i}",
+                name="Gateway",
+                site_id=f"site-{i}",
+                type=domain.DeviceType.GATEWAY,
+                authorized_role=domain.AccessRole.OWNER,
+                connectivity=domain.ConnectivityStatus.ONLINE,
+            )
+            for i in range(2)
+        ]
+        api = HangingEnapterAPI(
+            hanging_site_ids={"site-1"},
+            sites=sites,
+            devices=gateways,
+            rule_engine_states={
+                "site-0": domain.RuleEngine(
+                    id="eng-0", state=domain.RuleEngineState.ACTIVE, timezone="UTC"
+                )
+            },
+        )
+        app = core.ApplicationServer(api, site_status_bulk_share=float("inf"))
+
+        with core.deadline(0.05):
+            page = await app.search_sites(
+                core.AuthConfig(token="test"),
+                query=core.SiteSearchQuery(name_regexp=".*", timezone_regexp=".*"),
+                offset=0,
+                limit=20,
+            )
+
+        assert [site.id for site in page.items] == ["site-0", "site-1"]
+        assert page.items[0].status is not None
+        assert page.items[1].status is None
+        assert page.truncated
+        assert api.cancelled_calls == 1
+
+    async def test_search_sites_pages_through_sites_missing_status(
+        self,
+    ) -> None:
+        sites = [
+            domain.Site(
+                id=f"site-{i}",
+                name=f"Site {i}",
+                timezone="UTC",
+                authorized_role=domain.AccessRole.OWNER,
+            )
+            for i in range(4)
+        ]
+        gateways = [
+            make_device(
+                blueprint_id="bp-1",
+                id=f"gw-{i}",
+                name="Gateway",
+                site_id=f"site-{i}",
+                type=domain.DeviceType.GATEWAY,
+                authorized_role=domain.AccessRole.OWNER,
+                connectivity=domain.ConnectivityStatus.OFFLINE,
+            )
+            for i in range(4)
+        ]
+        api = HangingEnapterAPI(
+            hanging_site_ids={"site-1"}, sites=sites, devices=gateways
+        )
+        app = core.ApplicationServer(api, site_status_bulk_share=float("inf"))
+        auth = core.AuthConfig(token="test")
+        query = core.SiteSearchQuery(name_regexp=".*", timezone_regexp=".*")
+
+        seen: list[str] = []
+        cursor: str | None = None
+        while True:
+            with core.deadline(0.05):
+                page = await app.search_sites(
+                    auth, query=query, offset=0, limit=2, cursor=cursor
+                )
+            seen.extend(site.id for site in page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert seen == ["site-0", "site-1", "site-2", "site-3"]
+
+    async def test_search_sites_enriches_sites_listed_before_deadline(
+        self,
+    ) -> None:
+        sites = [
+            domain.Site(
+                id=f"site-{i}",
+                name=f"Site {i}",
+                timezone="UTC",
+                authorized_role=domain.AccessRole.OWNER,
+            )
+            for i in range(2)
+        ]
+        gateway = make_device(
+            blueprint_id="bp-1",
+            id="gw-0",
+            name="Gateway",
+            site_id="site-0",
+            type=domain.DeviceType.GATEWAY,
+            authorized_role=domain.AccessRole.OWNER,
+            connectivity=domain.ConnectivityStatus.ONLINE,
+        )
+        api = HangingEnapterAPI(
+            hanging_site_ids={"site-1"},
+            hanging_site_listing=True,
+            sites=sites,
+            devices=[gateway],
+            rule_engine_states={
+                "site-0": domain.RuleEngine(
+                    id="eng-0", state=domain.RuleEngineState.ACTIVE, timezone="UTC"
+                )
+            },
+        )
+        app = core.ApplicationServer(api)
+
+        with core.deadline(0.1):
+            page = await app.search_sites(
+                core.AuthConfig(token="test"),
+                query=core.SiteSearchQuery(name_regexp=".*", timezone_regexp=".*"),
+                offset=0,
+                limit=20,
+            )
+
+        assert [site.id for site in page.items] == ["site-0"]
+        assert page.items[0].status is not None
+        assert page.items[0].status.gateway_id == "gw-0"
+        assert page.truncated
+
     async def test_search_rules(self) -> None:
         gateway = make_device(
             blueprint_id="bp-1",
@@ -566,12 +1011,14 @@ class TestApplicationServer:
         auth = core.AuthConfig(token="test")
 
         # Test listing all
-        result = await app.search_rules(
-            auth,
-            query=core.RuleSearchQuery(site_id="site-1"),
-            offset=0,
-            limit=10,
-        )
+        result = (
+            await app.search_rules(
+                auth,
+                query=core.RuleSearchQuery(site_id="site-1"),
+                offset=0,
+                limit=10,
+            )
+        ).items
         assert len(result) == 2
         assert result[0].id == "rule-1"
         assert result[0].enabled is True
@@ -581,12 +1028,14 @@ class TestApplicationServer:
         assert result[1].script.summary.lines_count == 1
 
         # Test slug filtering
-        result = await app.search_rules(
-            auth,
-            query=core.RuleSearchQuery(site_id="site-1", slug_regexp="alpha"),
-            offset=0,
-            limit=10,
-        )
+        result = (
+            await app.search_rules(
+                auth,
+                query=core.RuleSearchQuery(site_id="site-1", slug_regexp="alpha"),
+                offset=0,
+                limit=10,
+            )
+        ).items
         assert len(result) == 1
         assert result[0].slug == "alpha"
 
@@ -666,6 +1115,121 @@ class TestApplicationServer:
         else:
             raise AssertionError("Expected GatewayUnavailable")
 
+    async def test_rule_tools_cache_gateway_liveness(self) -> None:
+        gateway = make_device(
+            blueprint_id="bp-1",
+            id="gw-1",
+            name="Gateway",
+            site_id="site-1",
+            type=domain.DeviceType.GATEWAY,
+            authorized_role=domain.AccessRole.OWNER,
+            connectivity=domain.ConnectivityStatus.ONLINE,
+        )
+        rule = domain.Rule(
+            id="rule-1",
+            slug="test",
+            disabled=False,
+            state=domain.RuleState.STARTED,
+            script=domain.RuleScript(
+                runtime_version=domain.RuleRuntimeVersion.V3,
+                exec_interval=None,
+                code="line 1\nline 2",
+            ),
+        )
+        api = MockEnapterAPI(devices=[gateway], rules={"site-1": [rule]})
+        app = core.ApplicationServer(api)
+        auth = core.AuthConfig(token="test")
+
+        await app.read_rule(auth, "site-1", "rule-1", offset=0, limit=1)
+        await app.read_rule(auth, "site-1", "rule-1", offset=1, limit=1)
+
+        assert api.list_devices_calls == ["site-1"]
+        assert api.get_device_calls == []
+
+    async def test_rule_writes_recheck_gateway_by_id(self) -> None:
+        gateway = make_device(
+            blueprint_id="bp-1",
+            id="gw-1",
+            name="Gateway",
+            site_id="site-1",
+            type=domain.DeviceType.GATEWAY,
+            authorized_role=domain.AccessRole.OWNER,
+            connectivity=domain.ConnectivityStatus.ONLINE,
+        )
+        api = MockEnapterAPI(devices=[gateway])
+        app = core.ApplicationServer(api)
+        auth = core.AuthConfig(token="test")
+
+        await app.search_rules(
+            auth, query=core.RuleSearchQuery(site_id="site-1"), offset=0, limit=10
+        )
+        with pytest.raises(ValueError):
+            await app.delete_rule(auth, "site-1", "rule-missing")
+
+        assert api.list_devices_calls == ["site-1"]
+        assert api.get_device_calls == ["gw-1"]
+
+    async def test_rule_writes_rescan_site_when_gateway_replaced(self) -> None:
+        old_gateway = make_device(
+            blueprint_id="bp-1",
+            id="gw-old",
+            name="Gateway",
+            site_id="site-1",
+            type=domain.DeviceType.GATEWAY,
+            authorized_role=domain.AccessRole.OWNER,
+            connectivity=domain.ConnectivityStatus.ONLINE,
+        )
+        new_gateway = make_device(
+            blueprint_id="bp-1",
+            id="gw-new",
+            name="Gateway",
+            site_id="site-1",
+            type=domain.DeviceType.GATEWAY,
+            authorized_role=domain.AccessRole.OWNER,
+            connectivity=domain.ConnectivityStatus.OFFLINE,
+        )
+        api = MockEnapterAPI(devices=[old_gateway])
+        app = core.ApplicationServer(api)
+        auth = core.AuthConfig(token="test")
+
+        await app.search_rules(
+            auth, query=core.RuleSearchQuery(site_id="site-1"), offset=0, limit=10
+        )
+        api._devices = [new_gateway]
+
+        with pytest.raises(core.GatewayUnavailable, match="offline"):
+            await app.delete_rule(auth, "site-1", "rule-1")
+
+        assert api.get_device_calls == ["gw-old"]
+        assert api.list_devices_calls == ["site-1", "site-1"]
+
+    async def test_rule_writes_surface_gateway_lookup_errors(self) -> None:
+        gateway = make_device(
+            blueprint_id="bp-1",
+            id="gw-1",
+            name="Gateway",
+            site_id="site-1",
+            type=domain.DeviceType.GATEWAY,
+            authorized_role=domain.AccessRole.OWNER,
+            connectivity=domain.ConnectivityStatus.ONLINE,
+        )
+
+        class FailingGetDeviceAPI(MockEnapterAPI):
+            async def get_device(self, *args: Any, **kwargs: Any) -> domain.Device:
+                raise RuntimeError("upstream failure")
+
+        api = FailingGetDeviceAPI(devices=[gateway])
+        app = core.ApplicationServer(api)
+        auth = core.AuthConfig(token="test")
+
+        await app.search_rules(
+            auth, query=core.RuleSearchQuery(site_id="site-1"), offset=0, limit=10
+        )
+        with pytest.raises(RuntimeError, match="upstream failure"):
+            await app.delete_rule(auth, "site-1", "rule-1")
+
+        assert api.list_devices_calls == ["site-1"]
+
     async def test_search_devices(self) -> None:
         manifest = make_device_manifest(
             description="Desc",
@@ -756,15 +1320,17 @@ class TestApplicationServer:
         auth = core.AuthConfig(token="test")
 
         # Filter by site
-        result = await app.search_devices(
-            auth,
-            query=core.DeviceSearchQuery(
-                device_id=None, site_id="s1", device_type=None, name_regexp=".*"
-            ),
-            offset=0,
-            limit=10,
-            view=domain.DeviceViewType.BASIC,
-        )
+        result = (
+            await app.search_devices(
+                auth,
+                query=core.DeviceSearchQuery(
+                    device_id=None, site_id="s1", device_type=None, name_regexp=".*"
+                ),
+                offset=0,
+                limit=10,
+                view=domain.DeviceViewType.BASIC,
+            )
+        ).items
         assert len(result) == 2
         assert result[0].authorized_role == domain.AccessRole.OWNER
         assert result[0].connectivity == domain.ConnectivityStatus.ONLINE
@@ -772,31 +1338,35 @@ class TestApplicationServer:
         assert result[0].active_alerts_total == 1
 
         # Filter by type
-        result = await app.search_devices(
-            auth,
-            query=core.DeviceSearchQuery(
-                device_id=None,
-                site_id=None,
-                device_type=domain.DeviceType.GATEWAY,
-                name_regexp=".*",
-            ),
-            offset=0,
-            limit=10,
-            view=domain.DeviceViewType.BASIC,
-        )
+        result = (
+            await app.search_devices(
+                auth,
+                query=core.DeviceSearchQuery(
+                    device_id=None,
+                    site_id=None,
+                    device_type=domain.DeviceType.GATEWAY,
+                    name_regexp=".*",
+                ),
+                offset=0,
+                limit=10,
+                view=domain.DeviceViewType.BASIC,
+            )
+        ).items
         assert len(result) == 1
         assert result[0].id == "2"
 
         # Filter by connectivity status
-        result = await app.search_devices(
-            auth,
-            query=core.DeviceSearchQuery(
-                connectivity_status=domain.ConnectivityStatus.OFFLINE
-            ),
-            offset=0,
-            limit=10,
-            view=domain.DeviceViewType.BASIC,
-        )
+        result = (
+            await app.search_devices(
+                auth,
+                query=core.DeviceSearchQuery(
+                    connectivity_status=domain.ConnectivityStatus.OFFLINE
+                ),
+                offset=0,
+                limit=10,
+                view=domain.DeviceViewType.BASIC,
+            )
+        ).items
         assert len(result) == 1
         assert result[0].id == "3"
 
@@ -877,13 +1447,15 @@ class TestApplicationServer:
         api = MockEnapterAPI(devices=devices)
         app = core.ApplicationServer(api)
 
-        result = await app.search_devices(
-            core.AuthConfig(token="test"),
-            query=core.DeviceSearchQuery(site_id="s1", name_regexp=".*"),
-            offset=0,
-            limit=10,
-            view=domain.DeviceViewType.FULL,
-        )
+        result = (
+            await app.search_devices(
+                core.AuthConfig(token="test"),
+                query=core.DeviceSearchQuery(site_id="s1", name_regexp=".*"),
+                offset=0,
+                limit=10,
+                view=domain.DeviceViewType.FULL,
+            )
+        ).items
 
         assert len(result) == 1
         assert result[0].authorized_role == domain.AccessRole.OWNER
@@ -936,116 +1508,381 @@ class TestApplicationServer:
         )
         devices = [
             make_device(
-                blueprint_id="bp-1",
-                id="1",
-                name="Alpha",
+                blueprint_id="bp-1",
+                id="1",
+                name="Alpha",
+                site_id="s1",
+                type=domain.DeviceType.NATIVE,
+                authorized_role=domain.AccessRole.OWNER,
+                connectivity=domain.ConnectivityStatus.ONLINE,
+                properties={"p1": "v1"},
+                active_alerts=[],
+                manifest=manifest,
+            ),
+        ]
+        api = MockEnapterAPI(devices=devices)
+        app = core.ApplicationServer(api)
+
+        result = (
+            await app.search_devices(
+                core.AuthConfig(token="test"),
+                query=core.DeviceSearchQuery(site_id="s1", name_regexp=".*"),
+                offset=0,
+                limit=10,
+                view=domain.DeviceViewType.FULL,
+            )
+        ).items
+
+        assert len(result) == 1
+        assert isinstance(result[0], domain.DeviceViewFull)
+        assert result[0].active_alerts == []
+        assert result[0].active_alerts_total == 0
+
+    async def test_search_devices_full_view_requires_site_or_device_id(self) -> None:
+        api = MockEnapterAPI(devices=[])
+        app = core.ApplicationServer(api)
+
+        try:
+            await app.search_devices(
+                core.AuthConfig(token="test"),
+                query=core.DeviceSearchQuery(name_regexp=".*"),
+                offset=0,
+                limit=10,
+                view=domain.DeviceViewType.FULL,
+            )
+        except core.SearchQueryTooBroad as exc:
+            assert (
+                str(exc)
+                == "Please provide `site_id` or `device_id` to narrow down the search."
+            )
+            pass
+        else:
+            raise AssertionError("Expected SearchQueryTooBroad")
+
+    async def test_search_devices_full_view_allows_device_id_without_site_id(
+        self,
+    ) -> None:
+        manifest = make_device_manifest(
+            description="Desc",
+            vendor="Enapter",
+            properties={
+                "p1": domain.PropertyDeclaration(
+                    name="p1",
+                    display_name="P1",
+                    data_type=domain.DataType.STRING,
+                    access_level=domain.AccessRole.READONLY,
+                    description=None,
+                    enum=None,
+                    unit=None,
+                    implements=[],
+                )
+            },
+            telemetry={},
+            alerts={},
+            commands={},
+        )
+        devices = [
+            make_device(
+                blueprint_id="bp-1",
+                id="1",
+                name="Alpha",
+                site_id="s1",
+                type=domain.DeviceType.NATIVE,
+                authorized_role=domain.AccessRole.OWNER,
+                connectivity=domain.ConnectivityStatus.ONLINE,
+                properties={"p1": "v1"},
+                active_alerts=[],
+                manifest=manifest,
+            ),
+            make_device(
+                blueprint_id="bp-1",
+                id="2",
+                name="Beta",
+                site_id="s2",
+                type=domain.DeviceType.NATIVE,
+                authorized_role=domain.AccessRole.OWNER,
+                connectivity=domain.ConnectivityStatus.ONLINE,
+                properties={"p1": "v2"},
+                active_alerts=[],
+                manifest=manifest,
+            ),
+        ]
+        api = MockEnapterAPI(devices=devices)
+        app = core.ApplicationServer(api)
+
+        result = (
+            await app.search_devices(
+                core.AuthConfig(token="test"),
+                query=core.DeviceSearchQuery(device_id="2", name_regexp=".*"),
+                offset=0,
+                limit=10,
+                view=domain.DeviceViewType.FULL,
+            )
+        ).items
+
+        assert len(result) == 1
+        assert result[0].id == "2"
+
+    async def test_search_devices_by_device_id_uses_get_device(self) -> None:
+        devices = [
+            make_device(
+                blueprint_id="bp-1",
+                id=device_id,
+                name=name,
+                site_id="s1",
+                type=domain.DeviceType.NATIVE,
+                authorized_role=domain.AccessRole.OWNER,
+                connectivity=domain.ConnectivityStatus.ONLINE,
+                active_alerts=[],
+                manifest=make_device_manifest(),
+            )
+            for device_id, name in [("1", "Alpha"), ("2", "Beta")]
+        ]
+        api = MockEnapterAPI(devices=devices)
+        app = core.ApplicationServer(api)
+        auth = core.AuthConfig(token="test")
+
+        found = (
+            await app.search_devices(
+                auth,
+                query=core.DeviceSearchQuery(device_id="2", name_regexp="Beta"),
+                offset=0,
+                limit=10,
+                view=domain.DeviceViewType.BASIC,
+            )
+        ).items
+        filtered_out = (
+            await app.search_devices(
+                auth,
+                query=core.DeviceSearchQuery(device_id="2", name_regexp="Alpha"),
+                offset=0,
+                limit=10,
+                view=domain.DeviceViewType.BASIC,
+            )
+        ).items
+
+        assert [v.id for v in found] == ["2"]
+        assert filtered_out == []
+        assert api.get_device_calls == ["2", "2", "2"]
+        assert api.manifest_expansions == 1
+        assert api.list_devices_calls == []
+
+    async def test_search_devices_by_missing_device_id_finds_nothing(
+        self,
+    ) -> None:
+        api = MockEnapterAPI(devices=[])
+        app = core.ApplicationServer(api)
+
+        result = (
+            await app.search_devices(
+                core.AuthConfig(token="test"),
+                query=core.DeviceSearchQuery(device_id="missing", site_id="s1"),
+                offset=0,
+                limit=10,
+                view=domain.DeviceViewType.BASIC,
+            )
+        ).items
+
+        assert result == []
+        assert api.get_device_calls == ["missing"]
+        assert api.list_devices_calls == []
+
+    async def test_search_devices_by_device_id_propagates_upstream_errors(
+        self,
+    ) -> None:
+        class FailingEnapterAPI(MockEnapterAPI):
+            async def get_device(self, *args: Any, **kwargs: Any) -> domain.Device:
+                raise RuntimeError("upstream failure")
+
+        api = FailingEnapterAPI(devices=[])
+        app = core.ApplicationServer(api)
+
+        with pytest.raises(RuntimeError, match="upstream failure"):
+            await app.search_devices(
+                core.AuthConfig(token="test"),
+                query=core.DeviceSearchQuery(device_id="d1", site_id="s1"),
+                offset=0,
+                limit=10,
+                view=domain.DeviceViewType.BASIC,
+            )
+        assert api.list_devices_calls == []
+
+    async def test_search_devices_pages_through_cursor_with_single_listing(
+        self,
+    ) -> None:
+        devices = [
+            make_device(
+                blueprint_id="bp",
+                id=f"d{i:02}",
+                name=f"Device {i}",
                 site_id="s1",
                 type=domain.DeviceType.NATIVE,
                 authorized_role=domain.AccessRole.OWNER,
                 connectivity=domain.ConnectivityStatus.ONLINE,
-                properties={"p1": "v1"},
                 active_alerts=[],
-                manifest=manifest,
-            ),
+                manifest=make_device_manifest(),
+            )
+            for i in reversed(range(5))
         ]
         api = MockEnapterAPI(devices=devices)
         app = core.ApplicationServer(api)
+        auth = core.AuthConfig(token="test")
+        query = core.DeviceSearchQuery(site_id="s1")
 
-        result = await app.search_devices(
-            core.AuthConfig(token="test"),
-            query=core.DeviceSearchQuery(site_id="s1", name_regexp=".*"),
-            offset=0,
-            limit=10,
-            view=domain.DeviceViewType.FULL,
-        )
+        ids: list[str] = []
+        cursor: str | None = None
+        while True:
+            page = await app.search_devices(
+                auth,
+                query=query,
+                offset=0,
+                limit=2,
+                view=domain.DeviceViewType.BASIC,
+                cursor=cursor,
+            )
+            ids.extend(v.id for v in page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
 
-        assert len(result) == 1
-        assert isinstance(result[0], domain.DeviceViewFull)
-        assert result[0].active_alerts == []
-        assert result[0].active_alerts_total == 0
+        assert ids == ["d00", "d01", "d02", "d03", "d04"]
+        assert api.list_devices_calls == ["s1"]
 
-    async def test_search_devices_full_view_requires_site_or_device_id(self) -> None:
-        api = MockEnapterAPI(devices=[])
-        app = core.ApplicationServer(api)
+    @pytest.mark.parametrize("coalescing", [False, True])
+    async def test_search_devices_returns_devices_listed_before_deadline(
+        self, coalescing: bool
+    ) -> None:
+        devices = [
+            make_device(
+                blueprint_id="bp-1",
+                id=f"dev-{i}",
+                name=f"Device {i}",
+                site_id=site_id,
+                type=domain.DeviceType.NATIVE,
+                authorized_role=domain.AccessRole.OWNER,
+                manifest=make_device_manifest(),
+            )
+            for i, site_id in enumerate(["site-0", "site-1"])
+        ]
+        api = HangingEnapterAPI(hanging_site_ids={"site-1"}, devices=devices)
+        app = core.ApplicationServer(
+            core.CoalescingEnapterAPI(api) if coalescing else api
+        )
 
-        try:
-            await app.search_devices(
+        with core.deadline(0.05):
+            page = await app.search_devices(
                 core.AuthConfig(token="test"),
-                query=core.DeviceSearchQuery(name_regexp=".*"),
+                query=core.DeviceSearchQuery(),
                 offset=0,
-                limit=10,
-                view=domain.DeviceViewType.FULL,
-            )
-        except core.SearchQueryTooBroad as exc:
-            assert (
-                str(exc)
-                == "Please provide `site_id` or `device_id` to narrow down the search."
+                limit=20,
+                view=domain.DeviceViewType.BASIC,
             )
-            pass
-        else:
-            raise AssertionError("Expected SearchQueryTooBroad")
 
-    async def test_search_devices_full_view_allows_device_id_without_site_id(
-        self,
-    ) -> None:
-        manifest = make_device_manifest(
-            description="Desc",
-            vendor="Enapter",
-            properties={
-                "p1": domain.PropertyDeclaration(
-                    name="p1",
-                    display_name="P1",
-                    data_type=domain.DataType.STRING,
-                    access_level=domain.AccessRole.READONLY,
-                    description=None,
-                    enum=None,
-                    unit=None,
-                    implements=[],
-                )
-            },
-            telemetry={},
-            alerts={},
-            commands={},
-        )
+        assert [view.id for view in page.items] == ["dev-0"]
+        assert page.truncated
+        assert page.next_cursor is None
+
+    async def test_manifests_are_cached_by_blueprint_id(self) -> None:
+        manifest = make_device_manifest(description="Inverter", vendor="Enapter")
         devices = [
             make_device(
-                blueprint_id="bp-1",
-                id="1",
-                name="Alpha",
+                blueprint_id="bp-inverter",
+                id=f"inv-{i}",
+                name=f"Inverter {i}",
                 site_id="s1",
                 type=domain.DeviceType.NATIVE,
                 authorized_role=domain.AccessRole.OWNER,
                 connectivity=domain.ConnectivityStatus.ONLINE,
-                properties={"p1": "v1"},
                 active_alerts=[],
                 manifest=manifest,
-            ),
+            )
+            for i in range(3)
+        ]
+        api = MockEnapterAPI(devices=devices)
+        app = core.ApplicationServer(api)
+        auth = core.AuthConfig(token="test")
+        query = core.DeviceSearchQuery(site_id="s1")
+
+        for _ in range(2):
+            views = (
+                await app.search_devices(
+                    auth,
+                    query=query,
+                    offset=0,
+                    limit=10,
+                    view=domain.DeviceViewType.BASIC,
+                )
+            ).items
+            assert [v.blueprint_summary.description for v in views] == ["Inverter"] * 3
+        await app.read_blueprint(
+            auth,
+            device_id="inv-2",
+            section=domain.BlueprintSection.COMMANDS,
+            name_regexp=".*",
+            offset=0,
+            limit=10,
+        )
+
+        assert api.manifest_expansions == 1
+
+    async def test_basic_search_uses_blueprint_summary_index(self) -> None:
+        devices = [
             make_device(
-                blueprint_id="bp-1",
-                id="2",
-                name="Beta",
-                site_id="s2",
+                blueprint_id="bp-inverter",
+                id=f"inv-{i}",
+                name=f"Inverter {i}",
+                site_id="s1",
                 type=domain.DeviceType.NATIVE,
                 authorized_role=domain.AccessRole.OWNER,
                 connectivity=domain.ConnectivityStatus.ONLINE,
-                properties={"p1": "v2"},
                 active_alerts=[],
-                manifest=manifest,
-            ),
+                manifest=make_device_manifest(description="Inverter v1"),
+            )
+            for i in range(2)
         ]
         api = MockEnapterAPI(devices=devices)
-        app = core.ApplicationServer(api)
-
-        result = await app.search_devices(
-            core.AuthConfig(token="test"),
-            query=core.DeviceSearchQuery(device_id="2", name_regexp=".*"),
+        # Manifests expire immediately, only the summary index survives.
+        app = core.ApplicationServer(api, manifest_cache=core.TTLCache(ttl=0.0))
+        auth = core.AuthConfig(token="test")
+        query = core.DeviceSearchQuery(site_id="s1")
+
+        for _ in range(2):
+            views = (
+                await app.search_devices(
+                    auth,
+                    query=query,
+                    offset=0,
+                    limit=10,
+                    view=domain.DeviceViewType.BASIC,
+                )
+            ).items
+            assert [v.blueprint_summary.description for v in views] == [
+                "Inverter v1"
+            ] * 2
+        assert api.manifest_expansions == 1
+
+        api._devices = [
+            dataclasses.replace(
+                d, manifest=make_device_manifest(description="Inverter v2")
+            )
+            for d in devices
+        ]
+        await app.read_blueprint(
+            auth,
+            device_id="inv-0",
+            section=domain.BlueprintSection.COMMANDS,
+            name_regexp=".*",
             offset=0,
             limit=10,
-            view=domain.DeviceViewType.FULL,
         )
+        views = (
+            await app.search_devices(
+                auth, query=query, offset=0, limit=10, view=domain.DeviceViewType.BASIC
+            )
+        ).items
 
-        assert len(result) == 1
-        assert result[0].id == "2"
+        assert [v.blueprint_summary.description for v in views] == ["Inverter v2"] * 2
+        assert api.manifest_expansions == 2
 
     async def test_read_blueprint(self) -> None:
         manifest = make_device_manifest(
@@ -1243,32 +2080,126 @@ class TestApplicationServer:
         auth = core.AuthConfig(token="test")
 
         # Filter by SUCCESS
-        result = await app.search_command_executions(
-            auth,
-            query=core.CommandExecutionSearchQuery(
-                device_id="d1", state=domain.CommandExecutionState.SUCCESS
-            ),
-            offset=0,
-            limit=10,
-            view=domain.CommandExecutionView.BASIC,
-        )
+        result = (
+            await app.search_command_executions(
+                auth,
+                query=core.CommandExecutionSearchQuery(
+                    device_id="d1", state=domain.CommandExecutionState.SUCCESS
+                ),
+                offset=0,
+                limit=10,
+                view=domain.CommandExecutionView.BASIC,
+            )
+        ).items
         assert len(result) == 1
         assert result[0].id == "e1"
         assert result[0].state == domain.CommandExecutionState.SUCCESS
 
         # Filter by ERROR
-        result = await app.search_command_executions(
+        result = (
+            await app.search_command_executions(
+                auth,
+                query=core.CommandExecutionSearchQuery(
+                    device_id="d1", state=domain.CommandExecutionState.ERROR
+                ),
+                offset=0,
+                limit=10,
+                view=domain.CommandExecutionView.BASIC,
+            )
+        ).items
+        assert len(result) == 1
+        assert result[0].id == "e2"
+        assert result[0].state == domain.CommandExecutionState.ERROR
+
+    async def test_search_command_executions_resumes_from_keyset_cursor(
+        self,
+    ) -> None:
+        devices = [
+            make_device(
+                blueprint_id="bp-1",
+                id="d1",
+                name="D1",
+                site_id="s1",
+                type=domain.DeviceType.NATIVE,
+                authorized_role=domain.AccessRole.OWNER,
+            )
+        ]
+        # Two executions share a timestamp across the page boundary.
+        created_at = [
+            datetime.datetime(2023, 1, day, tzinfo=datetime.UTC)
+            for day in (5, 4, 3, 3, 2)
+        ]
+        executions = {
+            "d1": [
+                domain.CommandExecution(
+                    id=f"e{i}",
+                    device_id="d1",
+                    command_name="cmd",
+                    state=domain.CommandExecutionState.SUCCESS,
+                    created_at=ts,
+                )
+                for i, ts in enumerate(created_at)
+            ]
+        }
+        api = MockEnapterAPI(devices=devices, command_executions=executions)
+        app = core.ApplicationServer(api)
+        auth = core.AuthConfig(token="test")
+        query = core.CommandExecutionSearchQuery(device_id="d1")
+
+        ids: list[str] = []
+        cursor: str | None = None
+        while True:
+            page = await app.search_command_executions(
+                auth,
+                query=query,
+                offset=0,
+                limit=3,
+                view=domain.CommandExecutionView.BASIC,
+                cursor=cursor,
+            )
+            ids.extend(e.id for e in page.items)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        assert ids == ["e0", "e1", "e2", "e3", "e4"]
+        assert api.list_command_executions_bounds == [
+            None,
+            created_at[2] + datetime.timedelta(microseconds=1),
+        ]
+
+    async def test_search_command_executions_rejects_foreign_cursor(self) -> None:
+        executions = {
+            "d1": [
+                domain.CommandExecution(
+                    id=f"e{i}",
+                    device_id="d1",
+                    command_name="cmd",
+                    state=domain.CommandExecutionState.SUCCESS,
+                    created_at=datetime.datetime(2023, 1, i + 1),
+                )
+                for i in range(3)
+            ]
+        }
+        app = core.ApplicationServer(MockEnapterAPI(command_executions=executions))
+        auth = core.AuthConfig(token="test")
+
+        page = await app.search_command_executions(
             auth,
-            query=core.CommandExecutionSearchQuery(
-                device_id="d1", state=domain.CommandExecutionState.ERROR
-            ),
+            query=core.CommandExecutionSearchQuery(device_id="d1"),
             offset=0,
-            limit=10,
+            limit=1,
             view=domain.CommandExecutionView.BASIC,
         )
-        assert len(result) == 1
-        assert result[0].id == "e2"
-        assert result[0].state == domain.CommandExecutionState.ERROR
+        with pytest.raises(core.InvalidCursor):
+            await app.search_command_executions(
+                auth,
+                query=core.CommandExecutionSearchQuery(device_id="d2"),
+                offset=0,
+                limit=1,
+                view=domain.CommandExecutionView.BASIC,
+                cursor=page.next_cursor,
+            )
 
     async def test_search_command_executions_basic(self) -> None:
         devices = [
@@ -1333,13 +2264,15 @@ class TestApplicationServer:
         auth = core.AuthConfig(token="test")
 
         # By site
-        result = await app.search_command_executions(
-            auth,
-            query=core.CommandExecutionSearchQuery(site_id="s1"),
-            offset=0,
-            limit=10,
-            view=domain.CommandExecutionView.BASIC,
-        )
+        result = (
+            await app.search_command_executions(
+                auth,
+                query=core.CommandExecutionSearchQuery(site_id="s1"),
+                offset=0,
+                limit=10,
+                view=domain.CommandExecutionView.BASIC,
+            )
+        ).items
         assert len(result) == 2
         assert result[0].id == "e2"  # Sorted by created_at desc
         assert result[0].arguments is None
@@ -1349,24 +2282,28 @@ class TestApplicationServer:
         assert result[1].response_payload is None
 
         # By device and site, filtering
-        result = await app.search_command_executions(
-            auth,
-            query=core.CommandExecutionSearchQuery(site_id="s1", device_id="d1"),
-            offset=0,
-            limit=10,
-            view=domain.CommandExecutionView.BASIC,
-        )
+        result = (
+            await app.search_command_executions(
+                auth,
+                query=core.CommandExecutionSearchQuery(site_id="s1", device_id="d1"),
+                offset=0,
+                limit=10,
+                view=domain.CommandExecutionView.BASIC,
+            )
+        ).items
         assert len(result) == 1
         assert result[0].id == "e1"
 
         # By site and mismatching device
-        result = await app.search_command_executions(
-            auth,
-            query=core.CommandExecutionSearchQuery(site_id="s1", device_id="d3"),
-            offset=0,
-            limit=10,
-            view=domain.CommandExecutionView.BASIC,
-        )
+        result = (
+            await app.search_command_executions(
+                auth,
+                query=core.CommandExecutionSearchQuery(site_id="s1", device_id="d3"),
+                offset=0,
+                limit=10,
+                view=domain.CommandExecutionView.BASIC,
+            )
+        ).items
         assert len(result) == 0
 
     async def test_search_command_executions_full(self) -> None:
@@ -1397,26 +2334,30 @@ class TestApplicationServer:
         app = core.ApplicationServer(api)
         auth = core.AuthConfig(token="test")
 
-        result = await app.search_command_executions(
-            auth,
-            query=core.CommandExecutionSearchQuery(device_id="d1"),
-            offset=0,
-            limit=10,
-            view=domain.CommandExecutionView.FULL,
-        )
+        result = (
+            await app.search_command_executions(
+                auth,
+                query=core.CommandExecutionSearchQuery(device_id="d1"),
+                offset=0,
+                limit=10,
+                view=domain.CommandExecutionView.FULL,
+            )
+        ).items
         assert len(result) == 1
         assert result[0].id == "e1"
         assert result[0].arguments == {"arg1": "val1"}
         assert result[0].response_payload == {"res1": "val1"}
 
         # Validate site_id scoping checks
-        result = await app.search_command_executions(
-            auth,
-            query=core.CommandExecutionSearchQuery(site_id="s2", device_id="d1"),
-            offset=0,
-            limit=10,
-            view=domain.CommandExecutionView.FULL,
-        )
+        result = (
+            await app.search_command_executions(
+                auth,
+                query=core.CommandExecutionSearchQuery(site_id="s2", device_id="d1"),
+                offset=0,
+                limit=10,
+                view=domain.CommandExecutionView.FULL,
+            )
+        ).items
         assert len(result) == 0
 
     async def test_search_command_executions_requires_scope(self) -> None:
@@ -0,0 +1,279 @@
+import asyncio
+import dataclasses
+from typing import Any, AsyncGenerator
+
+import enapter
+import pytest
+
+from enapter_mcp_server import core, domain
+
+SITE = domain.Site(
+    id="site",
+    name="Alpha",
+    timezone="UTC",
+    authorized_role=domain.AccessRole.OWNER,
+)
+
+
+class StreamingEnapterAPI:
+    def __init__(self) -> None:
+        self.next_site = asyncio.Event()
+        self.error: BaseException | None = None
+
+    @enapter.async_.generator
+    async def list_sites(
+        self, auth: core.AuthConfig
+    ) -> AsyncGenerator[domain.Site, None]:
+        for i in range(2):
+            await self.next_site.wait()
+            self.next_site.clear()
+            yield dataclasses.replace(SITE, id=f"site-{i}")
+        if self.error is not None:
+            raise self.error
+
+
+class GatedEnapterAPI:
+    def __init__(self) -> None:
+        self.calls: list[tuple[Any, ...]] = []
+        self.release = asyncio.Event()
+        self.error: BaseException | None = None
+
+    async def get_rule_engine(
+        self, auth: core.AuthConfig, site_id: str
+    ) -> domain.RuleEngine:
+        self.calls.append(("get_rule_engine", auth, site_id))
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return domain.RuleEngine(
+            id=site_id, state=domain.RuleEngineState.ACTIVE, timezone="UTC"
+        )
+
+    @enapter.async_.generator
+    async def list_sites(
+        self, auth: core.AuthConfig
+    ) -> AsyncGenerator[domain.Site, None]:
+        self.calls.append(("list_sites", auth))
+        await self.release.wait()
+        yield SITE
+
+    async def delete_rule(
+        self, auth: core.AuthConfig, rule_id: str, site_id: str
+    ) -> None:
+        self.calls.append(("delete_rule", auth, rule_id, site_id))
+        await self.release.wait()
+
+
+def make_api(upstream: GatedEnapterAPI) -> core.CoalescingEnapterAPI:
+    return core.CoalescingEnapterAPI(upstream)  # type: ignore[arg-type]
+
+
+async def list_sites(
+    api: core.CoalescingEnapterAPI, auth: core.AuthConfig
+) -> list[domain.Site]:
+    async with api.list_sites(auth) as sites:
+        return [site async for site in sites]
+
+
+class TestCoalescingEnapterAPI:
+    async def test_identical_calls_share_one_upstream_call(self) -> None:
+        upstream = GatedEnapterAPI()
+        api = make_api(upstream)
+        auth = core.AuthConfig(token="t")
+
+        tasks = [
+            asyncio.create_task(api.get_rule_engine(auth, "site")) for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+        upstream.release.set()
+
+        engines = await asyncio.gather(*tasks)
+        assert len(upstream.calls) == 1
+        assert all(engine is engines[0] for engine in engines)
+        assert api.in_flight == 0
+
+    async def test_listings_are_replayed_to_every_caller(self) -> None:
+        upstream = GatedEnapterAPI()
+        api = make_api(upstream)
+        auth = core.AuthConfig(token="t")
+
+        tasks = [asyncio.create_task(list_sites(api, auth)) for _ in range(3)]
+        await asyncio.sleep(0)
+        upstream.release.set()
+
+        assert await asyncio.gather(*tasks) == [[SITE]] * 3
+        assert len(upstream.calls) == 1
+
+    async def test_different_arguments_and_identities_are_not_merged(
+        self,
+    ) -> None:
+        upstream = GatedEnapterAPI()
+        api = make_api(upstream)
+        upstream.release.set()
+
+        await asyncio.gather(
+            api.get_rule_engine(core.AuthConfig(token="a"), "site"),
+            api.get_rule_engine(core.AuthConfig(token="b"), "site"),
+            api.get_rule_engine(core.AuthConfig(token="a"), "other"),
+        )
+
+        assert len(upstream.calls) == 3
+
+    async def test_completed_calls_are_not_remembered(self) -> None:
+        upstream = GatedEnapterAPI()
+        api = make_api(upstream)
+        auth = core.AuthConfig(token="t")
+        upstream.release.set()
+
+        await api.get_rule_engine(auth, "site")
+        await api.get_rule_engine(auth, "site")
+
+        assert len(upstream.calls) == 2
+
+    async def test_error_is_fanned_out_to_all_callers(self) -> None:
+        upstream = GatedEnapterAPI()
+        upstream.error = core.RuleEngineNotFound("site")
+        api = make_api(upstream)
+        auth = core.AuthConfig(token="t")
+
+        tasks = [
+            asyncio.create_task(api.get_rule_engine(auth, "site")) for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        upstream.release.set()
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        assert all(isinstance(r, core.RuleEngineNotFound) for r in results)
+        assert len(upstream.calls) == 1
+
+    async def test_cancelled_caller_does_not_cancel_the_others(self) -> None:
+        upstream = GatedEnapterAPI()
+        api = make_api(upstream)
+        auth = core.AuthConfig(token="t")
+
+        first = asyncio.create_task(api.get_rule_engine(auth, "site"))
+        second = asyncio.create_task(api.get_rule_engine(auth, "site"))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        upstream.release.set()
+
+        assert (await second).id == "site"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert len(upstream.calls) == 1
+
+    async def test_call_is_cancelled_when_all_callers_are_gone(self) -> None:
+        upstream = GatedEnapterAPI()
+        api = make_api(upstream)
+        auth = core.AuthConfig(token="t")
+
+        task = asyncio.create_task(api.get_rule_engine(auth, "site"))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0)
+
+        assert api.in_flight == 0
+        upstream.release.set()
+        await api.get_rule_engine(auth, "site")
+        assert len(upstream.calls) == 2
+
+    async def test_caller_arriving_after_cancellation_starts_a_new_call(
+        self,
+    ) -> None:
+        upstream = GatedEnapterAPI()
+        api = make_api(upstream)
+        auth = core.AuthConfig(token="t")
+
+        first = asyncio.create_task(api.get_rule_engine(auth, "site"))
+        await asyncio.sleep(0)
+        first.cancel()
+        # Runs right after the first caller leaves, before the shared call
+        # has completed its cancellation.
+        second = asyncio.create_task(api.get_rule_engine(auth, "site"))
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        upstream.release.set()
+
+        assert (await second).id == "site"
+        assert len(upstream.calls) == 2
+
+    async def test_listing_items_reach_callers_as_they_are_read(self) -> None:
+        upstream = StreamingEnapterAPI()
+        api = core.CoalescingEnapterAPI(upstream)  # type: ignore[arg-type]
+        auth = core.AuthConfig(token="t")
+
+        async with api.list_sites(auth) as first, api.list_sites(auth) as second:
+            upstream.next_site.set()
+            assert (await anext(first)).id == "site-0"
+            assert (await anext(second)).id == "site-0"
+            upstream.next_site.set()
+            assert (await anext(first)).id == "site-1"
+            assert (await anext(second)).id == "site-1"
+        await asyncio.sleep(0)
+        assert api.in_flight == 0
+
+    async def test_listing_error_follows_items_read_before_it(self) -> None:
+        upstream = StreamingEnapterAPI()
+        upstream.error = core.UpstreamUnavailable("down")
+        api = core.CoalescingEnapterAPI(upstream)  # type: ignore[arg-type]
+        auth = core.AuthConfig(token="t")
+        read: list[str] = []
+
+        async def feed() -> None:
+            for _ in range(2):
+                upstream.next_site.set()
+                await asyncio.sleep(0.01)
+
+        feeder = asyncio.create_task(feed())
+        with pytest.raises(core.UpstreamUnavailable):
+            async with api.list_sites(auth) as sites:
+                async for site in sites:
+                    read.append(site.id)
+        await feeder
+
+        assert read == ["site-0", "site-1"]
+
+    async def test_writes_are_not_coalesced(self) -> None:
+        upstream = GatedEnapterAPI()
+        api = make_api(upstream)
+        auth = core.AuthConfig(token="t")
+
+        tasks = [
+            asyncio.create_task(api.delete_rule(auth, "rule", "site")) for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        upstream.release.set()
+        await asyncio.gather(*tasks)
+
+        assert len(upstream.calls) == 2
+
+    async def test_memoized_reads_are_not_repeated(self) -> None:
+        upstream = GatedEnapterAPI()
+        upstream.release.set()
+        api = make_api(upstream)
+        auth = core.AuthConfig(token="t")
+
+        with core.memoize_reads():
+            await api.get_rule_engine(auth, "site")
+            await api.get_rule_engine(auth, "site")
+            await asyncio.create_task(api.get_rule_engine(auth, "site"))
+        await api.get_rule_engine(auth, "site")
+
+        assert len(upstream.calls) == 2
+
+    async def test_failed_reads_are_not_memoized(self) -> None:
+        upstream = GatedEnapterAPI()
+        upstream.release.set()
+        upstream.error = core.RuleEngineNotFound("site")
+        api = make_api(upstream)
+        auth = core.AuthConfig(token="t")
+
+        with core.memoize_reads():
+            for _ in range(2):
+                with pytest.raises(core.RuleEngineNotFound):
+                    await api.get_rule_engine(auth, "site")
+
+        assert len(upstream.calls) == 2
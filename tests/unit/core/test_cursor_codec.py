@@ -0,0 +1,22 @@
+import pytest
+
+from enapter_mcp_server import core
+from enapter_mcp_server.core import cursor_codec
+
+
+class TestCursorCodec:
+    def test_fields_round_trip(self) -> None:
+        cursor = cursor_codec.encode(("search", 1), ["snapshot", 2])
+
+        assert cursor_codec.decode(cursor, ("search", 1)) == ["snapshot", 2]
+
+    def test_cursor_of_different_search_is_rejected(self) -> None:
+        cursor = cursor_codec.encode(("search", 1), ["snapshot", 2])
+
+        with pytest.raises(core.InvalidCursor, match="different search"):
+            cursor_codec.decode(cursor, ("search", 2))
+
+    @pytest.mark.parametrize("cursor", ["garbage", "bnVsbA==", "W10="])
+    def test_malformed_cursor_is_rejected(self, cursor: str) -> None:
+        with pytest.raises(core.InvalidCursor, match="malformed"):
+            cursor_codec.decode(cursor, "search")
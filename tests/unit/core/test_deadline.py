@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from enapter_mcp_server import core
+
+
+class TestDeadline:
+    async def test_block_runs_to_completion_without_deadline(self) -> None:
+        async with core.until_deadline() as cutoff:
+            await asyncio.sleep(0)
+
+        assert not cutoff.reached
+
+    async def test_block_is_cut_short_at_deadline(self) -> None:
+        items: list[int] = []
+        with core.deadline(0.05):
+            async with core.until_deadline() as cutoff:
+                items.append(1)
+                await asyncio.Event().wait()
+                items.append(2)
+
+        assert cutoff.reached
+        assert items == [1]
+
+    async def test_nested_deadline_does_not_extend_enclosing_one(self) -> None:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        with core.deadline(0.05):
+            with core.deadline(60.0):
+                async with core.until_deadline() as cutoff:
+                    await asyncio.Event().wait()
+
+        assert cutoff.reached
+        assert loop.time() - started < 1.0
+
+    async def test_unrelated_timeout_is_not_swallowed(self) -> None:
+        with core.deadline(60.0):
+            with pytest.raises(TimeoutError):
+                async with core.until_deadline():
+                    async with asyncio.timeout(0.01):
+                        await asyncio.Event().wait()
+
+    async def test_share_leaves_rest_of_deadline_to_later_work(self) -> None:
+        with core.deadline(0.2):
+            with core.deadline_share(0.25):
+                async with core.until_deadline() as listing:
+                    await asyncio.Event().wait()
+            async with core.until_deadline() as enrichment:
+                await asyncio.sleep(0.05)
+
+        assert listing.reached
+        assert not enrichment.reached
+
+    async def test_share_without_deadline_limits_nothing(self) -> None:
+        with core.deadline_share(0.5):
+            async with core.until_deadline() as cutoff:
+                await asyncio.sleep(0)
+
+        assert not cutoff.reached
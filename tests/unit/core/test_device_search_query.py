@@ -204,3 +204,25 @@ class TestDeviceSearchQuery:
     def test_invalid_regexp(self) -> None:
         with pytest.raises(re.error):
             core.DeviceSearchQuery(name_regexp="[")
+
+    @pytest.mark.parametrize(
+        "query,access_path",
+        [
+            (
+                core.DeviceSearchQuery(device_id="1", site_id="s1"),
+                core.DeviceAccessPath.GET_DEVICE,
+            ),
+            (
+                core.DeviceSearchQuery(site_id="s1", name_regexp="Alpha"),
+                core.DeviceAccessPath.LIST_SITE_DEVICES,
+            ),
+            (
+                core.DeviceSearchQuery(name_regexp="Alpha"),
+                core.DeviceAccessPath.LIST_ALL_DEVICES,
+            ),
+        ],
+    )
+    def test_access_path(
+        self, query: core.DeviceSearchQuery, access_path: core.DeviceAccessPath
+    ) -> None:
+        assert query.access_path == access_path
@@ -0,0 +1,106 @@
+import pytest
+
+from enapter_mcp_server import core
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingScan:
+    def __init__(self, items: list[int]) -> None:
+        self.items = items
+        self.calls = 0
+
+    async def __call__(self) -> core.Scan[int]:
+        self.calls += 1
+        return core.Scan(items=list(self.items))
+
+
+class TestSearchSnapshots:
+    async def test_later_pages_are_served_from_snapshot(self) -> None:
+        snapshots = core.SearchSnapshots(clock=FakeClock())
+        auth = core.AuthConfig(token="test")
+        scan = CountingScan(list(range(5)))
+
+        pages = [await snapshots.page(auth, "search", scan, 0, 2)]
+        while pages[-1].next_cursor is not None:
+            pages.append(
+                await snapshots.page(auth, "search", scan, 0, 2, pages[-1].next_cursor)
+            )
+
+        assert [p.items for p in pages] == [[0, 1], [2, 3], [4]]
+        assert scan.calls == 1
+
+    async def test_single_page_result_has_no_cursor(self) -> None:
+        snapshots = core.SearchSnapshots(clock=FakeClock())
+        auth = core.AuthConfig(token="test")
+
+        page = await snapshots.page(auth, "search", CountingScan([1, 2]), 0, 2)
+
+        assert page == core.Page(items=[1, 2])
+
+    async def test_expired_snapshot_is_rescanned(self) -> None:
+        clock = FakeClock()
+        snapshots = core.SearchSnapshots(ttl=10.0, clock=clock)
+        auth = core.AuthConfig(token="test")
+        scan = CountingScan(list(range(5)))
+
+        first = await snapshots.page(auth, "search", scan, 0, 2)
+        clock.now = 10.0
+        second = await snapshots.page(auth, "search", scan, 0, 2, first.next_cursor)
+
+        assert second.items == [2, 3]
+        assert second.next_cursor is not None
+        assert scan.calls == 2
+
+    async def test_snapshots_are_per_user(self) -> None:
+        snapshots = core.SearchSnapshots(clock=FakeClock())
+        alice_scan = CountingScan(list(range(5)))
+        bob_scan = CountingScan(list(range(10, 15)))
+
+        alice = await snapshots.page(
+            core.AuthConfig(user="alice"), "search", alice_scan, 0, 2
+        )
+        bob = await snapshots.page(
+            core.AuthConfig(user="bob"), "search", bob_scan, 0, 2, alice.next_cursor
+        )
+
+        assert bob.items == [12, 13]
+        assert bob_scan.calls == 1
+
+    async def test_snapshots_are_bounded_by_total_items(self) -> None:
+        snapshots = core.SearchSnapshots(max_items=8, clock=FakeClock())
+        auth = core.AuthConfig(token="test")
+        first_scan = CountingScan(list(range(5)))
+        second_scan = CountingScan(list(range(5)))
+
+        first = await snapshots.page(auth, "first", first_scan, 0, 2)
+        second = await snapshots.page(auth, "second", second_scan, 0, 2)
+        await snapshots.page(auth, "second", second_scan, 0, 2, second.next_cursor)
+        await snapshots.page(auth, "first", first_scan, 0, 2, first.next_cursor)
+
+        # Both snapshots do not fit together, so the first one was evicted.
+        assert first_scan.calls == 2
+        assert second_scan.calls == 1
+
+    async def test_cursor_of_different_search_is_rejected(self) -> None:
+        snapshots = core.SearchSnapshots(clock=FakeClock())
+        auth = core.AuthConfig(token="test")
+        scan = CountingScan(list(range(5)))
+
+        page = await snapshots.page(auth, "search", scan, 0, 2)
+
+        with pytest.raises(core.InvalidCursor):
+            await snapshots.page(auth, "other", scan, 0, 2, page.next_cursor)
+
+    async def test_malformed_cursor_is_rejected(self) -> None:
+        snapshots = core.SearchSnapshots(clock=FakeClock())
+        auth = core.AuthConfig(token="test")
+
+        with pytest.raises(core.InvalidCursor):
+            await snapshots.page(auth, "search", CountingScan([]), 0, 2, "garbage")
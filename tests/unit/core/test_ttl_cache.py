@@ -0,0 +1,205 @@
+import asyncio
+
+import pytest
+
+from enapter_mcp_server import core
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingLoader:
+    def __init__(self, value: str = "value") -> None:
+        self.value = value
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        await self.release.wait()
+        return f"{self.value}-{self.calls}"
+
+
+class TestTTLCache:
+    async def test_miss_then_hit(self) -> None:
+        cache: core.TTLCache[str, str] = core.TTLCache(ttl=10.0, clock=FakeClock())
+        load = CountingLoader()
+
+        assert await cache.get("k", load) == "value-1"
+        assert await cache.get("k", load) == "value-1"
+
+        assert load.calls == 1
+        assert cache.stats == core.CacheStats(hits=1, misses=1)
+
+    async def test_expired_entry_is_reloaded(self) -> None:
+        clock = FakeClock()
+        cache: core.TTLCache[str, str] = core.TTLCache(ttl=10.0, clock=clock)
+        load = CountingLoader()
+
+        await cache.get("k", load)
+        clock.now = 10.0
+
+        assert await cache.get("k", load) == "value-2"
+        assert cache.stats.misses == 2
+
+    async def test_stale_entry_is_served_while_refreshing(self) -> None:
+        clock = FakeClock()
+        cache: core.TTLCache[str, str] = core.TTLCache(
+            ttl=10.0, stale_ttl=5.0, clock=clock
+        )
+        load = CountingLoader()
+
+        await cache.get("k", load)
+        clock.now = 12.0
+
+        assert await cache.get("k", load) == "value-1"
+        assert cache.stats.stale_hits == 1
+
+        await asyncio.sleep(0)
+        assert load.calls == 2
+        assert await cache.get("k", load) == "value-2"
+
+    async def test_concurrent_loads_are_single_flight(self) -> None:
+        cache: core.TTLCache[str, str] = core.TTLCache(ttl=10.0, clock=FakeClock())
+        load = CountingLoader()
+        load.release.clear()
+
+        tasks = [asyncio.create_task(cache.get("k", load)) for _ in range(5)]
+        await asyncio.sleep(0)
+        load.release.set()
+
+        assert await asyncio.gather(*tasks) == ["value-1"] * 5
+        assert load.calls == 1
+
+    async def test_cancelled_waiter_does_not_cancel_shared_load(self) -> None:
+        cache: core.TTLCache[str, str] = core.TTLCache(ttl=10.0, clock=FakeClock())
+        load = CountingLoader()
+        load.release.clear()
+
+        first = asyncio.create_task(cache.get("k", load))
+        second = asyncio.create_task(cache.get("k", load))
+        await asyncio.sleep(0)
+        first.cancel()
+        load.release.set()
+
+        assert await second == "value-1"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert load.calls == 1
+
+    async def test_load_is_cancelled_when_all_waiters_are_gone(self) -> None:
+        cache: core.TTLCache[str, str] = core.TTLCache(ttl=10.0, clock=FakeClock())
+        load = CountingLoader()
+        load.release.clear()
+
+        first = asyncio.create_task(cache.get("k", load))
+        second = asyncio.create_task(cache.get("k", load))
+        await asyncio.sleep(0)
+        first.cancel()
+        second.cancel()
+        await asyncio.gather(first, second, return_exceptions=True)
+        await asyncio.sleep(0)
+        load.release.set()
+
+        assert await cache.get("k", load) == "value-2"
+        assert load.calls == 2
+
+    async def test_caller_arriving_after_cancellation_starts_a_new_load(
+        self,
+    ) -> None:
+        cache: core.TTLCache[str, str] = core.TTLCache(ttl=10.0, clock=FakeClock())
+        load = CountingLoader()
+        load.release.clear()
+
+        first = asyncio.create_task(cache.get("k", load))
+        await asyncio.sleep(0)
+        first.cancel()
+        # Runs right after the first caller leaves, before the load has
+        # completed its cancellation.
+        second = asyncio.create_task(cache.get("k", load))
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        load.release.set()
+
+        assert await second == "value-2"
+        assert load.calls == 2
+
+    async def test_background_refresh_outlives_its_waiters(self) -> None:
+        clock = FakeClock()
+        cache: core.TTLCache[str, str] = core.TTLCache(
+            ttl=10.0, stale_ttl=10.0, clock=clock
+        )
+        cache.put("k", "old")
+        clock.now = 15.0
+        load = CountingLoader()
+        load.release.clear()
+
+        assert cache.lookup("k", load) == "old"
+        waiter = asyncio.create_task(cache.fill("k", load))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        load.release.set()
+        await asyncio.sleep(0)
+
+        assert cache.lookup("k") == "value-1"
+        assert load.calls == 1
+
+    async def test_failed_load_is_not_cached(self) -> None:
+        cache: core.TTLCache[str, str] = core.TTLCache(ttl=10.0, clock=FakeClock())
+
+        async def fail() -> str:
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await cache.get("k", fail)
+        assert len(cache) == 0
+
+    async def test_least_recently_used_entry_is_evicted(self) -> None:
+        cache: core.TTLCache[str, str] = core.TTLCache(
+            ttl=10.0, max_size=2, clock=FakeClock()
+        )
+        cache.put("a", "1")
+        cache.put("b", "2")
+        assert await cache.get("a", CountingLoader()) == "1"
+
+        cache.put("c", "3")
+
+        assert cache.stats.evictions == 1
+        assert await cache.get("a", CountingLoader()) == "1"
+        assert await cache.get("b", CountingLoader("b")) == "b-1"
+
+    async def test_weighed_entries_are_evicted_by_total_weight(self) -> None:
+        cache: core.TTLCache[str, str] = core.TTLCache(
+            ttl=10.0, max_size=5, clock=FakeClock(), weigh=len
+        )
+        cache.put("a", "xx")
+        cache.put("b", "xx")
+        cache.put("c", "xx")
+
+        assert len(cache) == 2
+        assert cache.lookup("a") is None
+
+        cache.put("d", "xxxxxx")
+
+        assert len(cache) == 2
+        assert cache.stats.evictions == 2
+
+    async def test_invalidate_drops_entry_and_inflight_load(self) -> None:
+        cache: core.TTLCache[str, str] = core.TTLCache(ttl=10.0, clock=FakeClock())
+        load = CountingLoader()
+        load.release.clear()
+
+        task = asyncio.create_task(cache.get("k", load))
+        await asyncio.sleep(0)
+        cache.invalidate("k")
+        load.release.set()
+
+        assert await task == "value-1"
+        assert len(cache) == 0
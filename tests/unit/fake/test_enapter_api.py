@@ -3,8 +3,7 @@ import datetime
 import pytest
 
 from enapter_mcp_server import core, domain, fake
-
-from . import _sample_policy
+from tests.fake import _sample_policy
 
 
 def _make_state() -> fake.State:
@@ -98,25 +97,24 @@ class TestDispatcherDelegates:
 
 class TestFromUrl:
     def test_state_only_uses_default_policy(self) -> None:
-        api = fake.EnapterAPI.from_url("fake://?state=tests.unit.fake._sample_state")
+        api = fake.EnapterAPI.from_url("fake://?state=tests.fake._sample_state")
         assert isinstance(api.policy, fake.DefaultPolicy)
         assert api.state.sites[0].id == "site-1"
 
     def test_state_and_policy_uses_custom_policy(self) -> None:
         api = fake.EnapterAPI.from_url(
-            "fake://?policy=tests.unit.fake._sample_policy"
-            "&state=tests.unit.fake._sample_state"
+            "fake://?policy=tests.fake._sample_policy&state=tests.fake._sample_state"
         )
         assert type(api.policy) is _sample_policy.Policy
         assert isinstance(api.policy, fake.DefaultPolicy)
 
     def test_missing_state_raises(self) -> None:
         with pytest.raises(KeyError):
-            fake.EnapterAPI.from_url("fake://?policy=tests.unit.fake._sample_policy")
+            fake.EnapterAPI.from_url("fake://?policy=tests.fake._sample_policy")
 
     def test_fresh_state_independent_instances(self) -> None:
-        api1 = fake.EnapterAPI.from_url("fake://?state=tests.unit.fake._sample_state")
-        api2 = fake.EnapterAPI.from_url("fake://?state=tests.unit.fake._sample_state")
+        api1 = fake.EnapterAPI.from_url("fake://?state=tests.fake._sample_state")
+        api2 = fake.EnapterAPI.from_url("fake://?state=tests.fake._sample_state")
         assert api1.state is not api2.state
 
         api1.state.devices.append(
@@ -136,8 +134,7 @@ class TestFromUrl:
         self, auth: core.AuthConfig
     ) -> None:
         api = fake.EnapterAPI.from_url(
-            "fake://?policy=tests.unit.fake._sample_policy"
-            "&state=tests.unit.fake._sample_state"
+            "fake://?policy=tests.fake._sample_policy&state=tests.fake._sample_state"
         )
         result = await api.execute_command(auth, "dev-1", "reboot", {"a": 1})
         assert result.id == "ce-fake"
@@ -153,6 +150,6 @@ class TestAsyncContextManager:
 
     async def test_context_manager_from_url(self) -> None:
         async with fake.EnapterAPI.from_url(
-            "fake://?state=tests.unit.fake._sample_state"
+            "fake://?state=tests.fake._sample_state"
         ) as api:
             assert isinstance(api, fake.EnapterAPI)
@@ -0,0 +1,68 @@
+import asyncio
+import http
+import json
+from typing import Any, Self
+
+
+class StubServer:
+    """Minimal keep-alive HTTP/1.1 server answering every request with JSON."""
+
+    def __init__(self, body: dict[str, Any], status: int = 200) -> None:
+        self._head, self._payload = self._render(body, status)
+        self._server: asyncio.Server | None = None
+        self.connections = 0
+        self.requests = 0
+
+    async def __aenter__(self) -> Self:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        assert self._server is not None
+        self._server.close()
+        self._server.close_clients()
+        await self._server.wait_closed()
+
+    @property
+    def url(self) -> str:
+        assert self._server is not None
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = self._content_length(head)
+                if length:
+                    await reader.readexactly(length)
+                self.requests += 1
+                writer.write(self._head)
+                if not head.startswith(b"HEAD "):
+                    writer.write(self._payload)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _content_length(head: bytes) -> int:
+        for line in head.split(b"\r\n"):
+            name, _, value = line.partition(b":")
+            if name.strip().lower() == b"content-length":
+                return int(value)
+        return 0
+
+    @staticmethod
+    def _render(body: dict[str, Any], status: int) -> tuple[bytes, bytes]:
+        payload = json.dumps(body).encode()
+        head = (
+            f"HTTP/1.1 {status} {http.HTTPStatus(status).phrase}\r\n".encode()
+            + b"Content-Type: application/json\r\n"
+            + f"Content-Length: {len(payload)}\r\n\r\n".encode()
+        )
+        return head, payload
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from enapter_mcp_server import http
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestAdaptiveConcurrencyLimiter:
+    async def test_requests_beyond_limit_are_queued(self) -> None:
+        limiter = http.AdaptiveConcurrencyLimiter(initial_limit=2, clock=FakeClock())
+        first = await limiter.acquire()
+        await limiter.acquire()
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.in_flight == 2
+        assert limiter.queue_depth == 1
+
+        limiter.release(first, overloaded=False)
+        await waiter
+        assert limiter.in_flight == 2
+        assert limiter.queue_depth == 0
+
+    async def test_limit_grows_while_saturated_and_latency_is_flat(self) -> None:
+        clock = FakeClock()
+        limiter = http.AdaptiveConcurrencyLimiter(initial_limit=2, clock=clock)
+
+        for _ in range(10):
+            started = [await limiter.acquire() for _ in range(limiter.limit)]
+            clock.now += 0.1
+            for started_at in started:
+                limiter.release(started_at, overloaded=False)
+
+        assert limiter.limit > 2
+
+    async def test_limit_does_not_grow_when_not_saturated(self) -> None:
+        clock = FakeClock()
+        limiter = http.AdaptiveConcurrencyLimiter(initial_limit=4, clock=clock)
+
+        for _ in range(50):
+            started_at = await limiter.acquire()
+            clock.now += 0.1
+            limiter.release(started_at, overloaded=False)
+
+        assert limiter.limit == 4
+
+    async def test_overload_backs_off_once_per_congestion_event(self) -> None:
+        clock = FakeClock()
+        limiter = http.AdaptiveConcurrencyLimiter(initial_limit=8, clock=clock)
+
+        started = [await limiter.acquire() for _ in range(4)]
+        clock.now += 0.1
+        for started_at in started:
+            limiter.release(started_at, overloaded=True)
+
+        assert limiter.limit == 4
+
+    async def test_limit_never_drops_below_minimum(self) -> None:
+        clock = FakeClock()
+        limiter = http.AdaptiveConcurrencyLimiter(
+            initial_limit=4, min_limit=2, clock=clock
+        )
+
+        for _ in range(5):
+            started_at = await limiter.acquire()
+            clock.now += 0.1
+            limiter.release(started_at, overloaded=True)
+
+        assert limiter.limit == 2
+
+    async def test_rising_latency_backs_off(self) -> None:
+        clock = FakeClock()
+        limiter = http.AdaptiveConcurrencyLimiter(initial_limit=8, clock=clock)
+
+        for latency in [0.1] * 20 + [1.0] * 5:
+            started_at = await limiter.acquire()
+            clock.now += latency
+            limiter.release(started_at, overloaded=False)
+
+        assert limiter.limit < 8
+
+    async def test_slow_endpoint_does_not_back_off_fast_one(self) -> None:
+        clock = FakeClock()
+        limiter = http.AdaptiveConcurrencyLimiter(initial_limit=8, clock=clock)
+
+        for _ in range(20):
+            for endpoint, latency in [("GET /fast", 0.1), ("GET /slow", 1.0)]:
+                started_at = await limiter.acquire()
+                clock.now += latency
+                limiter.release(started_at, overloaded=False, endpoint=endpoint)
+
+        assert limiter.limit == 8
+
+    async def test_cancelled_waiter_leaves_queue(self) -> None:
+        limiter = http.AdaptiveConcurrencyLimiter(initial_limit=1, clock=FakeClock())
+        started_at = await limiter.acquire()
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert limiter.queue_depth == 0
+        limiter.release(started_at, overloaded=False)
+        assert limiter.in_flight == 0
@@ -0,0 +1,67 @@
+import pytest
+
+from enapter_mcp_server import core, http
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self) -> None:
+        breaker = http.CircuitBreaker(
+            "GET /v3/sites", failure_threshold=2, clock=FakeClock()
+        )
+
+        breaker.record_failure()
+        breaker.check()
+        breaker.record_failure()
+
+        assert breaker.is_open
+        with pytest.raises(core.UpstreamUnavailable, match="GET /v3/sites"):
+            breaker.check()
+
+    def test_success_resets_failure_count(self) -> None:
+        breaker = http.CircuitBreaker("e", failure_threshold=2, clock=FakeClock())
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert not breaker.is_open
+
+    def test_lets_one_probe_through_after_reset_timeout(self) -> None:
+        clock = FakeClock()
+        breaker = http.CircuitBreaker(
+            "e", failure_threshold=1, reset_timeout=30.0, clock=clock
+        )
+        breaker.record_failure()
+        clock.now = 30.0
+
+        breaker.check()
+        with pytest.raises(core.UpstreamUnavailable):
+            breaker.check()
+
+        breaker.record_success()
+        assert not breaker.is_open
+        breaker.check()
+
+    def test_failed_probe_keeps_circuit_open(self) -> None:
+        clock = FakeClock()
+        breaker = http.CircuitBreaker(
+            "e", failure_threshold=3, reset_timeout=30.0, clock=clock
+        )
+        for _ in range(3):
+            breaker.record_failure()
+        clock.now = 30.0
+
+        breaker.check()
+        breaker.record_failure()
+
+        clock.now = 59.0
+        with pytest.raises(core.UpstreamUnavailable):
+            breaker.check()
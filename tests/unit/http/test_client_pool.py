@@ -0,0 +1,83 @@
+import unittest.mock
+
+import enapter
+import httpx
+
+from enapter_mcp_server import core, http
+
+from ._stub_server import StubServer
+
+RULE_ENGINE = {"engine": {"id": "engine", "state": "ACTIVE", "timezone": "UTC"}}
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestClientPool:
+    def test_reuses_client_per_auth(self) -> None:
+        pool = http.ClientPool(
+            "http://example.test", enapter.http.api.Transport(), clock=FakeClock()
+        )
+
+        alice = pool.get(core.AuthConfig(token="t", user="alice"))
+        bob = pool.get(core.AuthConfig(token="t", user="bob"))
+
+        assert pool.get(core.AuthConfig(token="t", user="alice")) is alice
+        assert bob is not alice
+        assert len(pool) == 2
+
+    def test_least_recently_used_client_is_dropped(self) -> None:
+        pool = http.ClientPool(
+            "http://example.test",
+            enapter.http.api.Transport(),
+            max_size=2,
+            clock=FakeClock(),
+        )
+        a = pool.get(core.AuthConfig(token="a"))
+        pool.get(core.AuthConfig(token="b"))
+        pool.get(core.AuthConfig(token="a"))
+
+        pool.get(core.AuthConfig(token="c"))
+
+        assert len(pool) == 2
+        assert pool.get(core.AuthConfig(token="a")) is a
+
+    def test_idle_clients_are_dropped(self) -> None:
+        clock = FakeClock()
+        pool = http.ClientPool(
+            "http://example.test",
+            enapter.http.api.Transport(),
+            idle_timeout=10.0,
+            clock=clock,
+        )
+        a = pool.get(core.AuthConfig(token="a"))
+        clock.now = 5.0
+        pool.get(core.AuthConfig(token="b"))
+        clock.now = 12.0
+
+        assert pool.get(core.AuthConfig(token="b")) is not None
+        assert len(pool) == 1
+        assert pool.get(core.AuthConfig(token="a")) is not a
+
+    async def test_calls_against_stub_server_share_one_client(self) -> None:
+        auth = core.AuthConfig(token="test")
+        with unittest.mock.patch.object(
+            httpx.AsyncClient,
+            "__init__",
+            autospec=True,
+            side_effect=httpx.AsyncClient.__init__,
+        ) as new_client:
+            async with StubServer(RULE_ENGINE) as server:
+                async with http.EnapterAPI(base_url=server.url) as api:
+                    for _ in range(50):
+                        engine = await api.get_rule_engine(auth, "site")
+                        assert engine.id == "engine"
+
+        assert new_client.call_count == 1
+        assert server.requests == 50
+        assert server.connections == 1
@@ -1,12 +1,13 @@
-import contextlib
 import datetime
-from typing import Any, AsyncGenerator, Callable, Coroutine, cast
+from typing import Any, Awaitable, Callable, Coroutine, cast
 
 import enapter
 import pytest
 
 from enapter_mcp_server import core, domain, http
 
+from ._stub_server import StubServer
+
 
 class FailingTelemetryClient:
     async def latest(
@@ -25,11 +26,18 @@ class FakeClient:
 
 
 class StubEnapterAPI(http.EnapterAPI):
-    @contextlib.asynccontextmanager
-    async def _new_client(
-        self, auth: core.AuthConfig
-    ) -> AsyncGenerator[enapter.http.api.Client, None]:
-        yield cast(enapter.http.api.Client, FakeClient())
+    def _client(self, auth: core.AuthConfig) -> enapter.http.api.Client:
+        return cast(enapter.http.api.Client, FakeClient())
+
+
+class RecordingHedger(http.Hedger):
+    def __init__(self) -> None:
+        super().__init__()
+        self.keys: list[str] = []
+
+    async def run[T](self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        self.keys.append(key)
+        return await super().run(key, call)
 
 
 class TestEnapterAPI:
@@ -48,6 +56,38 @@ class TestEnapterAPI:
         else:
             raise AssertionError("Expected LatestTelemetryUnavailable")
 
+    async def test_get_device_raises_device_not_found_on_404(self) -> None:
+        body = {"errors": [{"message": "device not found", "code": "not_found"}]}
+
+        async with StubServer(body, status=404) as server:
+            async with http.EnapterAPI(base_url=server.url) as api:
+                with pytest.raises(core.DeviceNotFound):
+                    await api.get_device(core.AuthConfig(token="test"), "dev-1")
+
+    async def test_get_device_hedges_expansions_separately(self) -> None:
+        body = {"errors": [{"message": "device not found", "code": "not_found"}]}
+        hedger = RecordingHedger()
+        auth = core.AuthConfig(token="test")
+
+        async with StubServer(body, status=404) as server:
+            async with http.EnapterAPI(base_url=server.url, hedger=hedger) as api:
+                for kwargs in [
+                    {},
+                    {"expand_manifest": True, "expand_properties": True},
+                ]:
+                    with pytest.raises(core.DeviceNotFound):
+                        await api.get_device(auth, "dev-1", **kwargs)
+
+        assert hedger.keys == ["get_device", "get_device?expand=manifest,properties"]
+
+    async def test_get_device_propagates_other_errors(self) -> None:
+        body = {"errors": [{"message": "forbidden", "code": "forbidden"}]}
+
+        async with StubServer(body, status=403) as server:
+            async with http.EnapterAPI(base_url=server.url) as api:
+                with pytest.raises(enapter.http.api.Error):
+                    await api.get_device(core.AuthConfig(token="test"), "dev-1")
+
 
 # ---------------------------------------------------------------------------
 #  Fakes for execute_command tests
@@ -107,11 +147,8 @@ class _CommandStubEnapterAPI(http.EnapterAPI):
         super().__init__(base_url)
         self._commands = commands
 
-    @contextlib.asynccontextmanager
-    async def _new_client(
-        self, auth: core.AuthConfig
-    ) -> AsyncGenerator[enapter.http.api.Client, None]:
-        yield cast(enapter.http.api.Client, _CommandFakeClient(self._commands))
+    def _client(self, auth: core.AuthConfig) -> enapter.http.api.Client:
+        return cast(enapter.http.api.Client, _CommandFakeClient(self._commands))
 
 
 # ---------------------------------------------------------------------------
@@ -464,11 +501,8 @@ class _RuleStubEnapterAPI(http.EnapterAPI):
         super().__init__(base_url)
         self._rule_engine = rule_engine
 
-    @contextlib.asynccontextmanager
-    async def _new_client(
-        self, auth: core.AuthConfig
-    ) -> AsyncGenerator[enapter.http.api.Client, None]:
-        yield cast(enapter.http.api.Client, _RuleFakeClient(self._rule_engine))
+    def _client(self, auth: core.AuthConfig) -> enapter.http.api.Client:
+        return cast(enapter.http.api.Client, _RuleFakeClient(self._rule_engine))
 
 
 def _make_sdk_rule(
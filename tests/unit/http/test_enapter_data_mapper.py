@@ -1,10 +1,34 @@
+import copy
 import datetime
+import tracemalloc
+from typing import Any
 
 import enapter
 
 from enapter_mcp_server import domain, http
 
 
+def make_inverter_manifest(commands_total: int = 50) -> dict[str, Any]:
+    return {
+        "description": "Inverter",
+        "vendor": "Enapter",
+        "properties": {
+            f"p{i}": {"display_name": f"P{i}", "type": "string"} for i in range(50)
+        },
+        "telemetry": {
+            f"t{i}": {"display_name": f"T{i}", "type": "float", "unit": "W"}
+            for i in range(100)
+        },
+        "alerts": {
+            f"a{i}": {"display_name": f"A{i}", "severity": "warning"} for i in range(50)
+        },
+        "commands": {
+            f"c{i}": {"display_name": f"C{i}", "arguments": {}}
+            for i in range(commands_total)
+        },
+    }
+
+
 class TestEnapterDataMapper:
     def test_parse_device_manifest(self) -> None:
         manifest = http.EnapterDataMapper().to_device_manifest(
@@ -469,3 +493,54 @@ class TestEnapterDataMapper:
         assert confirmation.title == "Reboot the device"
         assert confirmation.severity is None
         assert confirmation.description is None
+
+    def test_identical_manifests_share_one_instance(self) -> None:
+        mapper = http.EnapterDataMapper()
+
+        first = mapper.to_device_manifest(make_inverter_manifest())
+        second = mapper.to_device_manifest(make_inverter_manifest())
+        other = mapper.to_device_manifest(make_inverter_manifest(commands_total=1))
+
+        assert first is second
+        assert other is not first
+        assert other is not None
+        assert len(other.commands) == 1
+
+    def test_to_device_interns_repeated_ids(self) -> None:
+        mapper = http.EnapterDataMapper()
+        devices = [
+            mapper.to_device(
+                enapter.http.api.devices.Device(
+                    id=f"dev-{i}",
+                    blueprint_id="".join(["bp-", "shared"]),
+                    name=f"Dev {i}",
+                    site_id="".join(["site-", "shared"]),
+                    updated_at=datetime.datetime.now(),
+                    slug=f"dev-{i}",
+                    type=enapter.http.api.devices.DeviceType.NATIVE,
+                    authorized_role=enapter.http.api.AccessRole.USER,
+                )
+            )
+            for i in range(2)
+        ]
+
+        assert devices[0].blueprint_id is devices[1].blueprint_id
+        assert devices[0].site_id is devices[1].site_id
+
+    def test_mapping_many_identical_manifests_allocates_one_copy(self) -> None:
+        # Memory benchmark: 200 devices sharing a blueprint should cost about
+        # as much as one parsed manifest, not 200 of them.
+        dtos = [copy.deepcopy(make_inverter_manifest()) for _ in range(200)]
+
+        def peak_bytes(count: int) -> int:
+            mapper = http.EnapterDataMapper()
+            tracemalloc.start()
+            try:
+                manifests = [mapper.to_device_manifest(dto) for dto in dtos[:count]]
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            assert len(manifests) == count
+            return peak
+
+        assert peak_bytes(200) < 2 * peak_bytes(1)
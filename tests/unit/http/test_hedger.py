@@ -0,0 +1,121 @@
+import asyncio
+import random
+
+import pytest
+
+from enapter_mcp_server import http
+
+
+def frozen_clock() -> float:
+    # Every request is recorded as instant, so a hedge is due as soon as the
+    # primary copy yields and whether it is sent does not depend on timing.
+    return 0.0
+
+
+class LongTailUpstream:
+    """Fake upstream where a small share of requests is very slow.
+
+    Fast requests complete without yielding to the event loop, so they are
+    never hedged. Slow ones sleep and answer "slow".
+    """
+
+    def __init__(self, seed: int, tail_share: float) -> None:
+        self._random = random.Random(seed)
+        self._tail_share = tail_share
+        self.calls = 0
+        self.cancelled = 0
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        if self._random.random() >= self._tail_share:
+            return "fast"
+        try:
+            await asyncio.sleep(0.01)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return "slow"
+
+
+async def slow_share(hedger: http.Hedger | None, upstream: LongTailUpstream) -> float:
+    slow = 0
+    for _ in range(300):
+        if hedger is None:
+            result = await upstream()
+        else:
+            result = await hedger.run("get_device", upstream)
+        slow += result == "slow"
+    return slow / 300
+
+
+class TestHedger:
+    async def test_hedging_cuts_p99_of_long_tail(self) -> None:
+        unhedged = await slow_share(None, LongTailUpstream(2, 0.03))
+
+        hedger = http.Hedger(percentile=0.95, max_hedge_rate=0.1, clock=frozen_clock)
+        upstream = LongTailUpstream(2, 0.03)
+        hedged = await slow_share(hedger, upstream)
+
+        # The p99 is slow when more than 1% of the requests are.
+        assert unhedged > 0.01
+        assert hedged < 0.01
+        assert 0 < hedger.hedges <= 0.1 * hedger.requests
+        assert upstream.cancelled > 0
+
+    async def test_no_hedge_before_enough_samples(self) -> None:
+        hedger = http.Hedger(min_samples=20, max_hedge_rate=1.0, clock=frozen_clock)
+        upstream = LongTailUpstream(1, 1.0)
+
+        for _ in range(19):
+            await hedger.run("get_rule", upstream)
+
+        assert hedger.hedges == 0
+        assert upstream.calls == 19
+
+    async def test_hedge_rate_is_capped(self) -> None:
+        hedger = http.Hedger(
+            percentile=0.5,
+            max_hedge_rate=0.25,
+            max_hedge_burst=1.0,
+            min_samples=1,
+            clock=frozen_clock,
+        )
+        await hedger.run("get_rule_engine", lambda: asyncio.sleep(0, "warm"))
+
+        for _ in range(20):
+            await hedger.run("get_rule_engine", lambda: asyncio.sleep(0.001, "slow"))
+
+        # Every slow request wants a hedge, the budget allows one per four
+        # requests including the warm-up.
+        assert hedger.hedges == 5
+
+    async def test_failed_copy_waits_for_the_other(self) -> None:
+        hedger = http.Hedger(
+            min_samples=1, max_hedge_rate=1.0, percentile=0.5, clock=frozen_clock
+        )
+        await hedger.run("get_device", lambda: asyncio.sleep(0, "warm"))
+        attempts = 0
+
+        async def slow_failure_then_success() -> str:
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                await asyncio.sleep(0.01)
+                raise RuntimeError("boom")
+            return "ok"
+
+        assert await hedger.run("get_device", slow_failure_then_success) == "ok"
+
+    async def test_both_copies_failing_raises(self) -> None:
+        hedger = http.Hedger(
+            min_samples=1, max_hedge_rate=1.0, percentile=0.5, clock=frozen_clock
+        )
+        await hedger.run("get_device", lambda: asyncio.sleep(0, "warm"))
+
+        async def failure() -> str:
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await hedger.run("get_device", failure)
+        assert hedger.hedges == 1
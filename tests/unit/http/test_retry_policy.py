@@ -0,0 +1,45 @@
+import email.utils
+import time
+
+import httpx
+
+from enapter_mcp_server import http
+
+
+class TestRetryPolicy:
+    def test_gives_up_after_max_attempts(self) -> None:
+        policy = http.RetryPolicy(max_attempts=3)
+
+        assert policy.delay(0, None) is not None
+        assert policy.delay(1, None) is not None
+        assert policy.delay(2, None) is None
+
+    def test_backoff_is_jittered_and_capped(self) -> None:
+        policy = http.RetryPolicy(max_attempts=10, base_delay=0.1, max_delay=0.5)
+
+        for attempt in range(9):
+            delay = policy.delay(attempt, None)
+            assert delay is not None
+            assert 0.0 <= delay <= min(0.5, 0.1 * 2**attempt)
+
+    def test_retry_after_seconds_is_honoured(self) -> None:
+        policy = http.RetryPolicy(max_delay=0.5)
+        response = httpx.Response(503, headers={"Retry-After": "3"})
+
+        assert policy.delay(0, response) == 3.0
+
+    def test_retry_after_date_is_honoured(self) -> None:
+        policy = http.RetryPolicy()
+        retry_at = email.utils.formatdate(time.time() + 5, usegmt=True)
+        response = httpx.Response(429, headers={"Retry-After": retry_at})
+
+        delay = policy.delay(0, response)
+
+        assert delay is not None
+        assert 3.0 < delay <= 5.0
+
+    def test_long_retry_after_is_not_retried(self) -> None:
+        policy = http.RetryPolicy(max_retry_after=10.0)
+        response = httpx.Response(503, headers={"Retry-After": "60"})
+
+        assert policy.delay(0, response) is None
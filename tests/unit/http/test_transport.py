@@ -0,0 +1,213 @@
+import asyncio
+import unittest.mock
+
+import httpx
+import pytest
+
+from enapter_mcp_server import core, http
+
+from ._stub_server import StubServer
+
+RULE_ENGINE = {"engine": {"id": "engine", "state": "ACTIVE", "timezone": "UTC"}}
+
+
+class TestTransport:
+    @pytest.mark.parametrize(
+        "status_code,overloaded",
+        [(200, False), (404, False), (429, True), (502, True)],
+    )
+    async def test_releases_limiter_with_outcome(
+        self, status_code: int, overloaded: bool
+    ) -> None:
+        limiter = unittest.mock.Mock(spec=http.AdaptiveConcurrencyLimiter)
+        limiter.acquire = unittest.mock.AsyncMock(return_value=1.0)
+        transport = http.Transport(limiter=limiter)
+        request = httpx.Request("GET", "http://example.test/v3/sites")
+
+        with unittest.mock.patch.object(
+            httpx.AsyncHTTPTransport,
+            "handle_async_request",
+            return_value=httpx.Response(status_code),
+        ):
+            response = await transport.handle_async_request(request)
+
+        assert response.status_code == status_code
+        limiter.release.assert_called_once_with(
+            1.0, overloaded=overloaded, endpoint="GET /v3/sites"
+        )
+
+    async def test_transport_error_counts_as_overload(self) -> None:
+        limiter = unittest.mock.Mock(spec=http.AdaptiveConcurrencyLimiter)
+        limiter.acquire = unittest.mock.AsyncMock(return_value=1.0)
+        transport = http.Transport(limiter=limiter)
+        request = httpx.Request("GET", "http://example.test/v3/sites")
+
+        with unittest.mock.patch.object(
+            httpx.AsyncHTTPTransport,
+            "handle_async_request",
+            side_effect=httpx.ConnectError("refused"),
+        ):
+            with pytest.raises(httpx.ConnectError):
+                await transport.handle_async_request(request)
+
+        limiter.release.assert_called_once_with(
+            1.0, overloaded=True, endpoint="GET /v3/sites"
+        )
+
+    async def test_applies_configured_timeout(self) -> None:
+        limiter = http.AdaptiveConcurrencyLimiter()
+        timeout = httpx.Timeout(connect=1.0, read=2.0, write=3.0, pool=4.0)
+        transport = http.Transport(limiter=limiter, timeout=timeout)
+        request = httpx.Request("GET", "http://example.test/v3/sites")
+
+        with unittest.mock.patch.object(
+            httpx.AsyncHTTPTransport,
+            "handle_async_request",
+            return_value=httpx.Response(200),
+        ):
+            await transport.handle_async_request(request)
+
+        assert request.extensions["timeout"] == timeout.as_dict()
+
+
+class TestResilience:
+    @pytest.mark.parametrize(
+        "method,url",
+        [
+            ("GET", "http://example.test/v3/sites"),
+            ("POST", "http://example.test/v3/telemetry/query_timeseries"),
+        ],
+    )
+    async def test_retries_idempotent_reads(self, method: str, url: str) -> None:
+        transport = http.Transport(
+            limiter=http.AdaptiveConcurrencyLimiter(),
+            retry_policy=http.RetryPolicy(max_attempts=3, base_delay=0.0),
+        )
+
+        with unittest.mock.patch.object(
+            httpx.AsyncHTTPTransport,
+            "handle_async_request",
+            side_effect=[
+                httpx.Response(502),
+                httpx.ConnectError("refused"),
+                httpx.Response(200),
+            ],
+        ) as upstream:
+            response = await transport.handle_async_request(httpx.Request(method, url))
+
+        assert response.status_code == 200
+        assert upstream.call_count == 3
+
+    @pytest.mark.parametrize("method", ["POST", "PATCH", "DELETE"])
+    async def test_never_retries_writes(self, method: str) -> None:
+        transport = http.Transport(
+            limiter=http.AdaptiveConcurrencyLimiter(),
+            retry_policy=http.RetryPolicy(max_attempts=3, base_delay=0.0),
+        )
+        request = httpx.Request(method, "http://example.test/v3/devices/d1")
+
+        with unittest.mock.patch.object(
+            httpx.AsyncHTTPTransport,
+            "handle_async_request",
+            return_value=httpx.Response(503),
+        ) as upstream:
+            response = await transport.handle_async_request(request)
+
+        assert response.status_code == 503
+        assert upstream.call_count == 1
+
+    async def test_gives_up_after_max_attempts(self) -> None:
+        transport = http.Transport(
+            limiter=http.AdaptiveConcurrencyLimiter(),
+            retry_policy=http.RetryPolicy(max_attempts=2, base_delay=0.0),
+        )
+        request = httpx.Request("GET", "http://example.test/v3/sites")
+
+        with unittest.mock.patch.object(
+            httpx.AsyncHTTPTransport,
+            "handle_async_request",
+            side_effect=lambda _: httpx.Response(503),
+        ) as upstream:
+            response = await transport.handle_async_request(request)
+
+        assert response.status_code == 503
+        assert upstream.call_count == 2
+
+    async def test_open_circuit_fails_fast_per_endpoint(self) -> None:
+        transport = http.Transport(
+            limiter=http.AdaptiveConcurrencyLimiter(),
+            new_circuit_breaker=lambda name: http.CircuitBreaker(
+                name, failure_threshold=1
+            ),
+        )
+
+        with unittest.mock.patch.object(
+            httpx.AsyncHTTPTransport,
+            "handle_async_request",
+            side_effect=lambda _: httpx.Response(502),
+        ) as upstream:
+            await transport.handle_async_request(
+                httpx.Request("GET", "http://example.test/v3/devices/d1")
+            )
+            with pytest.raises(core.UpstreamUnavailable, match="/v3/devices/{id}"):
+                await transport.handle_async_request(
+                    httpx.Request("GET", "http://example.test/v3/devices/d2")
+                )
+            await transport.handle_async_request(
+                httpx.Request("GET", "http://example.test/v3/sites")
+            )
+
+        assert upstream.call_count == 2
+
+    async def test_rate_limiting_does_not_open_circuit(self) -> None:
+        transport = http.Transport(
+            limiter=http.AdaptiveConcurrencyLimiter(),
+            retry_policy=http.RetryPolicy(max_attempts=3, base_delay=0.0),
+            new_circuit_breaker=lambda name: http.CircuitBreaker(
+                name, failure_threshold=1
+            ),
+        )
+        request = httpx.Request("GET", "http://example.test/v3/sites")
+
+        with unittest.mock.patch.object(
+            httpx.AsyncHTTPTransport,
+            "handle_async_request",
+            side_effect=[
+                httpx.Response(429, headers={"Retry-After": "0"}),
+                httpx.Response(429, headers={"Retry-After": "0"}),
+                httpx.Response(200),
+            ],
+        ) as upstream:
+            response = await transport.handle_async_request(request)
+
+        assert response.status_code == 200
+        assert upstream.call_count == 3
+
+
+class TestPrewarm:
+    @pytest.mark.parametrize("connections", [1, 4])
+    async def test_prewarmed_connections_serve_first_calls(
+        self, connections: int
+    ) -> None:
+        config = http.TransportConfig(prewarm_connections=connections)
+        auth = core.AuthConfig(token="test")
+
+        async with StubServer(RULE_ENGINE) as server:
+            async with http.EnapterAPI(
+                base_url=server.url, transport_config=config
+            ) as api:
+                assert server.connections == connections
+
+                async with asyncio.TaskGroup() as tg:
+                    for _ in range(connections):
+                        tg.create_task(api.get_rule_engine(auth, "site"))
+
+                assert server.connections == connections
+
+    async def test_unreachable_api_does_not_fail_startup(self) -> None:
+        config = http.TransportConfig(prewarm_connections=2, connect_timeout=0.5)
+
+        async with http.EnapterAPI(
+            base_url="http://127.0.0.1:9", transport_config=config
+        ):
+            pass
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from enapter_mcp_server import core, http
+
+from ._stub_server import StubServer
+
+RULE_ENGINE = {"engine": {"id": "engine", "state": "ACTIVE", "timezone": "UTC"}}
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestUserRateLimiter:
+    async def test_burst_is_admitted_then_calls_are_rejected(self) -> None:
+        limiter = http.UserRateLimiter(
+            rate=1.0, burst=3, max_wait=0.0, clock=FakeClock()
+        )
+        auth = core.AuthConfig(token="t")
+
+        for _ in range(3):
+            await limiter.acquire(auth)
+        with pytest.raises(core.RateLimitExceeded, match="retry in 1.0s"):
+            await limiter.acquire(auth)
+
+        (stats,) = limiter.stats.values()
+        assert stats == http.UserRateStats(admitted=3, rejected=1)
+
+    async def test_tokens_are_refilled_at_rate(self) -> None:
+        clock = FakeClock()
+        limiter = http.UserRateLimiter(rate=2.0, burst=1, max_wait=0.0, clock=clock)
+        auth = core.AuthConfig(token="t")
+
+        await limiter.acquire(auth)
+        clock.now += 0.5
+        await limiter.acquire(auth)
+        with pytest.raises(core.RateLimitExceeded):
+            await limiter.acquire(auth)
+
+    async def test_calls_queue_until_a_token_is_available(self) -> None:
+        limiter = http.UserRateLimiter(
+            rate=100.0, burst=1, max_wait=1.0, clock=FakeClock()
+        )
+        auth = core.AuthConfig(token="t")
+
+        await asyncio.gather(*(limiter.acquire(auth) for _ in range(3)))
+
+        (stats,) = limiter.stats.values()
+        assert stats.admitted == 3
+        assert stats.wait_seconds == pytest.approx(0.01 + 0.02)
+
+    async def test_identities_have_separate_buckets(self) -> None:
+        limiter = http.UserRateLimiter(
+            rate=1.0, burst=1, max_wait=0.0, clock=FakeClock()
+        )
+
+        await limiter.acquire(core.AuthConfig(token="a"))
+        await limiter.acquire(core.AuthConfig(token="b"))
+        await limiter.acquire(core.AuthConfig(token="a", user="alice"))
+
+        assert len(limiter.stats) == 3
+        assert "alice" in limiter.stats
+        assert not any("a" == label or "b" == label for label in limiter.stats)
+
+    async def test_cancelled_waiter_returns_its_token(self) -> None:
+        clock = FakeClock()
+        limiter = http.UserRateLimiter(rate=1.0, burst=1, max_wait=5.0, clock=clock)
+        auth = core.AuthConfig(token="t")
+        await limiter.acquire(auth)
+
+        waiter = asyncio.create_task(limiter.acquire(auth))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        clock.now += 1.0
+        await asyncio.wait_for(limiter.acquire(auth), timeout=0.1)
+
+    async def test_enapter_api_calls_are_limited_per_user(self) -> None:
+        limiter = http.UserRateLimiter(
+            rate=0.1, burst=1, max_wait=0.0, clock=FakeClock()
+        )
+
+        async with StubServer(RULE_ENGINE) as server:
+            async with http.EnapterAPI(
+                base_url=server.url, user_rate_limiter=limiter
+            ) as api:
+                await api.get_rule_engine(core.AuthConfig(token="a"), "site")
+                await api.get_rule_engine(core.AuthConfig(token="b"), "site")
+                with pytest.raises(core.RateLimitExceeded):
+                    await api.get_rule_engine(core.AuthConfig(token="a"), "site")
+
+        assert server.requests == 2
@@ -1,5 +1,3 @@
-import pytest
-
 from enapter_mcp_server import domain, mcp
 
 
@@ -60,5 +58,11 @@ class TestSite:
             authorized_role=domain.AccessRole.USER,
         )
 
-        with pytest.raises(AssertionError):
-            mcp.models.Site.from_domain(domain_site)
+        site = mcp.models.Site.from_domain(domain_site)
+
+        assert site.id == "site-bare"
+        assert site.gateway_id is None
+        assert site.gateway_online is None
+        assert site.devices_total is None
+        assert site.devices_online is None
+        assert site.rule_engine_state is None
@@ -1,9 +1,13 @@
+import asyncio
 import pathlib
 import unittest.mock
+from typing import Any
 
+import fastmcp
+import httpx
 import pytest
 
-from enapter_mcp_server import core, domain, mcp
+from enapter_mcp_server import core, domain, mcp, metrics, sqlite
 
 
 class TestReadSkillTool:
@@ -237,3 +241,301 @@ class TestServer:
                 device_id="dev-1",
                 section="properties",
             )
+
+
+class TestJWTStore:
+    def test_sqlite_url_selects_sqlite_store(self, tmp_path: pathlib.Path) -> None:
+        oauth_proxy_config = mcp.OAuthProxyConfig(
+            introspection_endpoint_url="http://sso.test/introspect",
+            authorization_endpoint_url="http://sso.test/authorize",
+            token_endpoint_url="http://sso.test/token",
+            user_info_endpoint_url="http://sso.test/userinfo",
+            protected_resource_url="http://mcp.test",
+            forward_pkce=True,
+            required_scopes=[],
+            client_id="client",
+            client_secret="secret",
+            jwt_store_url=f"sqlite://{tmp_path}/jwt.db",
+        )
+        config = mcp.ServerConfig(
+            host="127.0.0.1",
+            port=12345,
+            enapter_http_api_url="",
+            oauth_proxy_config=oauth_proxy_config,
+        )
+        server = mcp.Server(app=unittest.mock.AsyncMock(), config=config)
+
+        store = server._select_jwt_store()
+
+        assert isinstance(store, sqlite.KeyValueStore)
+
+
+class TestReusePort:
+    def test_servers_can_bind_the_same_address(self) -> None:
+        config = mcp.ServerConfig(
+            host="127.0.0.1", port=0, enapter_http_api_url="", reuse_port=True
+        )
+        first = mcp.Server(app=unittest.mock.AsyncMock(), config=config)
+        first_sockets = first._new_sockets()
+        assert first_sockets is not None
+        config.port = first_sockets[0].getsockname()[1]
+        second = mcp.Server(app=unittest.mock.AsyncMock(), config=config)
+        second_sockets = second._new_sockets()
+        assert second_sockets is not None
+
+        try:
+            assert second_sockets[0].getsockname() == first_sockets[0].getsockname()
+        finally:
+            for sock in first_sockets + second_sockets:
+                sock.close()
+
+    def test_sockets_are_left_to_uvicorn_by_default(self) -> None:
+        config = mcp.ServerConfig(host="127.0.0.1", port=0, enapter_http_api_url="")
+        server = mcp.Server(app=unittest.mock.AsyncMock(), config=config)
+
+        assert server._new_sockets() is None
+
+
+class TestMetrics:
+    async def test_tool_calls_are_served_as_metrics(self) -> None:
+        app = unittest.mock.AsyncMock(spec=core.ApplicationServer)
+        app.read_skill.return_value = "# Skill Content"
+        config = mcp.ServerConfig(
+            host="127.0.0.1",
+            port=12345,
+            enapter_http_api_url="",
+            skills_enabled=True,
+        )
+        registry = metrics.Registry()
+        server = mcp.Server(app=app, config=config, metrics_registry=registry)
+        fastmcp_server = server._new_fastmcp_server()
+
+        async with fastmcp.Client(fastmcp_server) as client:
+            await client.call_tool("read_skill", {"name": "enapter:rule-creator"})
+            await client.call_tool("no_such_tool", raise_on_error=False)
+
+        transport = httpx.ASGITransport(app=fastmcp_server.http_app())
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://mcp.test"
+        ) as http_client:
+            response = await http_client.get("/metrics")
+
+        assert response.status_code == 200
+        assert (
+            'enapter_mcp_tool_calls_total{tool="read_skill",status="ok"} 1.0'
+            in response.text
+        )
+        assert (
+            'enapter_mcp_tool_calls_total{tool="unknown",status="error"} 1.0'
+            in response.text
+        )
+        assert 'enapter_mcp_tool_call_duration_seconds_count{tool="read_skill"} 1' in (
+            response.text
+        )
+
+
+class TestDeadlines:
+    @staticmethod
+    def make_server(**kwargs: Any) -> mcp.Server:
+        async def hang(*_: Any) -> str:
+            await asyncio.Event().wait()
+            raise AssertionError("unreachable")
+
+        app = unittest.mock.AsyncMock(spec=core.ApplicationServer)
+        app.read_skill.side_effect = hang
+        config = mcp.ServerConfig(
+            host="127.0.0.1",
+            port=12345,
+            enapter_http_api_url="",
+            skills_enabled=True,
+            **kwargs,
+        )
+        return mcp.Server(app=app, config=config)
+
+    async def test_tool_call_fails_when_deadline_expires(self) -> None:
+        server = self.make_server(tool_deadlines={"read_skill": 0.05})
+
+        async with fastmcp.Client(server._new_fastmcp_server()) as client:
+            result = await client.call_tool(
+                "read_skill", {"name": "enapter:rule-creator"}, raise_on_error=False
+            )
+
+        assert result.is_error
+        assert "deadline of 0.05s" in result.content[0].text  # type: ignore[union-attr]
+
+    async def test_client_deadline_is_capped_by_maximum(self) -> None:
+        server = self.make_server(max_tool_deadline=0.05)
+
+        async with fastmcp.Client(server._new_fastmcp_server()) as client:
+            result = await client.call_tool(
+                "read_skill",
+                {"name": "enapter:rule-creator"},
+                meta={"enapter.com/deadline": 600},
+                raise_on_error=False,
+            )
+
+        assert result.is_error
+        assert "deadline of 0.05s" in result.content[0].text  # type: ignore[union-attr]
+
+    async def test_configured_deadline_is_not_capped_by_maximum(self) -> None:
+        server = self.make_server(
+            tool_deadlines={"read_skill": 0.1}, max_tool_deadline=0.05
+        )
+
+        async with fastmcp.Client(server._new_fastmcp_server()) as client:
+            result = await client.call_tool(
+                "read_skill", {"name": "enapter:rule-creator"}, raise_on_error=False
+            )
+
+        assert result.is_error
+        assert "deadline of 0.1s" in result.content[0].text  # type: ignore[union-attr]
+
+    async def test_client_deadline_overrides_configured_one(self) -> None:
+        server = self.make_server(tool_deadline=600)
+
+        async with fastmcp.Client(server._new_fastmcp_server()) as client:
+            result = await client.call_tool(
+                "read_skill",
+                {"name": "enapter:rule-creator"},
+                meta={"enapter.com/deadline": 0.05},
+                raise_on_error=False,
+            )
+
+        assert result.is_error
+        assert "deadline of 0.05s" in result.content[0].text  # type: ignore[union-attr]
+
+
+class TestAdmission:
+    async def test_calls_over_capacity_are_rejected_with_retry_hint(self) -> None:
+        started = asyncio.Event()
+
+        async def hang(*_: Any) -> str:
+            started.set()
+            await asyncio.Event().wait()
+            raise AssertionError("unreachable")
+
+        app = unittest.mock.AsyncMock(spec=core.ApplicationServer)
+        app.read_skill.side_effect = hang
+        config = mcp.ServerConfig(
+            host="127.0.0.1",
+            port=12345,
+            enapter_http_api_url="",
+            skills_enabled=True,
+            max_concurrent_tool_calls=1,
+            tool_call_queue_size=0,
+            tool_call_queue_timeout=3.0,
+        )
+        registry = metrics.Registry()
+        server = mcp.Server(app=app, config=config, metrics_registry=registry)
+
+        async with fastmcp.Client(server._new_fastmcp_server()) as client:
+            running = asyncio.create_task(
+                client.call_tool("read_skill", {"name": "enapter:rule-creator"})
+            )
+            await started.wait()
+            result = await client.call_tool(
+                "read_skill", {"name": "enapter:rule-creator"}, raise_on_error=False
+            )
+            running.cancel()
+            await asyncio.gather(running, return_exceptions=True)
+
+        assert result.is_error
+        assert "retry in 3s" in result.content[0].text  # type: ignore[union-attr]
+        text = registry.render()
+        assert 'enapter_mcp_tool_calls_rejected_total{reason="queue_full"} 1.0' in text
+        assert "enapter_mcp_tool_call_queue_wait_seconds_count 1" in text
+
+
+class TestBatchTool:
+    async def test_calls_share_auth_and_report_results_in_order(self) -> None:
+        app = unittest.mock.AsyncMock(spec=core.ApplicationServer)
+        app.read_rule.side_effect = lambda auth, site_id, rule_id, **_: [
+            f"-- {rule_id} as {auth.user}"
+        ]
+        config = mcp.ServerConfig(host="127.0.0.1", port=12345, enapter_http_api_url="")
+        server = mcp.Server(app=app, config=config)
+
+        with unittest.mock.patch(
+            "fastmcp.server.dependencies.get_http_headers",
+            return_value={"x-enapter-auth-user": "alice"},
+        ) as get_http_headers:
+            results = await server.batch(
+                [
+                    mcp.models.BatchCall(
+                        tool="read_rule",
+                        arguments={"site_id": "site", "rule_id": "r1"},
+                    ),
+                    mcp.models.BatchCall(tool="read_rule", arguments={}),
+                    mcp.models.BatchCall(tool="execute_command"),
+                    mcp.models.BatchCall(
+                        tool="read_rule",
+                        arguments={"site_id": "site", "rule_id": "r2"},
+                    ),
+                ]
+            )
+
+        assert get_http_headers.call_count == 1
+        assert [r.tool for r in results] == ["read_rule"] * 2 + [
+            "execute_command",
+            "read_rule",
+        ]
+        assert results[0].result == ["-- r1 as alice"]
+        assert results[1].error is not None and "site_id" in results[1].error
+        assert results[2].error == "Unknown read-only tool 'execute_command'"
+        assert results[3].result == ["-- r2 as alice"]
+
+    async def test_batch_cannot_be_nested(self) -> None:
+        app = unittest.mock.AsyncMock(spec=core.ApplicationServer)
+        config = mcp.ServerConfig(host="127.0.0.1", port=12345, enapter_http_api_url="")
+        server = mcp.Server(app=app, config=config)
+
+        (result,) = await server.batch(
+            [mcp.models.BatchCall(tool="batch", arguments={"calls": []})]
+        )
+
+        assert result.error == "Unknown read-only tool 'batch'"
+
+    async def test_calls_run_through_tool_call_middleware(self) -> None:
+        async def read_rule(
+            auth: core.AuthConfig, site_id: str, rule_id: str, **_: Any
+        ) -> list[str]:
+            if rule_id == "slow":
+                await asyncio.Event().wait()
+            return [f"-- {rule_id}"]
+
+        app = unittest.mock.AsyncMock(spec=core.ApplicationServer)
+        app.read_rule.side_effect = read_rule
+        config = mcp.ServerConfig(
+            host="127.0.0.1",
+            port=12345,
+            enapter_http_api_url="",
+            tool_deadlines={"read_rule": 0.05},
+            max_concurrent_tool_calls_per_user=1,
+        )
+        registry = metrics.Registry()
+        server = mcp.Server(app=app, config=config, metrics_registry=registry)
+
+        async with fastmcp.Client(server._new_fastmcp_server()) as client:
+            result = await client.call_tool(
+                "batch",
+                {
+                    "calls": [
+                        {
+                            "tool": "read_rule",
+                            "arguments": {"site_id": "site", "rule_id": rule_id},
+                        }
+                        for rule_id in ("r1", "slow", "r2")
+                    ]
+                },
+            )
+
+        first, slow, second = result.structured_content["result"]  # type: ignore[index]
+        assert first["result"] == ["-- r1"]
+        assert "deadline of 0.05s" in slow["error"]
+        assert second["result"] == ["-- r2"]
+        text = registry.render()
+        assert 'enapter_mcp_tool_calls_total{tool="read_rule",status="ok"} 2.0' in text
+        assert (
+            'enapter_mcp_tool_calls_total{tool="read_rule",status="error"} 1.0' in text
+        )
+        assert "enapter_mcp_tool_call_queue_wait_seconds_count 3" in text
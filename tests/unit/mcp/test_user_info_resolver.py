@@ -0,0 +1,84 @@
+import asyncio
+
+import httpx
+import pytest
+
+from enapter_mcp_server import mcp
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class UserInfoEndpoint:
+    def __init__(self) -> None:
+        self.tokens: list[str] = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        token = request.headers["Authorization"].removeprefix("Bearer ")
+        self.tokens.append(token)
+        await self.release.wait()
+        if token == "revoked":
+            return httpx.Response(401)
+        return httpx.Response(200, json={"guid": f"guid-{token}"})
+
+
+def make_resolver(
+    endpoint: UserInfoEndpoint, clock: FakeClock | None = None
+) -> mcp.UserInfoResolver:
+    return mcp.UserInfoResolver(
+        "http://sso.test/userinfo",
+        client=httpx.AsyncClient(transport=httpx.MockTransport(endpoint)),
+        clock=clock if clock is not None else FakeClock(),
+    )
+
+
+class TestUserInfoResolver:
+    async def test_resolved_ids_are_cached_per_token(self) -> None:
+        endpoint = UserInfoEndpoint()
+        resolver = make_resolver(endpoint)
+
+        assert await resolver.resolve("a") == "guid-a"
+        assert await resolver.resolve("a") == "guid-a"
+        assert await resolver.resolve("b") == "guid-b"
+
+        assert endpoint.tokens == ["a", "b"]
+
+    async def test_concurrent_lookups_share_one_request(self) -> None:
+        endpoint = UserInfoEndpoint()
+        endpoint.release.clear()
+        resolver = make_resolver(endpoint)
+
+        tasks = [asyncio.create_task(resolver.resolve("a")) for _ in range(5)]
+        await asyncio.sleep(0)
+        endpoint.release.set()
+
+        assert await asyncio.gather(*tasks) == ["guid-a"] * 5
+        assert endpoint.tokens == ["a"]
+
+    async def test_cached_id_is_not_served_past_token_expiry(self) -> None:
+        endpoint = UserInfoEndpoint()
+        clock = FakeClock()
+        resolver = make_resolver(endpoint, clock)
+
+        await resolver.resolve("a", expires_at=clock.now + 10)
+        clock.now += 10
+        await resolver.resolve("a", expires_at=clock.now + 10)
+
+        assert endpoint.tokens == ["a", "a"]
+
+    async def test_failed_lookup_is_not_cached(self) -> None:
+        endpoint = UserInfoEndpoint()
+        resolver = make_resolver(endpoint)
+
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await resolver.resolve("revoked")
+
+        assert endpoint.tokens == ["revoked", "revoked"]
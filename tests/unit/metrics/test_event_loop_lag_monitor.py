@@ -0,0 +1,21 @@
+import asyncio
+import time
+
+from enapter_mcp_server import metrics
+
+
+class TestEventLoopLagMonitor:
+    async def test_blocked_loop_is_recorded_as_lag(self) -> None:
+        registry = metrics.Registry()
+
+        async with metrics.EventLoopLagMonitor(registry, interval=0.01):
+            await asyncio.sleep(0)
+            time.sleep(0.06)
+            await asyncio.sleep(0.02)
+
+        samples = dict(
+            line.rsplit(" ", 1)
+            for line in registry.render().splitlines()
+            if not line.startswith("#")
+        )
+        assert float(samples["enapter_mcp_event_loop_lag_seconds_sum"]) >= 0.04
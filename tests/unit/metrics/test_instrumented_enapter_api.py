@@ -0,0 +1,102 @@
+from typing import AsyncGenerator
+
+import enapter
+import pytest
+
+from enapter_mcp_server import core, domain, metrics
+
+SITE = domain.Site(
+    id="site",
+    name="Alpha",
+    timezone="UTC",
+    authorized_role=domain.AccessRole.OWNER,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class StubEnapterAPI:
+    def __init__(self, clock: FakeClock) -> None:
+        self.clock = clock
+
+    async def get_rule_engine(
+        self, auth: core.AuthConfig, site_id: str
+    ) -> domain.RuleEngine:
+        self.clock.now += 0.2
+        if site_id == "missing":
+            raise core.RuleEngineNotFound(site_id)
+        return domain.RuleEngine(
+            id=site_id, state=domain.RuleEngineState.ACTIVE, timezone="UTC"
+        )
+
+    @enapter.async_.generator
+    async def list_sites(
+        self, auth: core.AuthConfig
+    ) -> AsyncGenerator[domain.Site, None]:
+        for _ in range(3):
+            self.clock.now += 0.1
+            yield SITE
+
+
+def make_api(
+    registry: metrics.Registry, clock: FakeClock
+) -> metrics.InstrumentedEnapterAPI:
+    return metrics.InstrumentedEnapterAPI(
+        StubEnapterAPI(clock), registry, clock=clock  # type: ignore[arg-type]
+    )
+
+
+class TestInstrumentedEnapterAPI:
+    async def test_calls_are_counted_by_outcome(self) -> None:
+        registry = metrics.Registry()
+        clock = FakeClock()
+        api = make_api(registry, clock)
+        auth = core.AuthConfig(token="t")
+
+        await api.get_rule_engine(auth, "site")
+        with pytest.raises(core.RuleEngineNotFound):
+            await api.get_rule_engine(auth, "missing")
+
+        text = registry.render()
+        assert (
+            'enapter_mcp_upstream_calls_total{method="get_rule_engine",status="ok"} 1.0'
+            in text
+        )
+        assert (
+            "enapter_mcp_upstream_calls_total"
+            '{method="get_rule_engine",status="RuleEngineNotFound"} 1.0' in text
+        )
+        assert (
+            'enapter_mcp_upstream_call_duration_seconds_sum{method="get_rule_engine"}'
+            " 0.4" in text
+        )
+        assert (
+            'enapter_mcp_upstream_calls_in_flight{method="get_rule_engine"} 0.0' in text
+        )
+
+    async def test_listings_are_timed_until_the_caller_stops_reading(self) -> None:
+        registry = metrics.Registry()
+        clock = FakeClock()
+        api = make_api(registry, clock)
+        auth = core.AuthConfig(token="t")
+
+        async with api.list_sites(auth) as sites:
+            async for _ in sites:
+                break
+
+        text = registry.render()
+        assert (
+            'enapter_mcp_upstream_calls_total{method="list_sites",status="ok"} 1.0'
+            in text
+        )
+        assert (
+            'enapter_mcp_upstream_call_duration_seconds_sum{method="list_sites"} 0.1'
+            in text
+        )
+        assert 'enapter_mcp_upstream_calls_in_flight{method="list_sites"} 0.0' in text
@@ -0,0 +1,66 @@
+import pytest
+
+from enapter_mcp_server import metrics
+
+
+class TestRegistry:
+    def test_counters_and_gauges_are_rendered_with_labels(self) -> None:
+        registry = metrics.Registry()
+        calls = registry.counter("calls_total", "Calls", ("tool", "status"))
+        in_flight = registry.gauge("in_flight", "Calls in progress")
+
+        calls.labels("search_sites", "ok").inc()
+        calls.labels("search_sites", "ok").inc(2)
+        calls.labels('a"b', "error").inc()
+        in_flight.labels().inc()
+
+        assert registry.render() == (
+            "# HELP calls_total Calls\n"
+            "# TYPE calls_total counter\n"
+            'calls_total{tool="search_sites",status="ok"} 3.0\n'
+            'calls_total{tool="a\\"b",status="error"} 1.0\n'
+            "# HELP in_flight Calls in progress\n"
+            "# TYPE in_flight gauge\n"
+            "in_flight 1.0\n"
+        )
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        registry = metrics.Registry()
+        duration = registry.histogram(
+            "duration_seconds", "Duration", ("tool",), buckets=(0.1, 1.0)
+        )
+
+        sample = duration.labels("t")
+        for value in (0.05, 0.1, 0.5, 2.0):
+            sample.observe(value)
+
+        assert registry.render().splitlines()[2:] == [
+            'duration_seconds_bucket{tool="t",le="0.1"} 2',
+            'duration_seconds_bucket{tool="t",le="1.0"} 3',
+            'duration_seconds_bucket{tool="t",le="+Inf"} 4',
+            'duration_seconds_sum{tool="t"} 2.65',
+            'duration_seconds_count{tool="t"} 4',
+        ]
+
+    def test_labels_return_the_same_sample(self) -> None:
+        counter = metrics.Registry().counter("c", "C", ("a",))
+
+        assert counter.labels("x") is counter.labels("x")
+        with pytest.raises(ValueError):
+            counter.labels("x", "y")
+
+    def test_callback_gauges_are_read_at_render_time(self) -> None:
+        registry = metrics.Registry()
+        queue: list[int] = []
+        registry.callback_gauge("queued", "Queued", (), lambda: [((), len(queue))])
+
+        queue.extend([1, 2])
+
+        assert "queued 2.0" in registry.render()
+
+    def test_names_are_unique(self) -> None:
+        registry = metrics.Registry()
+        registry.counter("c", "C")
+
+        with pytest.raises(ValueError):
+            registry.gauge("c", "C")
@@ -0,0 +1,82 @@
+import asyncio
+import json
+import pathlib
+import sqlite3
+import time
+
+from enapter_mcp_server import sqlite
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = time.time()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def count_rows(path: pathlib.Path) -> int:
+    with sqlite3.connect(path) as connection:
+        (count,) = connection.execute("SELECT COUNT(*) FROM entries").fetchone()
+    return count
+
+
+class TestKeyValueStore:
+    async def test_put_get_delete(self, tmp_path: pathlib.Path) -> None:
+        async with sqlite.KeyValueStore(tmp_path / "store.db") as store:
+            await store.put("k", {"a": 1}, collection="clients")
+
+            assert await store.get("k", collection="clients") == {"a": 1}
+            assert await store.get("k", collection="other") is None
+            assert await store.delete("k", collection="clients")
+            assert await store.get("k", collection="clients") is None
+
+    async def test_entries_are_stored_as_json_in_wal_mode(
+        self, tmp_path: pathlib.Path
+    ) -> None:
+        path = tmp_path / "store.db"
+        async with sqlite.KeyValueStore(path) as store:
+            await store.put("k", {"a": [1, "b"]})
+
+        with sqlite3.connect(path) as connection:
+            (journal_mode,) = connection.execute("PRAGMA journal_mode").fetchone()
+            (value,) = connection.execute("SELECT value FROM entries").fetchone()
+        assert journal_mode == "wal"
+        assert json.loads(value)["value"] == {"a": [1, "b"]}
+
+    async def test_expired_entries_are_hidden_then_swept(
+        self, tmp_path: pathlib.Path
+    ) -> None:
+        path = tmp_path / "store.db"
+        clock = FakeClock()
+        async with sqlite.KeyValueStore(
+            path, sweep_interval=60.0, clock=clock
+        ) as store:
+            await store.put("short", {"a": 1}, ttl=10)
+            await store.put("long", {"a": 2}, ttl=3600)
+            clock.now += 11
+
+            assert await store.get("short") is None
+            assert count_rows(path) == 2
+
+            clock.now += 60
+            await store.put("other", {"a": 3})
+
+            assert count_rows(path) == 2
+            assert await store.get("long") == {"a": 2}
+
+    async def test_stores_share_one_database_file(self, tmp_path: pathlib.Path) -> None:
+        path = tmp_path / "store.db"
+        async with (
+            sqlite.KeyValueStore(path) as first,
+            sqlite.KeyValueStore(path) as second,
+        ):
+
+            async def write(store: sqlite.KeyValueStore, prefix: str) -> None:
+                for i in range(50):
+                    await store.put(f"{prefix}-{i}", {"i": i})
+
+            await asyncio.gather(write(first, "first"), write(second, "second"))
+
+            assert await first.get("second-49") == {"i": 49}
+            assert await second.get("first-49") == {"i": 49}
@@ -0,0 +1,92 @@
+from typing import AsyncGenerator, Iterator
+
+import enapter
+import opentelemetry.sdk.trace
+import opentelemetry.sdk.trace.export
+import pytest
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+
+from enapter_mcp_server import core, http, tracing
+
+from ..http._stub_server import StubServer
+
+EXPORTER = InMemorySpanExporter()
+PROVIDER = opentelemetry.sdk.trace.TracerProvider()
+PROVIDER.add_span_processor(
+    opentelemetry.sdk.trace.export.SimpleSpanProcessor(EXPORTER)
+)
+
+
+@pytest.fixture
+def spans() -> Iterator[InMemorySpanExporter]:
+    tracing.configure(PROVIDER)
+    try:
+        yield EXPORTER
+    finally:
+        tracing.configure(None)
+        EXPORTER.clear()
+
+
+@enapter.async_.generator
+async def paginate(pages: int, page_size: int) -> AsyncGenerator[int, None]:
+    for page in range(pages):
+        tracing.count_page()
+        for item in range(page_size):
+            yield page * page_size + item
+
+
+@tracing.traced("outer")
+async def read_all(pages: int, page_size: int) -> list[int]:
+    async with tracing.listing_span("listing", paginate(pages, page_size)) as items:
+        return [item async for item in items]
+
+
+class TestSpans:
+    async def test_listing_records_items_and_pages(
+        self, spans: InMemorySpanExporter
+    ) -> None:
+        assert await read_all(pages=3, page_size=2) == [0, 1, 2, 3, 4, 5]
+
+        listing, outer = spans.get_finished_spans()
+        assert listing.name == "listing"
+        assert listing.attributes == {"enapter.items": 6, "enapter.pages": 3}
+        assert listing.parent is not None
+        assert listing.parent.span_id == outer.context.span_id
+
+    async def test_listing_span_is_not_current_between_items(
+        self, spans: InMemorySpanExporter
+    ) -> None:
+        async with tracing.listing_span("listing", paginate(2, 1)) as items:
+            async for _ in items:
+                with tracing.span("reader"):
+                    pass
+
+        reader, _, listing = spans.get_finished_spans()
+        assert reader.name == "reader"
+        assert reader.parent is None
+        assert listing.attributes == {"enapter.items": 2, "enapter.pages": 2}
+
+    async def test_upstream_requests_are_children_of_api_calls(
+        self, spans: InMemorySpanExporter
+    ) -> None:
+        body = {"engine": {"id": "engine", "state": "ACTIVE", "timezone": "UTC"}}
+        async with StubServer(body) as server:
+            async with http.EnapterAPI(base_url=server.url) as api:
+                await api.get_rule_engine(core.AuthConfig(token="t"), "site")
+
+        request, call = spans.get_finished_spans()
+        assert call.name == "EnapterAPI.get_rule_engine"
+        assert request.name == "HTTP GET"
+        assert request.attributes is not None
+        assert request.attributes["http.response.status_code"] == 200
+        assert request.parent is not None
+        assert request.parent.span_id == call.context.span_id
+
+    async def test_nothing_is_recorded_when_disabled(self) -> None:
+        await read_all(pages=2, page_size=2)
+        with tracing.span("ignored") as span:
+            assert not span.is_recording()
+
+        assert EXPORTER.get_finished_spans() == ()